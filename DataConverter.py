@@ -1,14 +1,64 @@
+import argparse
+import bz2
+import codecs
 import csv
+import fnmatch
+import glob
+import gzip
+import hashlib
 import json
+import lzma
+import math
+import mmap
 import os
 import re
+import string
+import sys
+import tempfile
+import threading
+import time
 import unicodedata
-from itertools import chain, zip_longest
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter, OrderedDict, namedtuple
+from itertools import chain, islice, repeat, zip_longest
 from pprint import pformat
+from queue import Queue
 
 import _csv
-import sublime
-import sublime_plugin
+
+# Optional, faster JSON backends.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Optional zstd compression: in the standard library from Python 3.14, or the zstandard package.
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+try:
+    import sublime
+    import sublime_plugin
+
+    TextCommand = sublime_plugin.TextCommand
+    WindowCommand = sublime_plugin.WindowCommand
+
+except ImportError:
+    # Running outside of Sublime Text (command line, worker processes).
+    # Only the converters are available.
+    sublime = sublime_plugin = None
+    TextCommand = WindowCommand = object
 
 try:
     import io
@@ -29,6 +79,12 @@ LINEENDINGS = {
     "LF": "\n",
 }
 
+# The pieces of a format that converts each row independently:
+# head + separator.join(rows(chunk) for chunk in chunks) + tail.
+# rows converts a sequence of csv rows to a str.
+# empty is the output when there are no rows, if it isn't head + tail.
+Parts = namedtuple("Parts", ("head", "rows", "separator", "tail", "empty"))
+
 # Borrowed from Apply Syntax
 
 
@@ -55,11 +111,15 @@ def get_type(datum):
         return type(None)
 
 
-def parse_types(reader):
-    """Return a list containing a best guess for the types of data in each column."""
-    output_types, types = [], []
+def parse_types(reader, limit=10):
+    """
+    Return a list containing a best guess for the types of data in each column.
+    Looks at the first limit rows, or every row if limit is None.
+    """
+    output_types, types, width = [], [], None
+    reader = islice(reader, limit)
 
-    for _ in range(10):
+    while True:
         try:
             row = next(reader)
 
@@ -70,12 +130,14 @@ def parse_types(reader):
             print("DataConverter: Error parsing", e)
             break
 
-        types.append([get_type(r) for r in row])
+        # Collect the types found in each column. Only columns in every row get a type.
+        row_types = [get_type(r) for r in row]
+        width = len(row_types) if width is None else min(width, len(row_types))
+        for type_set, typ in zip(types, row_types):
+            type_set.add(typ)
+        types.extend({typ} for typ in row_types[len(types) :])
 
-    # rotate the array
-    types = list(zip(*types))
-
-    for type_list in types:
+    for type_list in types[: width or 0]:
         if str in type_list:
             output_types.append(str)
         elif float in type_list:
@@ -110,23 +172,57 @@ def set_dialect(dialectname, user_dialects):
             return None
 
 
+def get_dialect(dialect):
+    """Get a csv.Dialect from a dialect name or Dialect."""
+    if isinstance(dialect, str):
+        return csv.get_dialect(dialect)
+    return dialect
+
+
+def dialect_params(dialect):
+    """Get the parameters of a csv dialect as a dict, which (unlike a sniffed dialect) can be pickled."""
+    dialect = get_dialect(dialect)
+    return {
+        "delimiter": dialect.delimiter,
+        "doublequote": dialect.doublequote,
+        "escapechar": dialect.escapechar,
+        "quotechar": dialect.quotechar,
+        "quoting": dialect.quoting,
+        "skipinitialspace": dialect.skipinitialspace,
+        "strict": getattr(dialect, "strict", False),
+    }
+
+
+def params_dialect(params):
+    """Make a csv.Dialect from parameters returned by dialect_params."""
+    return type("Dialect", (csv.Dialect,), dict(params, lineterminator="\r\n"))()
+
+
 def sniff(sample):
+    """Sniff a dialect from a sample. Returns a csv.Dialect, or "excel" if sniffing fails."""
+    # The dialect isn't registered, so conversions running in parallel can't clobber each other.
     try:
         dialect = csv.Sniffer().sniff(sample)
-        csv.register_dialect("sniffed", dialect)
         print("DataConverter: using sniffed dialect with delimiter:", dialect.delimiter)
-        return "sniffed"
+        return dialect
 
     except _csv.Error:
         return "excel"
 
 
-def _mysql_type(t):
+def _mysql_type(t, profile=None):
+    """MySQL column type. With a ColumnProfile, strings get a VARCHAR as long as the longest value."""
     if t == str:
-        return "VARCHAR(255)"
+        if profile is None:
+            return "VARCHAR(255)"
+        if profile.max_length > 16383:
+            return "TEXT"
+        return "VARCHAR({})".format(max(profile.max_length, 1))
     elif t == float:
         return "FLOAT"
     elif t == int:
+        if profile is not None and not profile.fits(32):
+            return "BIGINT"
         return "INT"
     else:
         return "TEXT"
@@ -141,18 +237,391 @@ def _sqlite_type(t):
         return "TEXT"
 
 
-def _postgres_type(t):
+def _postgres_type(t, profile=None):
+    """PostgreSQL column type. With a ColumnProfile, strings get a varchar as long as the longest value."""
     if t == float:
         return "numeric"
     elif t == int:
+        if profile is not None and not profile.fits(32):
+            return "bigint"
         return "integer"
+    elif profile is not None and profile.max_length:
+        return "varchar({})".format(profile.max_length)
     else:
         return "text"
 
 
+class HyperLogLog(object):
+    """
+    Estimates the number of distinct strings in a stream, in 2 ** p bytes.
+    The standard error is about 1.04 / sqrt(2 ** p), 1.6% with p=12.
+    The first `exact` distinct values are kept in a set, so small counts are exact.
+    Values are hashed with 64-bit BLAKE2b rather than hash(), which is salted per
+    process, so the same values always give the same count.
+    """
+
+    def __init__(self, p=12, exact=2048):
+        self.p = p
+        self.registers = bytearray(1 << p)
+        self.exact = exact
+        self.values = set()
+
+    def update(self, values):
+        if self.values is not None:
+            self.values.update(values)
+            if len(self.values) <= self.exact:
+                return
+            values, self.values = self.values, None
+
+        p, registers = self.p, self.registers
+        shift, mask = 64 - p, (1 << (64 - p)) - 1
+        for x in self.hashes(values):
+            rank = shift + 1 - (x & mask).bit_length()
+            if rank > registers[x >> shift]:
+                registers[x >> shift] = rank
+
+    @staticmethod
+    def hashes(values):
+        """64-bit hashes of a batch of strings, each distinct value hashed once."""
+        blake2b, from_bytes = hashlib.blake2b, int.from_bytes
+        return [
+            from_bytes(
+                blake2b(v.encode("utf-8", "surrogatepass"), digest_size=8).digest(),
+                "big",
+            )
+            for v in set(values)
+        ]
+
+    def count(self):
+        if self.values is not None:
+            return len(self.values)
+
+        m = len(self.registers)
+        estimate = (
+            0.7213 / (1 + 1.079 / m) * m * m / sum(2.0**-r for r in self.registers)
+        )
+
+        # Linear counting is more accurate for small estimates.
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+
+class TopValues(object):
+    """
+    Frequent values in a stream, with a Misra-Gries summary of k counters.
+    Counts are exact if there are at most k distinct values. Otherwise they're low
+    by at most n / (k + 1), and every value more frequent than that is kept.
+    """
+
+    def __init__(self, k=64):
+        self.k = k
+        self.counts = Counter()
+
+    def update(self, values):
+        counts = self.counts
+        counts.update(values)
+
+        # Merging summaries: subtract the (k+1)th largest count, keeping what's left above zero.
+        if len(counts) > self.k:
+            cut = sorted(counts.values(), reverse=True)[self.k]
+            self.counts = Counter({v: n - cut for v, n in counts.items() if n > cut})
+
+    def most_common(self, n):
+        return sorted(self.counts.items(), key=lambda x: (-x[1], x[0]))[:n]
+
+
+class ColumnProfile(object):
+    """
+    Statistics for the values in one column, collected in one pass with bounded memory:
+    count, nulls (empty or missing cells), distinct values, top values, min, max and length.
+    While every value is a number, also the mean and variance. Values are added in batches,
+    and the batches' means and variances are combined with Chan's parallel form of Welford's method.
+    """
+
+    def __init__(self):
+        self.count = self.nulls = self.max_length = 0
+        self.distinct = HyperLogLog()
+        self.top = TopValues()
+        self.min = self.max = None
+        self.numeric = self.integral = True
+        self.mean = self.m2 = 0.0
+        self.low = self.high = None
+
+    def update(self, column):
+        """Add a batch of values (str or None)."""
+        values = [value for value in column if value]
+        self.nulls += len(column) - len(values)
+        if not values:
+            return
+
+        self.count += len(values)
+        self.distinct.update(values)
+        self.top.update(values)
+        self.max_length = max(self.max_length, max(map(len, values)))
+
+        low, high = min(values), max(values)
+        if self.min is None or low < self.min:
+            self.min = low
+        if self.max is None or high > self.max:
+            self.max = high
+
+        if self.numeric:
+            self.update_numbers(values)
+
+    def update_numbers(self, values):
+        try:
+            numbers = list(map(float, values))
+        except ValueError:
+            numbers = [math.nan]
+
+        if not all(map(math.isfinite, numbers)):
+            self.numeric = self.integral = False
+            return
+
+        if self.integral:
+            try:
+                list(map(int, values))
+            except ValueError:
+                self.integral = False
+
+        n, count = len(numbers), self.count - len(numbers)
+        mean = math.fsum(numbers) / n
+        m2 = math.fsum((x - mean) ** 2 for x in numbers)
+
+        delta = mean - self.mean
+        self.mean += delta * n / (count + n)
+        self.m2 += m2 + delta * delta * count * n / (count + n)
+
+        low, high = min(numbers), max(numbers)
+        if self.low is None or low < self.low[0]:
+            self.low = (low, values[numbers.index(low)])
+        if self.high is None or high > self.high[0]:
+            self.high = (high, values[numbers.index(high)])
+
+    @property
+    def type(self):
+        if not self.count or not self.numeric:
+            return str
+        return int if self.integral else float
+
+    def fits(self, bits):
+        """Check whether the column's integers fit in a signed integer of this many bits."""
+        limit = 1 << (bits - 1)
+        return self.low is None or (-limit <= self.low[0] and self.high[0] < limit)
+
+    def stats(self):
+        """Statistics as strings, in the order of ColumnProfile.fields."""
+        numeric = self.type is not str
+        low, high = (self.low[1], self.high[1]) if numeric else (self.min, self.max)
+        deviation = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        top = ", ".join(
+            "{} ({})".format(value, n) for value, n in self.top.most_common(3) if n > 1
+        )
+
+        return [
+            self.type.__name__,
+            str(self.count),
+            str(self.nulls),
+            str(self.distinct.count()),
+            low or "",
+            high or "",
+            "{:.6g}".format(self.mean) if numeric else "",
+            "{:.6g}".format(deviation) if numeric else "",
+            str(self.max_length),
+            top,
+        ]
+
+    fields = (
+        "type",
+        "count",
+        "nulls",
+        "distinct",
+        "min",
+        "max",
+        "mean",
+        "stddev",
+        "max_length",
+        "top",
+    )
+
+
+def profile_columns(rows, width=0, size=4096):
+    """A ColumnProfile for each column of rows (at least width of them), in one pass over batches of size rows."""
+    profiles = [ColumnProfile() for _ in range(width)]
+    rows, seen = iter(rows), 0
+
+    for batch in iter(lambda: list(islice(rows, size)), []):
+        columns = list(zip_longest(*batch))
+
+        # Cells missing from the rows before a new column are nulls.
+        for _ in range(len(columns) - len(profiles)):
+            profiles.append(ColumnProfile())
+            profiles[-1].nulls = seen
+
+        for profile, column in zip_longest(profiles, columns, fillvalue=()):
+            profile.update(column or [None] * len(batch))
+
+        seen += len(batch)
+
+    return profiles
+
+
+# Markup escaping uses chained str.replace, one C-level pass per character.
+# For typical cells that's about four times faster than str.translate with a mapping.
+
+
 def _escape(string):
-    """Escape &, < and >"""
-    return string.replace("<", "&lt;").replace(">", "&gt;")
+    """Escape &, <, >, " and ' for XML text and attributes."""
+    return (
+        string.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&apos;")
+    )
+
+
+def _escape_attribute(string):
+    """
+    Escape for XML attributes: as _escape, and tabs and line breaks as character references,
+    which parsers would otherwise normalize to spaces.
+    """
+    return (
+        string.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&apos;")
+        .replace("\t", "&#9;")
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+    )
+
+
+def _escape_html(string):
+    """Escape &, <, >, " and ' for HTML text and attributes."""
+    return (
+        string.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#x27;")
+    )
+
+
+def _escape_html_ascii(string):
+    """Escape for HTML, and replace non-ASCII characters with character references (e.g. &#8211; for –)."""
+    string = _escape_html(string)
+    if string.isascii():
+        return string
+    return string.encode("ascii", "xmlcharrefreplace").decode("ascii")
+
+
+_json_key_space = re.compile(r'^( *"(?:[^"\\]|\\.)*"): ', re.M)
+_json_non_ascii = re.compile(r"[^\x00-\x7e]")
+
+
+def _json_ascii(match):
+    """Escape a character like json.dumps(ensure_ascii=True), with a surrogate pair outside the BMP."""
+    c = ord(match.group())
+    if c > 0xFFFF:
+        c -= 0x10000
+        return "\\u{:04x}\\u{:04x}".format(0xD800 | (c >> 10), 0xDC00 | (c & 0x3FF))
+    return "\\u{:04x}".format(c)
+
+
+def _json_reindent(text, width, indent):
+    """Change the indentation of JSON from width spaces per level to indent spaces."""
+    # Strings never contain raw newlines, so spaces after one are indentation.
+    # Each pass converts one level, from the outside in.
+    old, new, level = " " * width, " " * indent, 0
+    while "\n" + new * level + old in text:
+        text = text.replace("\n" + new * level + old, "\n" + new * (level + 1))
+        level += 1
+
+    return text
+
+
+def json_dumps(obj, backend="json", indent=None, separators=None, ensure_ascii=True):
+    """
+    Same as json.dumps(obj, indent=indent, separators=separators, ensure_ascii=ensure_ascii),
+    but can use orjson or ujson. Their output is adjusted to match json's,
+    and anything they can't reproduce (e.g. other separators) falls back on json.
+
+    Args:
+        backend (str): "json", "orjson", "ujson", or "auto" for the fastest installed
+                       backend for these options. Backends that aren't installed fall back on json.
+    """
+    compact = separators == (",", ":")
+
+    if backend == "auto":
+        if indent is not None and compact and isinstance(obj, dict):
+            # Removing the space after every key costs more than the backends save.
+            backend = "json"
+        elif orjson and indent is None and not ensure_ascii:
+            backend = "orjson"
+        elif ujson:
+            backend = "ujson"
+        elif orjson and not ensure_ascii:
+            backend = "orjson"
+        else:
+            backend = "json"
+
+    elif not {"orjson": orjson, "ujson": ujson}.get(backend):
+        backend = "json"
+
+    def stdlib():
+        return json.dumps(
+            obj, indent=indent, separators=separators, ensure_ascii=ensure_ascii
+        )
+
+    if backend == "json" or not (
+        compact or (indent is not None and separators is None)
+    ):
+        return stdlib()
+
+    try:
+        if backend == "orjson":
+            option = orjson.OPT_NON_STR_KEYS
+            if indent is not None:
+                option |= orjson.OPT_INDENT_2
+            text, width = orjson.dumps(obj, option=option).decode("utf-8"), 2
+
+            if ensure_ascii and not text.isascii():
+                text = _json_non_ascii.sub(_json_ascii, text)
+
+        elif indent == 0:
+            # ujson treats an indent of 0 as compact.
+            return stdlib()
+
+        else:
+            text = ujson.dumps(
+                obj,
+                ensure_ascii=ensure_ascii,
+                indent=indent or 0,
+                escape_forward_slashes=False,
+            )
+            width = indent
+
+    except (TypeError, ValueError, OverflowError):
+        return stdlib()
+
+    # json escapes DEL along with non-ASCII characters, the backends don't.
+    if ensure_ascii and "\x7f" in text:
+        text = text.replace("\x7f", "\\u007f")
+
+    if indent is not None:
+        if width != indent:
+            text = _json_reindent(text, width, indent)
+
+        # The backends always put a space after keys in indented output.
+        if compact and '": ' in text:
+            text = _json_key_space.sub(r"\1:", text)
+
+    return text
 
 
 def _length(x):
@@ -163,12 +632,52 @@ def _length(x):
 
 
 def _cast(value, typ_):
+    # A value that isn't of its column's type (e.g. "n/a" in a file changed since its
+    # types were cached) is left as it is.
     try:
         return typ_(value)
-    except TypeError:
+    except (TypeError, ValueError):
         return value
 
 
+def _literal(text):
+    """Escape text for use in a str.format string."""
+    return str(text).replace("{", "{{").replace("}", "}}")
+
+
+def compile_template(template, fields):
+    """
+    Compile a template into a str.format string.
+
+    Args:
+        template (str): text with {fields}. Use {{ and }} for literal braces.
+        fields (dict): text to put in place of each field. This is part of the
+            compiled format string, so use _literal() for text, or e.g. "{0}" for a
+            positional field to fill in later.
+
+    Raises:
+        KeyError: for a field that isn't in fields.
+        ValueError: for a field with a format spec or conversion (e.g. {value:>5}),
+            which would otherwise be dropped, or braces that don't match.
+    """
+    output = []
+    for literal, name, spec, conversion in string.Formatter().parse(template):
+        output.append(_literal(literal))
+        if name is not None:
+            if spec or conversion:
+                raise ValueError(
+                    "DataConverter: templates don't support format specs or conversions, "
+                    "as in {{{}{}{}}}".format(
+                        name,
+                        "!" + conversion if conversion else "",
+                        ":" + spec if spec else "",
+                    )
+                )
+            output.append(fields[name])
+
+    return "".join(output)
+
+
 def _countcombining(string):
     """Count combining diacretics in a string."""
     return sum(unicodedata.combining(c) > 0 for c in string)
@@ -179,826 +688,3428 @@ def _countwide(string):
     return sum(unicodedata.east_asian_width(char) == "W" for char in string)
 
 
-# Adding a format? Check if it belongs in no_space_formats or untyped_formats.
-
+# File extensions for the output of each format, used when converting files on disk.
+EXTENSIONS = {
+    "actionscript": "as",
+    "asp": "asp",
+    "dsv": "csv",
+    "gherkin": "feature",
+    "html": "html",
+    "javascript": "js",
+    "jira": "txt",
+    "json": "json",
+    "json_columns": "json",
+    "json_keyed": "json",
+    "json_rows": "json",
+    "markdown": "md",
+    "mysql": "sql",
+    "perl": "pl",
+    "php4": "php",
+    "php54": "php",
+    "postgres": "sql",
+    "profile": "txt",
+    "python_dict": "py",
+    "python_list": "py",
+    "ruby": "rb",
+    "sqlite": "sql",
+    "text_table": "txt",
+    "wiki": "txt",
+    "xml": "xml",
+    "xml_illustrator": "xml",
+    "xml_properties": "xml",
+    "xlsx": "xlsx",
+    "yaml": "yml",
+}
 
-class DataConverterCommand(sublime_plugin.TextCommand):
+# Cost profile of each format: (bytes of output per byte of input, seconds per MB of input).
+# Measured on a six-column file of short strings and numbers, in a single process.
+COSTS = {
+    "actionscript": (2.2, 0.45),
+    "asp": (4.5, 0.3),
+    "dsv": (1.0, 0.07),
+    "gherkin": (1.5, 1.0),
+    "html": (4.5, 0.15),
+    "javascript": (2.5, 0.4),
+    "jira": (1.05, 0.05),
+    "json": (3.9, 0.2),
+    "json_columns": (2.5, 0.15),
+    "json_keyed": (3.9, 0.25),
+    "json_rows": (2.8, 0.15),
+    "markdown": (1.5, 1.15),
+    "mysql": (1.4, 0.4),
+    "perl": (2.5, 0.5),
+    "php4": (2.6, 0.55),
+    "php54": (2.5, 0.55),
+    "postgres": (1.4, 0.4),
+    "profile": (0.01, 0.25),
+    "python_dict": (2.7, 1.95),
+    "python_list": (1.3, 0.5),
+    "ruby": (2.5, 0.45),
+    "sqlite": (1.4, 0.35),
+    "text_table": (1.5, 1.0),
+    "wiki": (1.2, 0.3),
+    "xml": (4.4, 0.25),
+    "xml_illustrator": (13.0, 0.45),
+    "xml_properties": (2.3, 0.25),
+    "xlsx": (0.35, 0.6),
+    "yaml": (2.4, 0.4),
+}
 
-    # This will be set later on, in the converter function
-    syntax = None
-    settings = dict()
-    escapechar = "\\"
-    quotechar = "'"
-    headers = []
-    converter = None
+# Estimated output sizes (in MB) at which "auto" output switches to a new view, and to a file.
+OUTPUT_THRESHOLDS = {"new_view": 4, "file": 100}
 
-    # These format can't have spaces in field names. By default, spaces replaced with "_".
-    no_space_formats = (
-        "actionscript",
-        "javascript",
-        "mysql",
-        "sqlite",
-        "xml",
-        "xml_properties",
-        "yaml",
-    )
+Estimate = namedtuple("Estimate", ("rows", "output", "seconds"))
 
-    # These formats don't need to be checked for int/str/etc types.
-    untyped_formats = (
-        "dsv",
-        "gherkin",
-        "html",
-        "jira",
-        "json",
-        "json_columns",
-        "json_rows",
-        "json_keyed",
-        "text_table",
-        "wiki",
-        "xml",
-        "xml_properties",
-        "yaml",
-    )
 
-    def run(self, edit, **kwargs):
-        try:
-            # The format key in .sublime-commands must match the name of the function we want to call.
-            self.converter = getattr(self, kwargs["format"])
+def estimate(fmt, size, sample):
+    """
+    Estimate the cost of converting size characters (or bytes) of delimited text.
 
-        except KeyError:
-            print("DataConverter: no format given")
-            return
+    Args:
+        fmt (str): name of the format.
+        size (int): size of the input.
+        sample (str): lines from the input, for the average length of a row.
 
-        try:
-            self.settings = self.get_settings(kwargs)
+    Returns:
+        Estimate of the number of rows, the size of the output, and seconds to convert.
+    """
+    ratio, seconds = COSTS.get(fmt, (2.0, 0.5))
 
-        except TypeError as e:
-            print("DataConverter: TypeError fetching settings", e)
-            return
+    # The last line of the sample may be cut short.
+    lines = sample.splitlines()
+    if len(lines) > 1 and not sample.endswith(("\n", "\r")):
+        lines.pop()
 
-        # If nothing is selected, select all.
-        if self.view.sel()[0].empty():
-            self.view.sel().add(sublime.Region(0, self.view.size()))
-            deselect_flag = True
+    length = sum(len(line) + 1 for line in lines) / (len(lines) or 1)
 
-        for sel in self.view.sel():
-            selection = self.view.substr(sel)
-            sample = selection[:2048]
+    return Estimate(int(size / max(length, 1)), int(size * ratio), size * seconds / 1e6)
 
-            # CSV dialect
-            # Sniff if we haven't done this before, or we sniffed before.
-            if "dialect" not in self.settings or self.settings["dialect"] == "sniffed":
-                self.settings["dialect"] = sniff(sample)
-                print("DataConverter: using dialect", self.settings["dialect"])
 
-            self.headers = self.assign_headers(sample)
-            data = self.import_csv(selection)
+def choose_output(cost, thresholds):
+    """Choose where the output goes ("replace", "new_view" or "file") from an Estimate."""
+    thresholds = dict(OUTPUT_THRESHOLDS, **(thresholds or {}))
 
-            if self.settings["typed"]:
-                # Assign a list of tuples (headername, type)
-                self.settings["types"] = self.get_types(selection)
-                print(
-                    "DataConverter found these fields and types:",
-                    self.settings["types"],
-                )
+    if cost.output < thresholds["new_view"] * 1e6:
+        return "replace"
+    if cost.output < thresholds["file"] * 1e6:
+        return "new_view"
+    return "file"
 
-            # Run converter
-            converted = self.converter(data)
-            self.view.replace(edit, sel, converted)
-            deselect_flag = False
 
-        if self.syntax is not None:
-            self.view.assign_syntax(self.syntax)
+def detect_newline(sample):
+    """Guess the line ending used in a sample of text."""
+    if "\r\n" in sample:
+        return "\r\n"
+    elif "\r" in sample:
+        return "\r"
+    return "\n"
 
-        if deselect_flag or self.settings.get("deselect_after"):
-            self.deselect()
 
-    def get_settings(self, kwargs):
-        """Get settings from kwargs, user settings."""
-        settings = dict()
-        user_settings = sublime.load_settings("DataConverter.sublime-settings")
+def detect_encoding(prefix):
+    """
+    Guess the encoding of a file from the first bytes.
 
-        # Headers
-        # True, "sniff" or "never"
-        settings["headers"] = user_settings.get("headers")
+    Returns:
+        tuple: the encoding and the length of the byte order mark, if any.
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8", len(codecs.BOM_UTF8)
 
-        # Whitespace
-        # Combine headers for certain formats
-        settings["mergeheaders"] = kwargs["format"] in self.no_space_formats
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16", 0
 
-        # Typing
-        # Don't like having 'not' in this expression, but it makes more sense to use
-        # 'typed' from here on out, and it's less error prone to use the (smaller)
-        # list of untyped formats.
-        settings["typed"] = kwargs["format"] not in self.untyped_formats
+    for encoding in ("utf-8", "cp1252"):
+        try:
+            # Not final, so a multibyte character cut off at the end of the prefix is OK.
+            codecs.getincrementaldecoder(encoding)().decode(prefix, final=False)
+            return encoding, 0
+        except UnicodeDecodeError:
+            pass
+
+    return "latin-1", 0
+
+
+def decode_fallback(error):
+    """
+    Codec error handler for bytes the detected encoding can't decode (e.g. a cp1252 "é"
+    after the prefix detect_encoding saw): decodes them as cp1252, or latin-1.
+    """
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+
+    chars = []
+    for byte in error.object[error.start : error.end]:
+        byte = bytes((byte,))
+        try:
+            chars.append(byte.decode("cp1252"))
+        except UnicodeDecodeError:
+            chars.append(byte.decode("latin-1"))
 
-        # New lines
-        settings["newline"] = LINEENDINGS.get(self.view.line_endings(), os.linesep)
+    return "".join(chars), error.end
 
-        user_quoting = user_settings.get("quoting", "QUOTE_MINIMAL")
-        settings["quoting"] = getattr(csv, user_quoting, csv.QUOTE_MINIMAL)
 
-        # Quote stripping
-        settings["strip_quotes"] = user_settings.get("strip_quotes", True)
+# Errors handler for decoding files, so a stray byte doesn't stop a conversion.
+DECODE_ERRORS = "dataconverter"
+codecs.register_error(DECODE_ERRORS, decode_fallback)
 
-        # Indentation
-        if self.view.settings().get("translate_tabs_to_spaces"):
-            tabsize = int(self.view.settings().get("tab_size", 4))
-            settings["indent"] = " " * tabsize
-        else:
-            settings["indent"] = "\t"
 
-        # header-joiner
-        settings["header_joiner"] = user_settings.get("header_joiner", "")
+class MappedCSV(object):
+    """
+    A delimited file read through mmap, for converting files without holding them in memory as str.
 
-        # HTML characters
-        settings["html_utf8"] = user_settings.get("html_utf8", True)
+    Lines are decoded as they're read. Record offsets are indexed on demand, so a range
+    of rows can be read without decoding the rows before it. Records are split on newlines
+    outside of quotes, which assumes quotes are escaped by doubling them (as in the excel dialect).
+    """
 
-        # Dialect
-        if user_settings.get("use_dialect", False):
-            settings["dialect"] = set_dialect(
-                user_settings.get("use_dialect"), user_settings.get("dialects", {})
-            )
+    # Bytes read for guessing the encoding.
+    prefix_size = 65536
 
-        settings["default_variable"] = user_settings.get(
-            "default_variable", "DataConverter"
-        )
+    def __init__(self, path, quotechar='"'):
+        self.path = path
+        self.quotechar = quotechar
+        self.file = open(path, "rb")
 
-        # These settings are solely for DSV converter.
-        settings["output_delimiter"] = kwargs.get("output_delimiter")
-        settings["output_dialect"] = kwargs.get("output_dialect")
+        try:
+            # Raises ValueError for an empty file.
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise
 
-        return settings
+        self.size = len(self.map)
+        self.encoding, start = detect_encoding(self.map[: self.prefix_size])
 
-    def assign_headers(self, sample):
-        """Assign headers to the data set"""
-        # Use the dialect to get the first line of the sample as a dict
-        # Do this here beacause we'll want the length of the data no matter what
-        sample_io = io.StringIO(sample)
-        headers = next(csv.reader(sample_io, dialect=self.settings["dialect"]))
+        if self.encoding == "utf-16":
+            self.close()
+            raise ValueError("DataConverter can't map UTF-16 files")
 
-        if self.settings["headers"] is True:
-            self.settings["has_header"] = True
+        # CR-only line endings are split on CR, everything else on LF.
+        prefix = self.map[start : start + self.prefix_size]
+        self.newline = b"\r" if b"\r" in prefix and b"\n" not in prefix else b"\n"
 
-        elif self.settings["headers"] == "never" or self.settings["headers"] is False:
-            self.settings["has_header"] = False
+        # Byte offsets of the start of each record found so far.
+        self.offsets = [start]
+        self.indexed = False
 
-        else:
-            # If not told to definitely try to use headers or definitely not, we sniff for them.
-            # Sniffing isn't perfect, especially with short data sets and strange delimiters
-            try:
-                sniffed_headers = csv.Sniffer().has_header(sample)
+    def __enter__(self):
+        return self
 
-                if sniffed_headers:
-                    self.settings["has_header"] = True
-                    print("DataConverter: CSV Sniffer found headers")
-                else:
-                    self.settings["has_header"] = False
-                    print("DataConverter: CSV Sniffer didn't find headers")
+    def __exit__(self, *exc):
+        self.close()
 
-            except _csv.Error:
-                print(
-                    "DataConverter: CSV module had trouble sniffing for headers. Assuming they exist."
-                )
-                print(
-                    'DataConverter: Add "headers": false to your settings file to assume no headers.'
-                )
-                self.settings["has_header"] = True
+    def close(self):
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
 
-        # Using ['val1', 'val2', ...] if 'headers=never' or Sniffer says there aren't headers
-        if self.settings.get("has_header") is False:
-            headers = ["val{}".format(x) for x in range(1, 1 + len(headers))]
+    def set_quotechar(self, quotechar):
+        """Records are indexed by counting quotes, so changing the quote character resets the index."""
+        if quotechar != self.quotechar:
+            self.quotechar = quotechar
+            self.offsets, self.indexed = self.offsets[:1], False
 
-        return self.format_headers(headers)
+    def sample(self, size=2048):
+        """Decode (about) the first size characters."""
+        start = self.offsets[0]
+        chunk = self.map[start : start + size * 4]
+        return chunk.decode(self.encoding, "ignore")[:size]
 
-    def format_headers(self, headers):
-        """Replace spaces in the header names for some formats."""
-        if self.settings.get("mergeheaders", False) is True:
-            hj = self.settings.get("header_joiner", "_")
-            headers = [x.replace(" ", hj) for x in headers]
+    def offset(self, record):
+        """Byte offset of the start of a record, or None if the file has fewer records."""
+        quote = self.quotechar.encode(self.encoding)
+        pos, quoted = self.offsets[-1], False
 
-        return headers
+        while len(self.offsets) <= record and not self.indexed:
+            end = self.map.find(self.newline, pos) + 1
+            if end == 0 or end >= self.size:
+                self.indexed = True
+                break
 
-    def import_csv(self, selection):
-        """Read CSV data from file into a StringIO object."""
-        # Remove header from entries that came with one.
-        if self.settings.get("has_header", False) is True:
-            selection = selection[selection.find(self.settings["newline"]) :]
+            # Inside a quoted field if an odd number of quotes has been seen.
+            quoted ^= self.map[pos:end].count(quote) % 2 == 1
+            if not quoted:
+                self.offsets.append(end)
 
-        csvIO = io.StringIO(selection)
+            pos = end
 
-        reader = csv.reader(csvIO, dialect=self.settings["dialect"])
+        try:
+            return self.offsets[record]
+        except IndexError:
+            return None
 
-        if self.settings.get("has_header", False) is True:
-            next(reader)
+    def lines(self, start=0, stop=None):
+        """Generate decoded lines, from the start of record start up to record stop."""
+        pos = self.offset(start)
+        end = self.size if stop is None else self.offset(stop)
+        if pos is None:
+            return iter(())
+
+        return self.byte_lines(pos, self.size if end is None else end)
+
+    def byte_lines(self, pos, end):
+        """Generate decoded lines between two byte offsets."""
+        while pos < end:
+            nl = self.map.find(self.newline, pos, end)
+            nl = end if nl == -1 else nl + 1
+            yield self.map[pos:nl].decode(self.encoding, DECODE_ERRORS)
+            pos = nl
+
+
+# Compressed files: the module for each extension, the first bytes of its files,
+# and options for writing them (gzip's default level is slower than the gzip command's).
+COMPRESSION = {
+    ".gz": ("gzip", b"\x1f\x8b", {"compresslevel": 6}),
+    ".bz2": ("bz2", b"BZh", {}),
+    ".xz": ("lzma", b"\xfd7zXZ\x00", {}),
+    ".zst": ("zstd", b"\x28\xb5\x2f\xfd", {}),
+}
 
-        return reader
 
-    def get_types(self, selection):
-        # If untyped, return empty list.
-        if self.settings.get("typed", False) is False:
-            return []
+def split_compression(path):
+    """Split a compression extension (e.g. ".gz") off path. Returns the rest and the extension, or ""."""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSION:
+        return root, ext.lower()
+    return path, ""
 
-        if self.settings.get("has_header", False) is True:
-            selection = selection[selection.find(self.settings["newline"]) :]
 
-        typer = csv.reader(io.StringIO(selection), dialect=self.settings["dialect"])
-        if self.settings.get("has_header", False) is True:
-            next(typer)
+def compression(path, read=False):
+    """
+    The compression extension of a file (e.g. ".gz"), or "" if it isn't compressed.
+    Found from the name, or if read, from the file's first bytes.
+    """
+    if not read:
+        return split_compression(path)[1]
 
-        return list(parse_types(typer))
+    with open(path, "rb") as f:
+        magic = f.read(6)
 
-    def deselect(self):
-        """Remove selection and place pointer at top of document (adapted from https://gist.github.com/1608283)."""
-        top = self.view.sel()[0].a
-        self.view.sel().clear()
-        self.view.sel().add(sublime.Region(top, top))
+    return next(
+        (ext for ext, (_, m, _) in COMPRESSION.items() if magic.startswith(m)), ""
+    )
 
-    def set_syntax(self, path, file_name=False):
-        """Set the view's syntax"""
-        if not file_name:
-            file_name = path
 
-        new_syntax = sublime_format_path(
-            "/".join(("Packages", path, file_name + ".sublime-syntax"))
+def open_compressed(path, mode, ext, **kwargs):
+    """Open a file compressed as ext (e.g. ".gz"), with its module's open function."""
+    name, _, options = COMPRESSION[ext]
+    module = globals()[name]
+    if module is None:
+        raise ValueError(
+            "DataConverter needs Python 3.14 or the zstandard package for {} files".format(
+                ext
+            )
         )
-        current_syntax = self.view.settings().get("syntax")
 
-        if new_syntax != current_syntax:
-            try:
-                sublime.load_resource(new_syntax)
-                self.view.assign_syntax(new_syntax)
-            except OSError as err:
-                print("DataConverter: Unable to set syntax ({}).".format(err))
-                new_syntax = new_syntax.replace(".sublime-syntax", ".tmLanguage")
-                try:
-                    sublime.load_resource(new_syntax)
-                    self.view.assign_syntax(new_syntax)
-                except OSError as err:
-                    print("DataConverter: Unable to set syntax ({}).".format(err))
-                    print("self.view.syntax().path: {}".format(self.view.syntax().path))
+    if "w" in mode:
+        kwargs = dict(options, **kwargs)
 
-    def _escape(self, string):
-        """Add an escape character in front of a quote character in given string."""
-        return (string or "").replace(self.quotechar, self.escapechar + self.quotechar)
+    return module.open(path, mode, **kwargs)
 
-    def type_loop(self, row, field_format, field_break=None, null=None):
-        """
-        Helper loop for checking types as we write out a row.
-        Strings get quoted, floats and ints don't.
 
-        Args:
-            row (list): returned from csv.reader
-            field_format (str): format for a single field
-            field_break (str): break between fields (default: ', ').
-            null (str): Text to use for None values (default: 'null').
+class CompressedCSV(object):
+    """
+    A compressed delimited file, decompressed as it's read.
 
-        Returns:
-            str formatted with `formt` (e.g. "{0}=>{1}")
-        """
-        field_break = field_break or ", "
-        null = null or "null"
-        types = self.settings.get("types", [])
+    Compressed files can't be mapped or read from the middle, so they're never converted
+    in chunks, and each pass over the rows (e.g. for types, then for converting)
+    decompresses the file again from the start.
+    """
 
-        # Creates escaped or proper NULL representation of a value.
-        def applytype(val, typ):
-            if val is None:
-                return null
-            elif typ == str:
-                return "{q}{}{q}".format(self._escape(val), q=self.quotechar)
-            else:
-                return _cast(val, typ)
+    def __init__(self, path, ext):
+        self.path = path
+        self.ext = ext
+        self.streams = []
 
-        return field_break.join(
-            field_format.format(field=hed, value=applytype(val, typ), q=self.quotechar)
-            for val, hed, typ in zip_longest(row, self.headers, types)
-        )
+        with open_compressed(path, "rb", ext) as f:
+            self.prefix = f.read(MappedCSV.prefix_size)
 
-    # Converters
-    # Note that converters should call self.set_syntax
+        self.encoding, _ = detect_encoding(self.prefix)
+        if self.encoding == "utf-8":
+            self.encoding = "utf-8-sig"
 
-    def actionscript(self, data):
-        """Actionscript converter"""
-        self.set_syntax("ActionScript")
-        n = self.settings["newline"] + self.settings["indent"]
-        linebreak = "}," + n + "{"
-        output = linebreak.join(
-            self.type_loop(row, "{field}: {value}", field_break=", ") for row in data
-        )
-        return "[" + n + "{" + output + "}" + self.settings["newline"] + "];"
+        # The size of the compressed file.
+        self.size = os.path.getsize(path)
 
-    # ASP / VBScript
-    def asp(self, data):
-        self.set_syntax("ASP")
-        # comment, comment_end = "'", ""
-        output = []
-        C, r = 0, 0
-        cell = self.settings["default_variable"] + "({c},{r})"
+    def __enter__(self):
+        return self
 
-        for r, row in enumerate(data):
-            for c, (value, typ) in enumerate(zip_longest(row, self.settings["types"])):
-                typ = typ or get_type(value)
-                arr = "{q}{}{q}" if typ == str else "{}"
-                v = self._escape(value or "null")
-                output.append(
-                    (cell + " = " + arr).format(v, c=c, r=r, q=self.quotechar)
-                )
+    def __exit__(self, *exc):
+        self.close()
 
-            C = max(C, len(row))
+    def close(self):
+        for stream in self.streams:
+            stream.close()
+        self.streams = []
 
-        dim = "Dim " + cell.format(c=C, r=r, n="")
-        output.insert(0, dim)
-        output.insert(
-            0, '\' columnNames = Array("{}")'.format('", "'.join(self.headers))
+    def sample(self, size=2048):
+        """Decode (about) the first size characters."""
+        return self.prefix[: size * 4].decode(self.encoding, "ignore")[:size]
+
+    def open(self):
+        """Open the decompressed text. Streams are closed with the CompressedCSV."""
+        stream = open_compressed(
+            self.path,
+            "rt",
+            self.ext,
+            encoding=self.encoding,
+            errors=DECODE_ERRORS,
+            newline="",
         )
-        return self.settings["newline"].join(output) + self.settings["newline"]
+        self.streams.append(stream)
+        return stream
 
-    def _spaced_text(self, data, delimiter, row_decoration=None, **kwargs):
-        """
-        General converter for formats with semantic text spacing
 
-        Args:
-            data (csv.reader): Sequence of lists
-            delimiter (str): division between each field
-            row_decoration (function): A function that takes Sequence of row
-                                       lengths and returns a str used to optionally
-                                       decorate the top, bottom, and/or between header and rows.
-            field_format (str): format str for each field. default: ' {: <{fill}} '
-            top (bool): Add the row decoration to the top of the output.
-            between (bool): Add row decoration between the header and the row.
-            bottom (bool): Add row decoration after the output.
-        """
-        field_format = kwargs.get("field_format", " {: <{fill}} ")
+def _count(buf, sub, start, end):
+    """Count sub in buf[start:end], for a str or a bytes-like buffer (e.g. mmap) without count()."""
+    if isinstance(buf, str):
+        return buf.count(sub, start, end)
 
-        # Convert data set from generator to list.
-        data = list(data)
+    block = 1 << 20
+    return sum(
+        buf[pos : min(pos + block, end)].count(sub) for pos in range(start, end, block)
+    )
 
-        # Get the length of each field
-        lengths = [len(x) for x in self.headers]
-        for row in data:
-            cells = (
-                len(unicodedata.normalize("NFKC", val)) + _countwide(val) for val in row
-            )
-            lengths = [max(i, j) for i, j in zip_longest(lengths, cells, fillvalue=0)]
 
-        def format_row(row):
-            """Helper function that generates a sequence of formatted cells"""
-            for value, width in zip_longest(row, lengths, fillvalue=""):
-                # Account for fullwidth ideographs and uncombined combining diacretics.
-                yield field_format.format(
-                    value, fill=width + _countcombining(value) - _countwide(value)
-                )
+def split_records(buf, parts, quotechar, newline, start=0):
+    """
+    Split a buffer of delimited text into about `parts` pieces that each contain whole records.
+    Splits only at newlines outside of quoted fields, i.e. after an even number of quotes.
+
+    Args:
+        buf (str or bytes-like): the text. bytes-like buffers must use an ASCII-compatible encoding.
+        parts (int): number of pieces.
+        quotechar (str or bytes): the dialect's quote character.
+        newline (str or bytes): the line ending to split on.
+        start (int): the offset of the first record.
+
+    Returns:
+        list of offsets. Piece k is buf[offsets[k]:offsets[k + 1]].
+    """
+    size = len(buf)
+    step = max((size - start) // parts, 1)
+    bounds = [start]
+
+    while bounds[-1] + step < size:
+        pos = bounds[-1] + step
+        quotes = _count(buf, quotechar, bounds[-1], pos)
+
+        while True:
+            end = buf.find(newline, pos)
+            if end == -1:
+                break
+            quotes += _count(buf, quotechar, pos, end)
+            pos = end + 1
+            if quotes % 2 == 0:
+                break
+
+        if end == -1 or pos >= size:
+            break
+        bounds.append(pos)
+
+    bounds.append(size)
+    return bounds
+
+
+def convert_chunk(fmt, state, chunk, skip=0, lengths=False):
+    """
+    Convert a chunk of rows in a worker process.
+
+    Args:
+        fmt (str): name of the format. Must be in DataConverter.chunked_formats.
+        state (tuple): the converter's settings, headers and lengths. settings["dialect"] is a dict of parameters.
+        chunk (str or tuple): the text, or the path and byte range of a file to read with MappedCSV.
+        skip (int): number of records to skip at the start of the chunk (e.g. the header).
+        lengths (bool): measure the width of the fields instead of converting.
+    """
+    converter = DataConverter()
+    converter.settings, converter.headers, converter.lengths = state
+
+    def work(lines):
+        rows = islice(csv.reader(lines, **converter.settings["dialect"]), skip, None)
+        if lengths:
+            return converter._spaced_lengths(rows, [])
+        return converter.parts(fmt).rows(rows)
+
+    if isinstance(chunk, str):
+        return work(io.StringIO(chunk))
+
+    path, start, end = chunk
+    with MappedCSV(path) as mapped:
+        return work(mapped.byte_lines(start, end))
+
+
+class _Sink(object):
+    """A write-only file that keeps what's written until it's taken, for streaming a zip file in pieces."""
+
+    def __init__(self):
+        self.data = []
+
+    def write(self, data):
+        self.data.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data, self.data = b"".join(self.data), []
+        return data
+
+
+# Parts of an xlsx workbook with one sheet, besides the sheet itself.
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "{shared}</Types>"
+    ),
+    "_rels/.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '<Relationship Id="rId2" Target="styles.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+        "{shared}</Relationships>"
+    ),
+    "xl/styles.xml": (
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font/><font><b/></font></fonts>'
+        '<fills count="1"><fill/></fills><borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+        '<cellXfs count="2"><xf/><xf fontId="1" applyFont="1"/></cellXfs>'
+        "</styleSheet>"
+    ),
+}
 
-        # Define optional string between lines
-        row_sep = row_decoration(lengths) if row_decoration else ""
+# Numbers as they're written in xlsx cells.
+_xsd_number = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?", re.ASCII)
 
-        # generate a list, "head", that contains the header. It will be concat'ed with the data at the end.
-        head = []
-        if self.settings.get("has_header", False):
-            if kwargs.get("top"):
-                head.append(row_sep)
+# Characters that aren't allowed in XML 1.0.
+_xml_illegal = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
 
-            head.append(
-                delimiter + delimiter.join(format_row(self.headers)) + delimiter
-            )
 
-            if kwargs.get("between"):
-                head.append(row_sep)
+# Types as they're named in the schema cache.
+TYPE_NAMES = {"int": int, "float": float, "str": str}
 
-        # Add an optional footer below the construction
-        bottom = [row_sep] if kwargs.get("bottom") else []
 
-        # Join header and formatted body together
-        return (
-            self.settings["newline"].join(
-                chain(
-                    head,
-                    (
-                        delimiter + delimiter.join(format_row(row)) + delimiter
-                        for row in data
-                    ),
-                    bottom,
-                )
-            )
-            + self.settings["newline"]
-        )
+def schema_signature(sample):
+    """Identify the column layout of a file by its first line."""
+    first = sample.splitlines()[0] if sample else ""
+    return hashlib.sha1(first.encode("utf-8")).hexdigest()[:16]
 
-    def dsv(self, data):
-        """
-        Delimited tabular format converter.
-        This is like taking coals to Newcastle, but useful for changing formats
-        """
-        self.set_syntax("Plain Text")
 
-        sink = io.StringIO()
-        writer = csv.writer(
-            sink,
-            dialect=self.settings.get("output_dialect"),
-            delimiter=self.settings.get("output_delimiter"),
-            lineterminator=self.settings.get("newline", os.linesep),
-        )
-        if self.settings.get("has_header") is not False:
-            writer.writerow(self.headers)
-        writer.writerows(data)
-        sink.seek(0)
-        return sink.read()
+def schema_cache_path(setting):
+    """
+    Path of the schema cache for the schema_cache setting: None when it's off,
+    the setting itself if it's a path, or DataConverter's folder in Sublime Text's cache.
+    """
+    if not setting:
+        return None
 
-    def html(self, data):
-        """HTML Table converter."""
-        # Uses {i} and {n} as shorthand for self.settings['indent'] and self.settings['newline'].
-        self.set_syntax("HTML")
-        thead, tbody = "", ""
+    if isinstance(setting, str):
+        return os.path.abspath(os.path.expanduser(setting))
 
-        tr = "{{i}}{{i}}<tr>{{n}}{0}{{i}}{{i}}</tr>"
+    return os.path.join(cache_folder(), "schemas.json")
 
-        # Render the table head, if there is one
-        if self.settings.get("has_header") is True:
-            th = (
-                "{i}{i}{i}<th>"
-                + ("</th>{n}{i}{i}{i}<th>".join(self.headers))
-                + "</th>{n}"
-            )
-            thead = "{i}<thead>{n}" + tr.format(th) + "{n}{i}</thead>{n}"
 
-        else:
-            thead = ""
+def cache_folder():
+    """DataConverter's folder in Sublime Text's cache, or in ~/.cache outside of Sublime Text."""
+    if sublime is not None:
+        base = sublime.cache_path()
+    else:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
 
-        # Render table rows
-        tbody = "{n}".join(
-            tr.format(
-                "{n}".join("{i}{i}{i}<td>" + self._escape(r) + "</td>" for r in row)
-                + "{n}"
-            )
-            for row in data
-        )
+    return os.path.join(base, "DataConverter")
 
-        table = (
-            "<table>{n}" + thead + "{i}<tbody>{n}" + tbody + "{n}{i}</tbody>{n}</table>"
-        ).format(i=self.settings["indent"], n=self.settings["newline"])
 
-        if self.settings["html_utf8"]:
-            return table
-        else:
-            return table.encode("ascii", "xmlcharrefreplace").decode("ascii")
+class FileLock(object):
+    """
+    A lock shared between processes: a lock file, created while it's held.
+    A lock file older than stale seconds is left over from a process that died, and is removed.
+    """
 
-    def gherkin(self, data):
-        """Cucumber/Gherkin converter"""
-        self.set_syntax("Cucumber", "Cucumber Steps")
-        return self._spaced_text(data, "|")
+    def __init__(self, path, timeout=10, stale=30):
+        self.path = path
+        self.timeout = timeout
+        self.stale = stale
 
-    def javascript(self, data):
-        """JavaScript object converter"""
-        self.set_syntax("JavaScript")
-        linebreak = "}," + self.settings["newline"] + self.settings["indent"] + "{"
-        content = (
-            "{"
-            + linebreak.join(
-                self.type_loop(r, '"{field}": {value}', ", ") for r in data
-            )
-            + "}"
-        )
+    def __enter__(self):
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                pass
 
-        return (
-            "["
-            + self.settings["newline"]
-            + self.settings["indent"]
-            + content
-            + self.settings["newline"]
-            + "];"
-        )
+            try:
+                if time.time() - os.path.getmtime(self.path) > self.stale:
+                    os.remove(self.path)
+                    continue
+            except OSError:
+                # Released (or removed as stale) by another process meanwhile.
+                continue
 
-    def jira(self, data):
-        head = "||" + ("||").join(self.headers) + "||" + self.settings["newline"]
+            if time.time() > deadline:
+                raise OSError("DataConverter: timed out waiting for " + self.path)
+            time.sleep(0.01)
 
-        fmt = "|" + ("|{}" * len(self.headers)) + "|"
-        print("DataConverter: Formatting JIRA row with", fmt)
-        content = (self.settings["newline"]).join(fmt.format(*r) for r in data)
+    def __exit__(self, *exc):
+        os.remove(self.path)
 
-        return head + content + self.settings["newline"]
 
-    def json(self, data):
-        """JSON properties converter"""
-        self.set_syntax("JSON")
-        return json.dumps(
-            [dict(zip(self.headers, row)) for row in data],
-            indent=len(self.settings["indent"]),
-            ensure_ascii=False,
-        )
+class SchemaCache(object):
+    """
+    The dialect, header decision and column types found for files, saved as JSON.
 
-    def json_columns(self, data):
-        """JSON Array of Columns converter"""
-        self.set_syntax("JSON")
-        return json.dumps(
-            list(zip_longest(*data)),
-            indent=len(self.settings["indent"]),
-            separators=(",", ":"),
-        )
+    Entries are keyed by path and the signature of the file's first line. When a file
+    is converted again with the same columns, inference is skipped, and the types
+    (found by scanning every row) stay the same from one conversion to the next.
+    When a file's columns change, its old entry is replaced, unless it's pinned.
+    Only the max_entries most recently saved unpinned entries are kept.
+    """
 
-    def json_rows(self, data):
-        """JSON Array of Rows converter"""
-        self.set_syntax("JSON")
-        return json.dumps(
-            list(data), indent=len(self.settings["indent"]), separators=(",", ":")
-        )
+    max_entries = 500
 
-    def json_keyed(self, data):
-        """JSON, first row is key"""
-        self.set_syntax("JSON")
+    def __init__(self, path):
+        self.path = path
+        self.files = self.load()
+
+        # Sources added, changed or removed since loading.
+        self.changed = set()
+
+    def load(self):
         try:
-            keydict = {
-                self._escape(row[0]): {k: v for k, v in zip_longest(self.headers, row)}
-                for row in data
-            }
-        except IndexError:
-            raise IndexError(
-                "Problem converting to dictionary. Check that there are no empty rows."
-            )
+            with io.open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("files", {})
 
-        return json.dumps(
-            keydict, indent=len(self.settings["indent"]), separators=(",", ":")
-        )
+        except (OSError, ValueError, AttributeError):
+            return {}
 
-    def markdown(self, data):
-        """markdown table format"""
-        self.set_syntax("Text", "Markdown")
+    def save(self):
+        """
+        Write the changed sources, keeping entries saved since loading (e.g. by other workers).
+        The cache is locked from loading to writing, so workers saving at once don't drop each other's entries.
+        """
+        folder = os.path.dirname(self.path)
+        os.makedirs(folder, exist_ok=True)
+
+        with FileLock(self.path + ".lock"):
+            files = self.load()
+            for source in self.changed:
+                if self.files.get(source):
+                    files[source] = self.files[source]
+                else:
+                    files.pop(source, None)
 
-        def decorate(lengths):
-            fields = "|".join(" " + ("-" * v) + " " for v in lengths)
-            return "|" + fields + "|"
+            self.files, self.changed = files, set()
+            self.trim()
 
-        return self._spaced_text(data, "|", decorate, between=True)
+            fd, partial = tempfile.mkstemp(dir=folder, suffix=".part")
+            with io.open(fd, "w", encoding="utf-8") as f:
+                json.dump({"files": self.files}, f, indent=2, sort_keys=True)
 
-    def mysql(self, data):
-        """MySQL converter"""
-        fields = ",{n}{i}".join(
-            h + " " + _mysql_type(t)
-            for h, t in zip(self.headers, self.settings["types"])
-        )
-        create = (
-            "CREATE TABLE IF NOT EXISTS {table} ("
-            "{n}{i}id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,{n}"
-            + "{i}"
-            + fields
-            + "{n}"
-            ");"
-        )
-        return self._sql(data, create)
+            os.replace(partial, self.path)
 
-    def perl(self, data):
-        """Perl converter"""
-        self.set_syntax("Perl")
-        output = "}},{n}{i}{{".join(
-            self.type_loop(r, "{q}{field}{q}=>{value}", null="undef") for r in data
-        )
-        return ("[{n}{i}{{" + output + "}}{n}];").format(
-            n=self.settings["newline"], i=self.settings["indent"]
+    def get(self, source, signature):
+        """The entry for source, if its first line still has this signature."""
+        return self.files.get(source, {}).get(signature)
+
+    def put(self, source, signature, entry):
+        """Add or replace the entry for source, keeping its pinned entries."""
+        entries = self.files.get(source, {})
+        if entries.get(signature, {}).get("pinned"):
+            return
+
+        entries = {k: v for k, v in entries.items() if v.get("pinned")}
+        entries[signature] = dict(entry, pinned=False, used=time.time())
+        self.files[source] = entries
+        self.changed.add(source)
+        self.save()
+
+    def pin(self, source, pinned=True):
+        """Pin (or unpin) the entries for source. Returns False if there aren't any."""
+        for entry in self.files.get(source, {}).values():
+            entry["pinned"] = pinned
+
+        self.changed.add(source)
+        self.save()
+        return bool(self.files.get(source))
+
+    def forget(self, source):
+        """Remove the entries for source, pinned or not."""
+        self.files.pop(source, None)
+        self.changed.add(source)
+        self.save()
+
+    def trim(self):
+        """Remove the least recently used unpinned entries, beyond max_entries."""
+        unpinned = sorted(
+            (entry.get("used", 0), source, signature)
+            for source, entries in self.files.items()
+            for signature, entry in entries.items()
+            if not entry.get("pinned")
         )
+        for _, source, signature in unpinned[: -self.max_entries]:
+            del self.files[source][signature]
+            if not self.files[source]:
+                del self.files[source]
+
+
+class ResultCache(object):
+    """
+    Recent conversions, kept in memory, least recently used first out, up to max_bytes in all.
+
+    Keys are tuples whose first item is the kind of entry: "result" for converted text,
+    "rows" for parsed rows, headers and types, which are reused for converting the same
+    text to another format. Hits and misses are counted by kind.
+    """
+
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits, self.misses = Counter(), Counter()
+        self.evictions = 0
+
+    def get(self, key):
+        """The value for key, or None."""
+        try:
+            value, _ = self.entries[key]
+        except KeyError:
+            self.misses[key[0]] += 1
+            return None
 
-    def _php(self, data, array_open, array_close):
-        """General PHP Converter"""
-        self.set_syntax("PHP")
+        self.entries.move_to_end(key)
+        self.hits[key[0]] += 1
+        return value
 
+    def put(self, key, value, size):
+        """
+        Keep value, which takes about size bytes. Values over half of max_bytes
+        aren't kept, so one large conversion doesn't push out everything else.
+        """
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+
+        if size > self.max_bytes // 2:
+            return False
+
+        self.entries[key] = (value, size)
+        self.bytes += size
+        self.trim()
+        return True
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.trim()
+
+    def trim(self):
+        """Remove the least recently used entries, until they fit in max_bytes."""
+        while self.bytes > self.max_bytes:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """A summary of what's in the cache, and how often it's been used."""
+        kinds = Counter(key[0] for key in self.entries)
         return (
-            array_open
-            + self.settings["newline"]
-            + ("," + self.settings["newline"]).join(
-                self.settings["indent"]
-                + array_open
-                + self.type_loop(row, "{q}{field}{q}=>{value}")
-                + array_close
-                for row in data
-            )
-            + self.settings["newline"]
-            + array_close
-            + ";"
+            "{} results and {} parsed selections, {:.1f} of {:.0f} MB. "
+            "Results: {} hits, {} misses. Parsed: {} hits, {} misses. {} evicted."
+        ).format(
+            kinds["result"],
+            kinds["rows"],
+            self.bytes / 1048576.0,
+            self.max_bytes / 1048576.0,
+            self.hits["result"],
+            self.misses["result"],
+            self.hits["rows"],
+            self.misses["rows"],
+            self.evictions,
         )
 
-    def php4(self, data):
-        """Older-style PHP converter"""
-        return self._php(data, "array(", ")")
 
-    def php54(self, data):
-        """PHP 5.4 converter"""
-        return self._php(data, "[", "]")
+def source_key(selection):
+    """
+    Identify a selection's contents, for ResultCache: a hash of the text,
+    or for a MappedCSV, its path, modification time and size.
+    """
+    if isinstance(selection, MappedCSV):
+        stat = os.stat(selection.path)
+        return (selection.path, stat.st_mtime_ns, stat.st_size)
 
-    def postgres(self, data):
-        """PostgreSQL converter"""
-        fields = ",{n}{i}".join(
-            h + " " + _postgres_type(t)
-            for h, t in zip(self.headers, self.settings["types"])
-        )
-        create = (
-            "CREATE TABLE IF NOT EXISTS {table} ({n}"
-            "{i}id serial,{n}" + "{i}" + fields + "{n}"
-            ");"
-        )
-        return self._sql(data, create)
+    return hashlib.sha1(selection.encode("utf-8", "surrogatepass")).hexdigest()
 
-    def python_dict(self, data):
-        """Python dict converter"""
-        self.set_syntax("Python")
 
-        fields = [
-            {
-                k: _cast(v, t)
-                for k, v, t in zip_longest(self.headers, row, self.settings["types"])
+def rows_size(rows, chars):
+    """
+    About how many bytes a list of parsed rows takes in memory, given the number
+    of characters they were parsed from. Measuring every cell would take longer than parsing.
+    """
+    cells = sum(map(len, rows))
+    return chars + cells * (sys.getsizeof("") + 8) + len(rows) * sys.getsizeof([])
+
+
+# Adding a format? Check if it belongs in no_space_formats or untyped_formats, and add it to EXTENSIONS.
+
+
+class DataConverter(object):
+    """
+    Converts delimited text into other formats.
+    Doesn't depend on a Sublime Text view, so it can also be used on files and from the command line.
+    """
+
+    # This will be set later on, in the converter function
+    syntax = None
+    settings = dict()
+    escapechar = "\\"
+    quotechar = "'"
+    headers = []
+    converter = None
+
+    # These format can't have spaces in field names. By default, spaces replaced with "_".
+    no_space_formats = (
+        "actionscript",
+        "javascript",
+        "mysql",
+        "sqlite",
+        "xml",
+        "xml_properties",
+        "yaml",
+    )
+
+    # These formats convert each row independently, so large inputs can be converted
+    # in parallel chunks. Each has a _{format}_parts method that returns Parts.
+    chunked_formats = (
+        "dsv",
+        "gherkin",
+        "html",
+        "json",
+        "json_rows",
+        "markdown",
+        "mysql",
+        "perl",
+        "php4",
+        "php54",
+        "postgres",
+        "ruby",
+        "sqlite",
+        "text_table",
+        "xml",
+        "xml_properties",
+        "yaml",
+    )
+
+    # These formats make bytes, not text, so they can only be written to files.
+    binary_formats = ("xlsx",)
+
+    # These chunked formats need the width of every field before converting any row.
+    spaced_formats = ("gherkin", "markdown", "text_table")
+
+    # Defaults for formats defined in the "formats" setting (see _template_parts).
+    template_defaults = {
+        "header": "",
+        "header_cell": "{field}",
+        "row": "{cells}",
+        "cell": "{value}",
+        "join": ", ",
+        "header_join": None,
+        "separator": "{newline}",
+        "footer": "",
+        "quote": '"',
+        "escape": "\\",
+        "null": "null",
+        "empty_null": False,
+        "types": {},
+        "typed": True,
+        "merge_headers": False,
+        "syntax": "Plain Text",
+        "extension": "txt",
+    }
+
+    # concurrent.futures executor class for converting in chunks. None to always convert serially.
+    executor = None
+
+    # Inputs at least this many characters (or bytes) are converted in chunks, when possible.
+    chunk_threshold = 1 << 22
+
+    # SchemaCache of the dialects, headers and types of files. None to always infer them.
+    schemas = None
+
+    # Path of the file being converted, for looking it up in schemas. None for other text.
+    source_path = None
+
+    # ColumnProfiles of the selection, when SQL column types are sized from the data.
+    column_profiles = None
+
+    # ResultCache of parsed rows, and the source_key of the selection. None to always parse.
+    cache = None
+    content_key = None
+
+    # These formats don't need to be checked for int/str/etc types.
+    untyped_formats = (
+        "dsv",
+        "gherkin",
+        "html",
+        "jira",
+        "json",
+        "json_columns",
+        "json_rows",
+        "json_keyed",
+        "profile",
+        "text_table",
+        "wiki",
+        "xml",
+        "xml_properties",
+        "yaml",
+    )
+
+    def get_converter(self, fmt):
+        """
+        The converter for fmt: a format defined in settings["formats"], or a method.
+
+        Raises:
+            AttributeError: for an unknown format.
+        """
+        if fmt in self.settings.get("formats", {}):
+
+            def template(data):
+                return self._join_parts(data, self._template_parts(fmt))
+
+            template.__name__ = fmt
+            return template
+
+        if fmt not in EXTENSIONS:
+            raise AttributeError("unknown format " + repr(fmt))
+
+        return getattr(self, fmt)
+
+    def is_chunked(self, fmt):
+        """Check if fmt converts each row independently, with Parts."""
+        return fmt in self.chunked_formats or fmt in self.settings.get("formats", {})
+
+    def parts(self, fmt):
+        """The Parts of a chunked format."""
+        if fmt in self.settings.get("formats", {}):
+            return self._template_parts(fmt)
+        return getattr(self, "_" + fmt + "_parts")()
+
+    def build_settings(self, kwargs, user_settings, newline, indent):
+        """
+        Get settings from kwargs and user settings.
+
+        Args:
+            kwargs (dict): command arguments, including "format".
+            user_settings (dict or sublime.Settings): DataConverter settings.
+            newline (str): line ending for the output.
+            indent (str): indentation for the output.
+        """
+        settings = dict()
+
+        # Formats defined with templates
+        settings["formats"] = user_settings.get("formats") or {}
+        template = settings["formats"].get(kwargs["format"])
+
+        # Headers
+        # True, "sniff" or "never"
+        settings["headers"] = user_settings.get("headers")
+
+        # Whitespace
+        # Combine headers for certain formats
+        settings["mergeheaders"] = kwargs["format"] in self.no_space_formats
+        if template is not None:
+            settings["mergeheaders"] = template.get("merge_headers", False)
+
+        # Typing
+        # Don't like having 'not' in this expression, but it makes more sense to use
+        # 'typed' from here on out, and it's less error prone to use the (smaller)
+        # list of untyped formats.
+        settings["typed"] = kwargs["format"] not in self.untyped_formats
+        if template is not None:
+            settings["typed"] = template.get("typed", True)
+
+        # New lines
+        settings["newline"] = newline
+
+        user_quoting = user_settings.get("quoting", "QUOTE_MINIMAL")
+        settings["quoting"] = getattr(csv, user_quoting, csv.QUOTE_MINIMAL)
+
+        # Quote stripping
+        settings["strip_quotes"] = user_settings.get("strip_quotes", True)
+
+        # Indentation
+        settings["indent"] = indent
+
+        # header-joiner
+        settings["header_joiner"] = user_settings.get("header_joiner", "")
+
+        # HTML characters
+        settings["html_utf8"] = user_settings.get("html_utf8", True)
+
+        # Dialect
+        if user_settings.get("use_dialect", False):
+            settings["dialect"] = set_dialect(
+                user_settings.get("use_dialect"), user_settings.get("dialects", {})
+            )
+
+        settings["default_variable"] = user_settings.get(
+            "default_variable", "DataConverter"
+        )
+
+        # JSON serializer ("auto", "json", "orjson" or "ujson"), and whether to leave out indentation
+        settings["json_backend"] = user_settings.get("json_backend", "auto")
+        settings["compact"] = kwargs.get("compact", user_settings.get("compact", False))
+
+        # Worker processes for converting large inputs in chunks
+        settings["workers"] = user_settings.get("workers") or os.cpu_count()
+
+        # These settings are solely for DSV converter.
+        settings["output_delimiter"] = kwargs.get("output_delimiter")
+        settings["output_dialect"] = kwargs.get("output_dialect")
+
+        # Convert only these rows, a [first, last) pair counted from 0 after the header.
+        settings["rows"] = kwargs.get("rows")
+
+        # Share repeated strings in xlsx files, instead of writing them inline
+        settings["xlsx_shared_strings"] = user_settings.get(
+            "xlsx_shared_strings", False
+        )
+
+        # Size SQL column types from a profile of the data
+        settings["size_columns"] = kwargs.get(
+            "size_columns", user_settings.get("size_columns", False)
+        )
+
+        # Where to remember the dialects, headers and types of files (see SchemaCache)
+        settings["schema_cache"] = schema_cache_path(user_settings.get("schema_cache"))
+
+        # Where the output goes: "replace" the selection, a "new_view", a "file",
+        # or "auto" to choose by the estimated size of the output (see choose_output)
+        settings["output"] = kwargs.get(
+            "output", user_settings.get("output", "replace")
+        )
+        settings["output_thresholds"] = user_settings.get("output_thresholds")
+        settings["output_file"] = kwargs.get(
+            "output_file", user_settings.get("output_file")
+        )
+
+        # Megabytes of recent conversions to keep in memory, for converting them again (see ResultCache)
+        settings["result_cache"] = user_settings.get("result_cache", 64)
+
+        # Compression extension for files written next to the source (e.g. "gz"),
+        # and whether to compress in a separate thread. Files named with a
+        # compression extension are always compressed.
+        settings["compress"] = kwargs.get("compress", user_settings.get("compress"))
+        settings["threaded_compression"] = kwargs.get(
+            "threaded_compression", user_settings.get("threaded_compression", False)
+        )
+
+        return settings
+
+    def convert(self, selection):
+        """Convert delimited text (a str, MappedCSV or CompressedCSV) with self.converter."""
+        data = self.prepare(selection)
+
+        # Run converter
+        if self.chunkable(selection):
+            return self.convert_chunked(selection)
+
+        return self.converter(data)
+
+    def convert_pieces(self, selection, size=5000):
+        """
+        Convert like convert, but yield the output in pieces, so it can be written as it's made.
+        Formats with Parts yield the head, then the rows in batches of size, then the tail.
+        Other formats yield their whole output at once.
+        """
+        data = self.prepare(selection)
+        fmt = self.converter.__name__
+
+        if self.chunkable(selection):
+            yield self.convert_chunked(selection)
+            return
+
+        if fmt in self.binary_formats:
+            yield from getattr(self, "_" + fmt + "_pieces")(data)
+            return
+
+        if not self.is_chunked(fmt):
+            yield self.converter(data)
+            return
+
+        if fmt in self.spaced_formats:
+            # The field widths depend on every row.
+            data = list(data)
+            self.lengths = self._spaced_lengths(data, self.headers)
+
+        parts = self.parts(fmt)
+        data, empty = iter(data), True
+
+        for batch in iter(lambda: list(islice(data, size)), []):
+            yield (parts.head if empty else parts.separator) + parts.rows(batch)
+            empty = False
+
+        if not empty:
+            yield parts.tail
+        elif parts.empty is not None:
+            yield parts.empty
+        else:
+            yield parts.head + parts.tail
+
+    def prepare(self, selection):
+        """Sniff the selection, assign headers and types, and return its rows."""
+        self.syntax = None
+
+        # Rows parsed before, perhaps for another format.
+        rows_key = self.rows_key() if self.caching_rows(selection) else None
+        if rows_key is not None:
+            parsed = self.cache.get(rows_key)
+            if parsed is not None:
+                return self.prepare_parsed(parsed)
+
+        # The sniffer takes \r for a delimiter in CRLF files, so it sees \n line ends only.
+        sample = source_sample(selection).replace("\r\n", "\n").replace("\r", "\n")
+        schema = None
+
+        # CSV dialect
+        # Sniff if we haven't done this before, or we sniffed before.
+        # A dialect found for this file before is used instead, if it's in the schema cache.
+        if "dialect" not in self.settings or self.settings.get("sniffed"):
+            schema = self.cached_schema(sample)
+            if schema is None:
+                self.settings["dialect"] = sniff(sample)
+                self.settings["sniffed"] = self.settings["dialect"] != "excel"
+            else:
+                self.settings["dialect"] = params_dialect(schema["dialect"])
+                self.settings["sniffed"] = True
+                print("DataConverter: using cached schema for", self.source_path)
+
+            print("DataConverter: using dialect", self.settings["dialect"])
+
+        headers = self.assign_headers(sample, schema, merge=False)
+        self.headers = self.format_headers(headers)
+        data = self.import_csv(selection)
+
+        # The cached types don't apply if the headers setting disagrees with the cache.
+        stale = (
+            schema is None
+            or schema["has_header"] != self.settings["has_header"]
+            or (self.settings["typed"] and schema.get("types") is None)
+        )
+
+        if self.settings["typed"]:
+            # Assign a list of tuples (headername, type)
+            if stale:
+                self.settings["types"] = self.get_types(selection)
+            else:
+                self.settings["types"] = [TYPE_NAMES[t] for t in schema["types"]]
+
+            print(
+                "DataConverter found these fields and types:",
+                self.settings["types"],
+            )
+
+        # Profile the data to size SQL column types. This reads the data an extra time.
+        self.column_profiles = None
+        if self.settings.get("size_columns") and self.converter.__name__ in (
+            "mysql",
+            "postgres",
+        ):
+            self.column_profiles = profile_columns(
+                self.import_csv(selection), len(self.headers)
+            )
+
+        if stale and self.caching_schema():
+            self.schemas.put(
+                self.source_path,
+                schema_signature(sample),
+                {
+                    "header": sample.splitlines()[0][:200] if sample else "",
+                    "dialect": dialect_params(self.settings["dialect"]),
+                    "has_header": self.settings["has_header"],
+                    "types": (
+                        [t.__name__ for t in self.settings["types"]]
+                        if self.settings["typed"]
+                        else None
+                    ),
+                },
+            )
+
+        if rows_key is not None:
+            data = list(data)
+            self.cache.put(
+                rows_key,
+                {
+                    "settings": {
+                        key: self.settings[key]
+                        for key in ("dialect", "sniffed", "has_header")
+                        if key in self.settings
+                    },
+                    "headers": headers,
+                    "rows": data,
+                    "types": self.settings["types"] if self.settings["typed"] else None,
+                },
+                rows_size(data, source_size(selection)),
+            )
+
+        return data
+
+    def prepare_parsed(self, parsed):
+        """Like prepare, with the rows, headers and types from an earlier conversion."""
+        print("DataConverter: using parsed rows from the cache")
+        self.settings.update(parsed["settings"])
+        self.headers = self.format_headers(parsed["headers"])
+        data = parsed["rows"]
+
+        if self.settings["typed"]:
+            # The earlier conversion may have been to an untyped format.
+            if parsed["types"] is None:
+                limit = None if self.caching_schema() else 10
+                parsed["types"] = list(parse_types(iter(data), limit))
+
+            self.settings["types"] = parsed["types"]
+            print(
+                "DataConverter found these fields and types:",
+                self.settings["types"],
+            )
+
+        self.column_profiles = None
+        if self.settings.get("size_columns") and self.converter.__name__ in (
+            "mysql",
+            "postgres",
+        ):
+            self.column_profiles = profile_columns(iter(data), len(self.headers))
+
+        return iter(data)
+
+    def caching_rows(self, selection):
+        """
+        Check whether to keep the selection's parsed rows in self.cache. Parsed rows
+        take over ten times the space of the text, so only selections up to
+        a thirty-second of the cache are kept.
+        """
+        if self.cache is None or self.content_key is None:
+            return False
+
+        return source_size(selection) <= self.cache.max_bytes // 32
+
+    def rows_key(self):
+        """
+        Key of the selection's parsed rows in self.cache, from the settings that affect parsing.
+        Found before parsing, since parsing sets the dialect and has_header.
+        """
+        sniffing = "dialect" not in self.settings or self.settings.get("sniffed")
+        return (
+            "rows",
+            self.content_key,
+            None if sniffing else repr(self.settings["dialect"]),
+            self.settings["headers"],
+            repr(self.settings.get("rows")),
+            self.caching_schema(),
+        )
+
+    def cached_schema(self, sample):
+        """The schema cache's entry for the file being converted, if there is one."""
+        if self.schemas is None or self.source_path is None:
+            return None
+
+        return self.schemas.get(self.source_path, schema_signature(sample))
+
+    def caching_schema(self):
+        """Check whether to save what's found about the file being converted to the schema cache."""
+        return (
+            self.schemas is not None
+            and self.source_path is not None
+            and not self.settings.get("rows")
+        )
+
+    def chunkable(self, selection):
+        """Check whether to convert the selection in parallel chunks."""
+        if isinstance(selection, CompressedCSV):
+            return False
+
+        size = source_size(selection)
+
+        return (
+            self.executor is not None
+            and (self.settings.get("workers") or 0) > 1
+            and self.is_chunked(self.converter.__name__)
+            and not self.settings.get("rows")
+            and size >= self.chunk_threshold
+        )
+
+    def convert_chunked(self, selection):
+        """
+        Convert the selection in chunks of whole records, in parallel worker processes.
+        The chunks are converted with the format's Parts, and joined in order.
+        """
+        fmt = self.converter.__name__
+        workers = self.settings["workers"]
+        quotechar = get_dialect(self.settings["dialect"]).quotechar or '"'
+
+        if isinstance(selection, MappedCSV):
+            bounds = split_records(
+                selection.map,
+                workers * 4,
+                quotechar.encode(selection.encoding),
+                selection.newline,
+                selection.offsets[0],
+            )
+            chunks = [(selection.path, a, b) for a, b in zip(bounds, bounds[1:])]
+        else:
+            newline = "\n" if "\n" in selection else "\r"
+            bounds = split_records(selection, workers * 4, quotechar, newline)
+            chunks = [selection[a:b] for a, b in zip(bounds, bounds[1:])]
+
+        # Only the first chunk contains the header.
+        skips = [1 if self.settings.get("has_header") is True else 0]
+        skips += [0] * (len(chunks) - 1)
+
+        settings = dict(self.settings, dialect=dialect_params(self.settings["dialect"]))
+        print("DataConverter: converting in", len(chunks), "chunks")
+
+        with self.executor(max_workers=workers) as pool:
+            if fmt in self.spaced_formats:
+                # Measure the fields in parallel, then reduce to the widest.
+                self.lengths = [len(x) for x in self.headers]
+                for lengths in pool.map(
+                    convert_chunk,
+                    repeat(fmt),
+                    repeat((settings, self.headers, None)),
+                    chunks,
+                    skips,
+                    repeat(True),
+                ):
+                    self.lengths = [
+                        max(i, j)
+                        for i, j in zip_longest(self.lengths, lengths, fillvalue=0)
+                    ]
+
+            state = (settings, self.headers, getattr(self, "lengths", None))
+            bodies = list(
+                pool.map(convert_chunk, repeat(fmt), repeat(state), chunks, skips)
+            )
+
+        parts = self.parts(fmt)
+        body = parts.separator.join(b for b in bodies if b)
+        if not body and parts.empty is not None:
+            return parts.empty
+
+        return parts.head + body + parts.tail
+
+    def assign_headers(self, sample, schema=None, merge=True):
+        """
+        Assign headers to the data set. When sniffing, schema (from the schema cache) says if there are headers.
+        If merge is False, the headers aren't formatted (see format_headers).
+        """
+        # Use the dialect to get the first line of the sample as a dict
+        # Do this here beacause we'll want the length of the data no matter what
+        sample_io = io.StringIO(sample)
+        headers = next(csv.reader(sample_io, dialect=self.settings["dialect"]))
+
+        if self.settings["headers"] is True:
+            self.settings["has_header"] = True
+
+        elif self.settings["headers"] == "never" or self.settings["headers"] is False:
+            self.settings["has_header"] = False
+
+        elif schema is not None:
+            self.settings["has_header"] = schema["has_header"]
+
+        else:
+            # If not told to definitely try to use headers or definitely not, we sniff for them.
+            # Sniffing isn't perfect, especially with short data sets and strange delimiters
+            try:
+                sniffed_headers = csv.Sniffer().has_header(sample)
+
+                if sniffed_headers:
+                    self.settings["has_header"] = True
+                    print("DataConverter: CSV Sniffer found headers")
+                else:
+                    self.settings["has_header"] = False
+                    print("DataConverter: CSV Sniffer didn't find headers")
+
+            except _csv.Error:
+                print(
+                    "DataConverter: CSV module had trouble sniffing for headers. Assuming they exist."
+                )
+                print(
+                    'DataConverter: Add "headers": false to your settings file to assume no headers.'
+                )
+                self.settings["has_header"] = True
+
+        # Using ['val1', 'val2', ...] if 'headers=never' or Sniffer says there aren't headers
+        if self.settings.get("has_header") is False:
+            headers = ["val{}".format(x) for x in range(1, 1 + len(headers))]
+
+        return self.format_headers(headers) if merge else headers
+
+    def format_headers(self, headers):
+        """Replace spaces in the header names for some formats."""
+        if self.settings.get("mergeheaders", False) is True:
+            hj = self.settings.get("header_joiner", "_")
+            headers = [x.replace(" ", hj) for x in headers]
+
+        return headers
+
+    def import_csv(self, selection):
+        """
+        Read CSV data from a str, MappedCSV or CompressedCSV.
+        Skips the header, and rows outside of settings["rows"] (a [first, last) pair).
+        """
+        first, last = self.settings.get("rows") or (0, None)
+
+        # Remove header from entries that came with one.
+        if self.settings.get("has_header", False) is True:
+            first += 1
+            last = None if last is None else last + 1
+
+        if isinstance(selection, MappedCSV):
+            selection.set_quotechar(get_dialect(self.settings["dialect"]).quotechar)
+            return csv.reader(
+                selection.lines(first, last), dialect=self.settings["dialect"]
+            )
+
+        if isinstance(selection, CompressedCSV):
+            reader = csv.reader(selection.open(), dialect=self.settings["dialect"])
+        else:
+            reader = csv.reader(
+                io.StringIO(selection), dialect=self.settings["dialect"]
+            )
+
+        return islice(reader, first, last)
+
+    def get_types(self, selection):
+        # If untyped, return empty list.
+        if self.settings.get("typed", False) is False:
+            return []
+
+        # Types saved to the schema cache are found from every row, so they don't change.
+        limit = None if self.caching_schema() else 10
+        return list(parse_types(self.import_csv(selection), limit))
+
+    def set_syntax(self, path, file_name=False):
+        """Note the syntax of the converted text. It's assigned to the view after converting."""
+        self.syntax = (path, file_name or path)
+
+    def _escape(self, string):
+        """Add an escape character in front of a quote character in given string."""
+        return (string or "").replace(self.quotechar, self.escapechar + self.quotechar)
+
+    def _join_parts(self, data, parts):
+        """Convert data with the Parts of a format."""
+        body = parts.rows(data)
+        if not body and parts.empty is not None:
+            return parts.empty
+
+        return parts.head + body + parts.tail
+
+    def _template_parts(self, fmt):
+        """
+        Parts for a format defined in settings["formats"].
+        The templates are compiled once, into a str.format string for a whole row.
+
+        Fields in all templates: {newline}, {indent}, {variable}, and {fields} (each header_cell, joined).
+        In header_cell and cell: {field}, {type} (from the "types" map) and {column}.
+        In row: {cells} (each cell, joined). In cell: {value}, which is quoted and escaped if it's a string.
+        header_join joins header cells, join joins cells (and header cells, if header_join isn't given).
+        """
+        template = dict(self.template_defaults, **self.settings["formats"][fmt])
+        syntax = template["syntax"]
+        if isinstance(syntax, list):
+            self.set_syntax(*syntax)
+        else:
+            self.set_syntax(syntax)
+
+        types = list(self.settings.get("types") or [])
+        types += [str] * (len(self.headers) - len(types))
+        type_names = [template["types"].get(t.__name__, t.__name__) for t in types]
+        quote, escape, null = template["quote"], template["escape"], template["null"]
+
+        static = {
+            "newline": _literal(self.settings["newline"]),
+            "indent": _literal(self.settings["indent"]),
+            "variable": _literal(self.settings["default_variable"]),
+        }
+
+        def columns(name, join, extra):
+            return compile_template(join, static).join(
+                compile_template(
+                    template[name],
+                    dict(
+                        static,
+                        field=_literal(field),
+                        type=_literal(type_name),
+                        column=str(i),
+                        **extra(i)
+                    ),
+                )
+                for i, (field, type_name) in enumerate(zip(self.headers, type_names))
+            )
+
+        try:
+            static["fields"] = columns(
+                "header_cell",
+                (
+                    template["join"]
+                    if template["header_join"] is None
+                    else template["header_join"]
+                ),
+                lambda i: {},
+            )
+            cells = columns(
+                "cell", template["join"], lambda i: {"value": "{" + str(i) + "}"}
+            )
+            row_format = compile_template(template["row"], dict(static, cells=cells))
+            head, separator, tail = (
+                compile_template(template[name], static).format()
+                for name in ("header", "separator", "footer")
+            )
+
+        except KeyError as err:
+            raise ValueError(
+                "DataConverter: unknown field {} in the {} format".format(err, fmt)
+            )
+        except ValueError as err:
+            raise ValueError("{} (in the {} format)".format(err, fmt))
+
+        def text(value):
+            if value is None or (template["empty_null"] and value == ""):
+                return null
+            if escape and escape != quote:
+                value = value.replace(escape, escape + escape)
+            if quote:
+                value = value.replace(quote, (escape or "") + quote)
+            return quote + value + quote
+
+        def number(typ):
+            def render(value):
+                try:
+                    return str(typ(value))
+                except (TypeError, ValueError):
+                    return text(value)
+
+            return render
+
+        render = [
+            number(t) if self.settings["typed"] and t is not str else text
+            for t in types
+        ]
+        pad = [None] * len(render)
+        row_format = row_format.format
+
+        def rows(data):
+            # Rows are padded with nulls, and cells past the last header are left out.
+            return separator.join(
+                row_format(*[r(value) for r, value in zip(render, row + pad)])
+                for row in data
+            )
+
+        return Parts(head, rows, separator, tail, None)
+
+    def type_loop(self, row, field_format, field_break=None, null=None):
+        """
+        Helper loop for checking types as we write out a row.
+        Strings get quoted, floats and ints don't.
+
+        Args:
+            row (list): returned from csv.reader
+            field_format (str): format for a single field
+            field_break (str): break between fields (default: ', ').
+            null (str): Text to use for None values (default: 'null').
+
+        Returns:
+            str formatted with `formt` (e.g. "{0}=>{1}")
+        """
+        field_break = field_break or ", "
+        null = null or "null"
+        types = self.settings.get("types", [])
+
+        # Creates escaped or proper NULL representation of a value.
+        def applytype(val, typ):
+            if val is None:
+                return null
+            elif typ == str:
+                return "{q}{}{q}".format(self._escape(val), q=self.quotechar)
+
+            value = _cast(val, typ)
+            if typ is not None and isinstance(value, str):
+                # Not of its column's type, so it's quoted like a string.
+                return "{q}{}{q}".format(self._escape(val), q=self.quotechar)
+            return value
+
+        return field_break.join(
+            field_format.format(field=hed, value=applytype(val, typ), q=self.quotechar)
+            for val, hed, typ in zip_longest(row, self.headers, types)
+        )
+
+    # Converters
+    # Note that converters should call self.set_syntax
+
+    def actionscript(self, data):
+        """Actionscript converter"""
+        self.set_syntax("ActionScript")
+        n = self.settings["newline"] + self.settings["indent"]
+        linebreak = "}," + n + "{"
+        output = linebreak.join(
+            self.type_loop(row, "{field}: {value}", field_break=", ") for row in data
+        )
+        return "[" + n + "{" + output + "}" + self.settings["newline"] + "];"
+
+    # ASP / VBScript
+    def asp(self, data):
+        self.set_syntax("ASP")
+        # comment, comment_end = "'", ""
+        output = []
+        C, r = 0, 0
+        cell = self.settings["default_variable"] + "({c},{r})"
+
+        for r, row in enumerate(data):
+            for c, (value, typ) in enumerate(zip_longest(row, self.settings["types"])):
+                typ = typ or get_type(value)
+                if typ is not str and value and get_type(value) is str:
+                    # Not of its column's type, e.g. "n/a" in a column cached as int.
+                    typ = str
+                arr = "{q}{}{q}" if typ == str else "{}"
+                v = self._escape(value or "null")
+                output.append(
+                    (cell + " = " + arr).format(v, c=c, r=r, q=self.quotechar)
+                )
+
+            C = max(C, len(row))
+
+        dim = "Dim " + cell.format(c=C, r=r, n="")
+        output.insert(0, dim)
+        output.insert(
+            0, '\' columnNames = Array("{}")'.format('", "'.join(self.headers))
+        )
+        return self.settings["newline"].join(output) + self.settings["newline"]
+
+    def _spaced_lengths(self, data, headers):
+        """Get the display width of each field in headers and rows of data."""
+        lengths = [len(x) for x in headers]
+        for row in data:
+            cells = (
+                len(unicodedata.normalize("NFKC", val)) + _countwide(val) for val in row
+            )
+            lengths = [max(i, j) for i, j in zip_longest(lengths, cells, fillvalue=0)]
+
+        return lengths
+
+    def _spaced_text(self, data, parts):
+        """
+        General converter for formats with semantic text spacing
+
+        Args:
+            data (csv.reader): Sequence of lists
+            parts (function): returns the Parts of the format, given self.lengths.
+        """
+        # Convert data set from generator to list.
+        data = list(data)
+
+        # Get the length of each field
+        self.lengths = self._spaced_lengths(data, self.headers)
+
+        return self._join_parts(data, parts())
+
+    def _spaced_parts(self, delimiter, row_decoration=None, **kwargs):
+        """
+        Parts for formats with semantic text spacing. Uses the field widths in self.lengths.
+
+        Args:
+            delimiter (str): division between each field
+            row_decoration (function): A function that takes Sequence of row
+                                       lengths and returns a str used to optionally
+                                       decorate the top, bottom, and/or between header and rows.
+            field_format (str): format str for each field. default: ' {: <{fill}} '
+            top (bool): Add the row decoration to the top of the output.
+            between (bool): Add row decoration between the header and the row.
+            bottom (bool): Add row decoration after the output.
+            headers (list): header to use instead of self.headers. It's always shown.
+        """
+        field_format = kwargs.get("field_format", " {: <{fill}} ")
+        headers = kwargs.get("headers")
+        lengths = self.lengths
+        newline = self.settings["newline"]
+
+        def format_row(row):
+            """Helper function that generates a sequence of formatted cells"""
+            for value, width in zip_longest(row, lengths, fillvalue=""):
+                # Account for fullwidth ideographs and uncombined combining diacretics.
+                yield field_format.format(
+                    value, fill=width + _countcombining(value) - _countwide(value)
+                )
+
+        def rows(data):
+            return newline.join(
+                delimiter + delimiter.join(format_row(row)) + delimiter for row in data
+            )
+
+        # Define optional string between lines
+        row_sep = row_decoration(lengths) if row_decoration else ""
+
+        # generate a list, "head", that contains the header. It will be concat'ed with the data at the end.
+        head = []
+        if headers is not None or self.settings.get("has_header", False):
+            if kwargs.get("top"):
+                head.append(row_sep)
+
+            head.append(
+                delimiter
+                + delimiter.join(format_row(headers or self.headers))
+                + delimiter
+            )
+
+            if kwargs.get("between"):
+                head.append(row_sep)
+
+        # Add an optional footer below the construction
+        bottom = [row_sep] if kwargs.get("bottom") else []
+
+        return Parts(
+            "".join(h + newline for h in head),
+            rows,
+            newline,
+            newline + "".join(b + newline for b in bottom),
+            newline.join(head + bottom) + newline,
+        )
+
+    def dsv(self, data):
+        """
+        Delimited tabular format converter.
+        This is like taking coals to Newcastle, but useful for changing formats
+        """
+        return self._join_parts(data, self._dsv_parts())
+
+    def _dsv_parts(self):
+        self.set_syntax("Plain Text")
+
+        def rows(data):
+            sink = io.StringIO()
+            writer = csv.writer(
+                sink,
+                dialect=self.settings.get("output_dialect"),
+                delimiter=self.settings.get("output_delimiter"),
+                lineterminator=self.settings.get("newline", os.linesep),
+            )
+            writer.writerows(data)
+            return sink.getvalue()
+
+        head = ""
+        if self.settings.get("has_header") is not False:
+            head = rows([self.headers])
+
+        return Parts(head, rows, "", "", None)
+
+    def html(self, data):
+        """HTML Table converter."""
+        return self._join_parts(data, self._html_parts())
+
+    def _html_parts(self):
+        self.set_syntax("HTML")
+        n, i = self.settings["newline"], self.settings["indent"]
+
+        # Escape each cell as it's written, rather than re-encoding the finished table.
+        escape = _escape_html if self.settings["html_utf8"] else _escape_html_ascii
+
+        tr_open, tr_close = i + i + "<tr>" + n, i + i + "</tr>"
+
+        # Render the table head, if there is one
+        if self.settings.get("has_header") is True:
+            th = (
+                i * 3
+                + "<th>"
+                + ("</th>" + n + i * 3 + "<th>").join(escape(h) for h in self.headers)
+                + "</th>"
+                + n
+            )
+            thead = i + "<thead>" + n + tr_open + th + tr_close + n + i + "</thead>" + n
+
+        else:
+            thead = ""
+
+        # Render table rows
+        def rows(data):
+            return n.join(
+                tr_open
+                + n.join(i * 3 + "<td>" + escape(r) + "</td>" for r in row)
+                + n
+                + tr_close
+                for row in data
+            )
+
+        head = "<table>" + n + thead + i + "<tbody>" + n
+        return Parts(head, rows, n, n + i + "</tbody>" + n + "</table>", None)
+
+    def gherkin(self, data):
+        """Cucumber/Gherkin converter"""
+        return self._spaced_text(data, self._gherkin_parts)
+
+    def _gherkin_parts(self):
+        self.set_syntax("Cucumber", "Cucumber Steps")
+        return self._spaced_parts("|")
+
+    def javascript(self, data):
+        """JavaScript object converter"""
+        self.set_syntax("JavaScript")
+        linebreak = "}," + self.settings["newline"] + self.settings["indent"] + "{"
+        content = (
+            "{"
+            + linebreak.join(
+                self.type_loop(r, '"{field}": {value}', ", ") for r in data
+            )
+            + "}"
+        )
+
+        return (
+            "["
+            + self.settings["newline"]
+            + self.settings["indent"]
+            + content
+            + self.settings["newline"]
+            + "];"
+        )
+
+    def jira(self, data):
+        head = "||" + ("||").join(self.headers) + "||" + self.settings["newline"]
+
+        width = len(self.headers)
+        fmt = "|" + ("|{}" * width) + "|"
+        print("DataConverter: Formatting JIRA row with", fmt)
+        # Short rows are padded with empty cells, and cells past the last header are left out.
+        content = (self.settings["newline"]).join(
+            fmt.format(*islice(chain(r, repeat("")), width)) for r in data
+        )
+
+        return head + content + self.settings["newline"]
+
+    def json(self, data):
+        """JSON properties converter"""
+        return self._join_parts(data, self._json_parts())
+
+    def _json_parts(self):
+        self.set_syntax("JSON")
+        headers = self.headers
+        return self._json_array_parts(
+            lambda row: dict(zip(headers, row)), separators=None, ensure_ascii=False
+        )
+
+    def _json_array_parts(self, item, separators, ensure_ascii):
+        """
+        Parts for a JSON array with an item for each row.
+        Rows are serialized in batches, so the whole array is never in memory as objects.
+
+        Args:
+            item (function): converts a row to a list or dict.
+            separators (tuple): separators for json.dumps. Compact output always uses (",", ":").
+            ensure_ascii (bool): escape non-ASCII characters.
+        """
+        backend = self.settings.get("json_backend", "json")
+        if self.settings.get("compact"):
+            indent, separators = None, (",", ":")
+            head, separator, tail = "[", ",", "]"
+        else:
+            indent = len(self.settings["indent"])
+            head, separator, tail = "[\n" + " " * indent, ",\n" + " " * indent, "\n]"
+
+        def rows(data):
+            data, output = iter(data), []
+            while True:
+                batch = [item(row) for row in islice(data, 1000)]
+                if not batch:
+                    break
+
+                # Keep the items, removing the brackets around the array.
+                array = json_dumps(batch, backend, indent, separators, ensure_ascii)
+                output.append(array[len(head) : -len(tail)])
+
+            return separator.join(output)
+
+        return Parts(head, rows, separator, tail, "[]")
+
+    def json_columns(self, data):
+        """JSON Array of Columns converter"""
+        self.set_syntax("JSON")
+        return json_dumps(
+            list(zip_longest(*data)),
+            self.settings.get("json_backend", "json"),
+            indent=(
+                None if self.settings.get("compact") else len(self.settings["indent"])
+            ),
+            separators=(",", ":"),
+        )
+
+    def json_rows(self, data):
+        """JSON Array of Rows converter"""
+        return self._join_parts(data, self._json_rows_parts())
+
+    def _json_rows_parts(self):
+        self.set_syntax("JSON")
+        return self._json_array_parts(list, separators=(",", ":"), ensure_ascii=True)
+
+    def json_keyed(self, data):
+        """JSON, first row is key"""
+        self.set_syntax("JSON")
+        try:
+            keydict = {
+                self._escape(row[0]): {k: v for k, v in zip_longest(self.headers, row)}
+                for row in data
+            }
+        except IndexError:
+            raise IndexError(
+                "Problem converting to dictionary. Check that there are no empty rows."
+            )
+
+        return json_dumps(
+            keydict,
+            self.settings.get("json_backend", "json"),
+            indent=(
+                None if self.settings.get("compact") else len(self.settings["indent"])
+            ),
+            separators=(",", ":"),
+        )
+
+    def markdown(self, data):
+        """markdown table format"""
+        return self._spaced_text(data, self._markdown_parts)
+
+    def _markdown_parts(self):
+        self.set_syntax("Text", "Markdown")
+
+        def decorate(lengths):
+            fields = "|".join(" " + ("-" * v) + " " for v in lengths)
+            return "|" + fields + "|"
+
+        return self._spaced_parts("|", decorate, between=True)
+
+    def mysql(self, data):
+        """MySQL converter"""
+        return self._join_parts(data, self._mysql_parts())
+
+    def _mysql_parts(self):
+        fields = [
+            h + " " + _mysql_type(t, p)
+            for h, t, p in zip(self.headers, self.settings["types"], self.profiles())
+        ]
+        create = (
+            "CREATE TABLE IF NOT EXISTS {table} ("
+            "{n}{i}id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,{n}"
+            "{i}{fields}{n}"
+            ");"
+        )
+        return self._sql_parts(create, fields)
+
+    def perl(self, data):
+        """Perl converter"""
+        return self._join_parts(data, self._perl_parts())
+
+    def _perl_parts(self):
+        self.set_syntax("Perl")
+        return self._hash_parts("undef")
+
+    def _hash_parts(self, null):
+        """Parts for a list of hashes, used by Perl and Ruby."""
+        n, i = self.settings["newline"], self.settings["indent"]
+
+        def rows(data):
+            return ("}," + n + i + "{").join(
+                self.type_loop(r, "{q}{field}{q}=>{value}", null=null) for r in data
+            )
+
+        return Parts("[" + n + i + "{", rows, "}," + n + i + "{", "}" + n + "];", None)
+
+    def _php_parts(self, array_open, array_close):
+        """General PHP Converter"""
+        self.set_syntax("PHP")
+        n, i = self.settings["newline"], self.settings["indent"]
+
+        def rows(data):
+            return ("," + n).join(
+                i
+                + array_open
+                + self.type_loop(row, "{q}{field}{q}=>{value}")
+                + array_close
+                for row in data
+            )
+
+        return Parts(array_open + n, rows, "," + n, n + array_close + ";", None)
+
+    def php4(self, data):
+        """Older-style PHP converter"""
+        return self._join_parts(data, self._php4_parts())
+
+    def _php4_parts(self):
+        return self._php_parts("array(", ")")
+
+    def php54(self, data):
+        """PHP 5.4 converter"""
+        return self._join_parts(data, self._php54_parts())
+
+    def _php54_parts(self):
+        return self._php_parts("[", "]")
+
+    def postgres(self, data):
+        """PostgreSQL converter"""
+        return self._join_parts(data, self._postgres_parts())
+
+    def _postgres_parts(self):
+        fields = [
+            h + " " + _postgres_type(t, p)
+            for h, t, p in zip(self.headers, self.settings["types"], self.profiles())
+        ]
+        create = (
+            "CREATE TABLE IF NOT EXISTS {table} ({n}"
+            "{i}id serial,{n}"
+            "{i}{fields}{n}"
+            ");"
+        )
+        return self._sql_parts(create, fields)
+
+    def profile(self, data):
+        """
+        Column profile converter: a text table with statistics for each field, from one pass
+        over the data (see ColumnProfile).
+        """
+        headers = ["field"] + list(ColumnProfile.fields)
+        rows = [
+            [field] + profile.stats()
+            for field, profile in zip_longest(
+                self.headers, profile_columns(data, len(self.headers)), fillvalue=""
+            )
+        ]
+        self.lengths = self._spaced_lengths(rows, headers)
+        return self._join_parts(rows, self._text_table_parts(headers=headers))
+
+    def python_dict(self, data):
+        """Python dict converter"""
+        self.set_syntax("Python")
+
+        fields = [
+            {
+                k: _cast(v, t)
+                for k, v, t in zip_longest(self.headers, row, self.settings["types"])
             }
             for row in data
         ]
         return pformat(fields)
 
-    def python_list(self, data):
-        """Python list of lists converter"""
-        self.set_syntax("Python")
-        fields = [
-            [_cast(r, t) for r, t in zip_longest(row, self.settings["types"])]
-            for row in data
-        ]
-        return "# headers = {}{n}{}".format(
-            self.headers, pformat(fields), n=self.settings["newline"]
+    def python_list(self, data):
+        """Python list of lists converter"""
+        self.set_syntax("Python")
+        fields = [
+            [_cast(r, t) for r, t in zip_longest(row, self.settings["types"])]
+            for row in data
+        ]
+        return "# headers = {}{n}{}".format(
+            self.headers, pformat(fields), n=self.settings["newline"]
+        )
+
+    def ruby(self, data):
+        """Ruby converter"""
+        # comment, comment_end = "#", ""
+        return self._join_parts(data, self._ruby_parts())
+
+    def _ruby_parts(self):
+        self.set_syntax("Ruby")
+        return self._hash_parts("nil")
+
+    def profiles(self):
+        """ColumnProfiles for sizing SQL columns, if the size_columns setting is on. Otherwise Nones."""
+        return self.column_profiles or repeat(None)
+
+    def _sql_parts(self, create, fields):
+        """
+        General SQL converter, used by MySQL, PostgreSQL, SQLite.
+
+        Args:
+            create (str): CREATE TABLE template. Uses {i} and {n} as shorthand for
+                          self.settings['indent'] and self.settings['newline'],
+                          and {table} and {fields} for the table name and column definitions.
+            fields (list): column definitions.
+        """
+        self.set_syntax("SQL")
+        n, i = self.settings["newline"], self.settings["indent"]
+
+        # The template is formatted once. Names are passed as arguments, so braces in them are safe.
+        head = (
+            create + "{n}" + "INSERT INTO {table}{n}{i}({names}){n}VALUES{n}{i}("
+        ).format(
+            table=self.settings["default_variable"],
+            names=", ".join(self.headers),
+            fields=("," + n + i).join(fields),
+            i=i,
+            n=n,
+        )
+
+        def rows(data):
+            return (")," + n + i + "(").join(
+                self.type_loop(row, field_format="{value}", null="NULL") for row in data
+            )
+
+        return Parts(head, rows, ")," + n + i + "(", ");", None)
+
+    def sqlite(self, data):
+        """SQLite converter"""
+        return self._join_parts(data, self._sqlite_parts())
+
+    def _sqlite_parts(self):
+        fields = [
+            h + " " + _sqlite_type(t)
+            for h, t in zip(self.headers, self.settings["types"])
+        ]
+        create = (
+            "CREATE TABLE IF NOT EXISTS {table} ({n}"
+            "{i}id INTEGER PRIMARY KEY ON CONFLICT FAIL AUTOINCREMENT,{n}"
+            "{i}{fields}{n});"
+        )
+        return self._sql_parts(create, fields)
+
+    def wiki(self, data):
+        """Wiki table converter"""
+        n = self.settings["newline"]
+        linebreak = "{0}|-{0}|".format(n)
+        header = '{| class="wikitable"' + n + "!" + ("!!").join(self.headers)
+
+        return (
+            header
+            + linebreak
+            + linebreak.join(self.type_loop(row, "{value}", "||") for row in data)
+            + n
+            + "|}"
+        )
+
+    def xml(self, data):
+        """XML Nodes converter"""
+        return self._join_parts(data, self._xml_parts())
+
+    def _xml_parts(self):
+        self.set_syntax("XML")
+        n, i = self.settings["newline"], self.settings["indent"]
+        elem = i + i + "<{1}>{0}</{1}>"
+
+        def rows(data):
+            return n.join(
+                i
+                + "<row>"
+                + n
+                + n.join(
+                    elem.format(_escape(value or ""), head)
+                    for head, value in zip(self.headers, row)
+                )
+                + n
+                + i
+                + "</row>"
+                for row in data
+            )
+
+        head = '<?xml version="1.0" encoding="UTF-8"?>' + n + "<rows>" + n
+        return Parts(head, rows, n, n + "</rows>", None)
+
+    def xml_properties(self, data):
+        """XML properties converter"""
+        return self._join_parts(data, self._xml_properties_parts())
+
+    def _xml_properties_parts(self):
+        self.set_syntax("XML")
+        n, i = self.settings["newline"], self.settings["indent"]
+
+        def rows(data):
+            return n.join(
+                i
+                + "<row "
+                + " ".join(
+                    '{0}="{1}"'.format(head, _escape_attribute(value or ""))
+                    for head, value in zip(self.headers, row)
+                )
+                + "></row>"
+                for row in data
+            )
+
+        head = '<?xml version="1.0" encoding="UTF-8"?>' + n + "<rows>" + n
+        return Parts(head, rows, n, n + "</rows>", None)
+
+    def xml_illustrator(self, data):
+        """Convert to Illustrator XML format"""
+        self.set_syntax("XML")
+        # Templates use {i} and {n} as shorthand for self.settings['indent'] and self.settings['newline'].
+        # They're substituted before adding any data, so data is never parsed as a format string.
+        fmt = {"i": self.settings["indent"], "n": self.settings["newline"]}
+
+        output = [
+            (
+                '<?xml version="1.0" encoding="utf-8"?>{n}'
+                '<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 20001102//EN"    '
+                '"http://www.w3.org/TR/2000/CR-SVG-20001102/DTD/svg-20001102.dtd" [{n}'
+                '{i}<!ENTITY ns_graphs "http://ns.adobe.com/Graphs/1.0/">{n}'
+                '{i}<!ENTITY ns_vars "http://ns.adobe.com/Variables/1.0/">{n}'
+                '{i}<!ENTITY ns_imrep "http://ns.adobe.com/ImageReplacement/1.0/">{n}'
+                '{i}<!ENTITY ns_custom "http://ns.adobe.com/GenericCustomNamespace/1.0/">{n}'
+                '{i}<!ENTITY ns_flows "http://ns.adobe.com/Flows/1.0/">{n}'
+                '{i}<!ENTITY ns_extend "http://ns.adobe.com/Extensibility/1.0/">{n}'
+                "]>{n}"
+                "<svg>{n}"
+                '<variableSets  xmlns="&ns_vars;">{n}'
+                '{i}<variableSet  varSetName="binding1" locked="none">{n}'
+                "{i}{i}<variables>{n}"
+            ).format(**fmt)
+        ]
+
+        variable = (
+            ("{i}" * 3)
+            + '<variable varName="{{name}}" trait="textcontent" category="&ns_flows;"></variable>'
+            + "{n}"
+        ).format(**fmt)
+
+        for header in self.headers:
+            output.append(variable.format(name=_escape_attribute(header)))
+
+        output.append(
+            (
+                "{i}{i}</variables>{n}"
+                "{i}{i}"
+                "<v:sampleDataSets  "
+                'xmlns:v="http://ns.adobe.com/Variables/1.0/" '
+                'xmlns="http://ns.adobe.com/GenericCustomNamespace/1.0/">{n}'
+            ).format(**fmt)
+        )
+
+        field = (
+            ("{i}" * 4)
+            + "<{{field}}>{n}"
+            + ("{i}" * 5)
+            + "<p>{{value}}</p>{n}"
+            + ("{i}" * 4)
+            + "</{{field}}>"
+        ).format(**fmt)
+
+        dataset = (
+            ("{i}" * 3)
+            + '<v:sampleDataSet dataSetName="{{name}}">{n}'
+            + "{{fields}}{n}"
+            + ("{i}" * 3)
+            + "</v:sampleDataSet>{n}"
+        ).format(**fmt)
+
+        for row in data:
+            output.append(
+                dataset.format(
+                    name=_escape_attribute(row[0]),
+                    fields=fmt["n"].join(
+                        field.format(field=f, value=_escape(v))
+                        for f, v in zip(self.headers, row)
+                    ),
+                )
+            )
+
+        output.append(
+            (
+                "{i}{i}</v:sampleDataSets>{n}"
+                "{i}</variableSet>{n}"
+                "</variableSets>{n}"
+                "</svg>{n}"
+            ).format(**fmt)
+        )
+
+        return "".join(output)
+
+    def xlsx(self, data):
+        """Excel workbook converter. Returns bytes; write it to a file."""
+        return b"".join(self._xlsx_pieces(data))
+
+    def _xlsx_pieces(self, data, size=5000):
+        """
+        Generate an xlsx workbook in pieces, with the rows written to the sheet as they're read.
+        Columns typed int or float are numeric cells. Strings are inline, unless the
+        xlsx_shared_strings setting is on, which makes smaller files but keeps every
+        distinct string in memory.
+        """
+        self.set_syntax("Text", "Plain Text")
+        types = self.settings.get("types") or []
+        shared = {} if self.settings.get("xlsx_shared_strings") else None
+        header = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+        def text(value):
+            if not value:
+                return "<c/>"
+            value = (
+                value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            )
+            if shared is None:
+                return (
+                    '<c t="inlineStr"><is><t xml:space="preserve">'
+                    + value
+                    + "</t></is></c>"
+                )
+            return (
+                '<c t="s"><v>' + str(shared.setdefault(value, len(shared))) + "</v></c>"
+            )
+
+        def number(value):
+            try:
+                number = float(value)
+            except ValueError:
+                return text(value)
+            # Excel keeps 15 digits, so longer numbers stay text, as they were.
+            if (
+                not math.isfinite(number)
+                or abs(number) >= 1e15
+                or "_" in value
+                or not value.isascii()
+            ):
+                return text(value)
+            return "<c><v>" + value.strip() + "</v></c>"
+
+        def numbers(column):
+            # Most numeric columns are all plain numbers, which are written as they are.
+            if all(map(_xsd_number.fullmatch, column)) and (
+                max(map(abs, map(float, column))) < 1e15
+            ):
+                return ["<c><v>" + value + "</v></c>" for value in column]
+            return list(map(number, column))
+
+        def texts(column):
+            # Characters XML doesn't allow are dropped.
+            if _xml_illegal.search("".join(column)):
+                column = [_xml_illegal.sub("", value) for value in column]
+            return list(map(text, column))
+
+        cells = [numbers if t in (int, float) else texts for t in types]
+
+        sink = _Sink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as book:
+
+            def info(name):
+                # A fixed date, so the same data always makes the same file.
+                info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+                info.compress_type = zipfile.ZIP_DEFLATED
+                return info
+
+            with book.open(
+                info("xl/worksheets/sheet1.xml"), "w", force_zip64=True
+            ) as sheet:
+                sheet.write(
+                    (
+                        header
+                        + '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                        + "<sheetData>"
+                    ).encode("utf-8")
+                )
+                r = 0
+                if self.settings.get("has_header"):
+                    r = 1
+                    sheet.write(
+                        (
+                            '<row r="1">'
+                            + "".join(
+                                cell.replace("<c ", '<c s="1" ')
+                                for cell in texts(self.headers)
+                            )
+                            + "</row>"
+                        ).encode("utf-8")
+                    )
+
+                data = iter(data)
+                for batch in iter(lambda: list(islice(data, size)), []):
+                    # Convert by column, which is quicker than by cell.
+                    columns = [
+                        (cells[i] if i < len(cells) else texts)(column)
+                        for i, column in enumerate(zip_longest(*batch, fillvalue=""))
+                    ]
+                    rows = zip(*columns) if columns else repeat((), len(batch))
+                    xml = [
+                        '<row r="' + str(n) + '">' + "".join(row) + "</row>"
+                        for n, row in enumerate(rows, r + 1)
+                    ]
+                    r += len(batch)
+
+                    sheet.write("".join(xml).encode("utf-8"))
+                    yield sink.take()
+
+                sheet.write(b"</sheetData></worksheet>")
+
+            strings = ""
+            if shared:
+                book.writestr(
+                    info("xl/sharedStrings.xml"),
+                    (
+                        header
+                        + '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                        + 'uniqueCount="{}">'.format(len(shared))
+                        + "".join(
+                            '<si><t xml:space="preserve">' + v + "</t></si>"
+                            for v in shared
+                        )
+                        + "</sst>"
+                    ).encode("utf-8"),
+                )
+                strings = {
+                    "[Content_Types].xml": '<Override PartName="/xl/sharedStrings.xml" '
+                    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>',
+                    "xl/_rels/workbook.xml.rels": '<Relationship Id="rId3" Target="sharedStrings.xml" '
+                    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>',
+                }
+
+            # Sheet names are at most 31 characters, without []:*?/\
+            sheet_name = re.sub(r"[][:*?/\\]", "", self.settings["default_variable"])
+            sheet_name = _escape_attribute(
+                _xml_illegal.sub("", sheet_name)[:31] or "Sheet1"
+            )
+            for name, xml in XLSX_PARTS.items():
+                xml = xml.replace("{shared}", strings and strings.get(name, ""))
+                xml = xml.replace("{sheet}", sheet_name)
+                book.writestr(info(name), (header + xml).encode("utf-8"))
+
+        yield sink.take()
+
+    def text_table(self, data):
+        """text table converter"""
+        return self._spaced_text(data, self._text_table_parts)
+
+    def _text_table_parts(self, **kwargs):
+        self.set_syntax("Text", "Plain Text")
+
+        def decorate(lengths):
+            return "+" + "+".join("-" * (v + 2) for v in lengths) + "+"
+
+        return self._spaced_parts(
+            "|", decorate, top=True, between=True, bottom=True, **kwargs
+        )
+
+    def yaml(self, data):
+        """YAML Converter"""
+        return self._join_parts(data, self._yaml_parts())
+
+    def _yaml_parts(self):
+        self.set_syntax("YAML")
+        n, i = self.settings["newline"], self.settings["indent"]
+        linebreak = n + "-" + n + i
+
+        def rows(data):
+            return linebreak.join(
+                self.type_loop(r, "{field}: {value}", n + i) for r in data
+            )
+
+        return Parts("---" + linebreak, rows, linebreak, n, None)
+
+
+def view_indent(view_settings):
+    """Indentation string, from a view's (or Preferences') tab settings."""
+    if view_settings.get("translate_tabs_to_spaces"):
+        return " " * int(view_settings.get("tab_size", 4))
+    return "\t"
+
+
+def find_files(paths, pattern="*.csv"):
+    """
+    Expand a list of paths into a sorted list of files.
+
+    Args:
+        paths (list): files, folders or glob patterns. Folders are searched recursively.
+        pattern (str): glob pattern for files found in folders. Compressed files
+            match if their name without the compression extension does, e.g. data.csv.gz for *.csv.
+    """
+    found = set()
+    for path in paths:
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.update(
+                    os.path.join(root, f)
+                    for f in files
+                    if fnmatch.fnmatch(split_compression(f)[0], pattern)
+                    or fnmatch.fnmatch(f, pattern)
+                )
+        elif os.path.isfile(path):
+            found.add(path)
+        else:
+            found.update(
+                p for p in glob.glob(path, recursive=True) if os.path.isfile(p)
+            )
+
+    return sorted(found)
+
+
+def output_path(
+    source, fmt, output_dir=None, output_delimiter=None, formats=None, compress=None
+):
+    """
+    Path for the converted version of source. Written next to source unless output_dir is given.
+    formats is the "formats" setting, for the extensions of formats defined there.
+    compress is a compression extension to add, e.g. "gz". A compressed source's extension is dropped.
+    """
+    extension = EXTENSIONS.get(fmt, "txt")
+    if formats and fmt in formats:
+        extension = formats[fmt].get("extension", "txt")
+    if fmt == "dsv" and output_delimiter == "\t":
+        extension = "tsv"
+
+    if compress:
+        extension += "." + compress.lstrip(".")
+
+    base = os.path.splitext(split_compression(os.path.basename(source))[0])[0]
+    dest = os.path.join(output_dir or os.path.dirname(source), base + "." + extension)
+
+    # Don't overwrite the source (e.g. csv to csv), or its uncompressed copy (csv.gz to csv)
+    if os.path.abspath(dest) in (
+        os.path.abspath(source),
+        os.path.abspath(split_compression(source)[0]),
+    ):
+        dest = os.path.join(
+            output_dir or os.path.dirname(source), base + "." + fmt + "." + extension
         )
 
-    def ruby(self, data):
-        """Ruby converter"""
-        self.set_syntax("Ruby")
-        # comment, comment_end = "#", ""
-        output = "}},{n}{i}{{".join(
-            self.type_loop(row, "{q}{field}{q}=>{value}", null="nil") for row in data
+    return dest
+
+
+class OutputRecord(object):
+    """
+    The size and modification time of the source of each file converted by convert_files, saved as JSON.
+
+    An output is up to date while its source has the size and time recorded when it was converted.
+    Comparing times alone misses a source replaced by another file with an older time
+    (e.g. copied with cp -p, or extracted from an archive). Only the max_entries most
+    recently converted outputs are kept.
+    """
+
+    max_entries = 10000
+
+    def __init__(self, path):
+        self.path = path
+        self.outputs = self.load()
+
+        # Outputs converted since loading.
+        self.changed = {}
+
+    def load(self):
+        try:
+            with io.open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("outputs", {})
+
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    @staticmethod
+    def entry(source, stat):
+        return [os.path.abspath(source), stat.st_size, stat.st_mtime]
+
+    def up_to_date(self, source, dest):
+        """True if dest exists, isn't empty, and was converted from source as it is now."""
+        try:
+            src, dst = os.stat(source), os.stat(dest)
+        except OSError:
+            return False
+
+        recorded = self.outputs.get(os.path.abspath(dest))
+        return dst.st_size > 0 and recorded == self.entry(source, src)
+
+    def add(self, source, dest, stat):
+        """Record that dest was converted from source, when it had stat (an os.stat_result)."""
+        dest = os.path.abspath(dest)
+        self.outputs.pop(dest, None)
+        self.outputs[dest] = self.changed[dest] = self.entry(source, stat)
+
+    def save(self):
+        """Write the outputs converted since loading, keeping entries saved by others meanwhile."""
+        folder = os.path.dirname(self.path)
+        os.makedirs(folder, exist_ok=True)
+
+        with FileLock(self.path + ".lock"):
+            outputs = self.load()
+            for dest, entry in self.changed.items():
+                outputs.pop(dest, None)
+                outputs[dest] = entry
+
+            # Entries are kept in the order they were converted.
+            self.outputs = dict(list(outputs.items())[-self.max_entries :])
+            self.changed = {}
+
+            fd, partial = tempfile.mkstemp(dir=folder, suffix=".part")
+            with io.open(fd, "w", encoding="utf-8") as f:
+                json.dump({"outputs": self.outputs}, f, indent=2)
+
+            os.replace(partial, self.path)
+
+
+def open_source(path):
+    """
+    Open a file for converting: a CompressedCSV if it's compressed,
+    a MappedCSV if possible, otherwise the file's text.
+    """
+    ext = compression(path, read=True)
+    if ext:
+        return CompressedCSV(path, ext)
+
+    try:
+        return MappedCSV(path)
+
+    except ValueError:
+        # Empty, or an encoding that can't be split into lines bytewise.
+        with open(path, "rb") as f:
+            encoding, _ = detect_encoding(f.read(MappedCSV.prefix_size))
+
+        if encoding == "utf-8":
+            encoding = "utf-8-sig"
+
+        with io.open(path, encoding=encoding, errors=DECODE_ERRORS, newline="") as f:
+            return f.read()
+
+
+def source_size(selection):
+    """The size of a str (in characters), or a MappedCSV or CompressedCSV (in bytes)."""
+    if isinstance(selection, (MappedCSV, CompressedCSV)):
+        return selection.size
+    return len(selection)
+
+
+def source_sample(selection, size=2048):
+    """The first size characters of a str, MappedCSV or CompressedCSV."""
+    if isinstance(selection, (MappedCSV, CompressedCSV)):
+        return selection.sample(size)
+    return selection[:size]
+
+
+def write_pieces(dest, pieces, binary=False, threaded=False):
+    """
+    Write converted pieces (str, or bytes if binary) to dest as they're made.
+    Writes to a temporary file first, so an interrupted conversion never looks up to date.
+    The temporary file is removed if converting fails.
+    If dest has a compression extension (e.g. .gz), the output is compressed as it's written,
+    in another thread if threaded, so compressing overlaps converting.
+    """
+    partial = dest + ".part"
+    ext = compression(dest)
+    if ext:
+        f = open_compressed(partial, "wb", ext)
+    else:
+        f = io.open(partial, "wb", buffering=1 << 20)
+
+    if not binary:
+        pieces = (piece.encode("utf-8") for piece in pieces)
+
+    try:
+        with f:
+            if threaded and ext:
+                write_threaded(f, pieces)
+            else:
+                for piece in pieces:
+                    f.write(piece)
+
+    except BaseException:
+        os.remove(partial)
+        raise
+
+    os.replace(partial, dest)
+
+
+def write_threaded(f, pieces, depth=4):
+    """
+    Write pieces to f in another thread, while the next pieces are made.
+    At most depth pieces wait to be written. The compressors release the GIL while they work.
+    """
+    queue, errors = Queue(depth), []
+
+    def writer():
+        # Keep taking pieces after an error, so the other thread never waits on a full queue.
+        for piece in iter(queue.get, None):
+            if not errors:
+                try:
+                    f.write(piece)
+                except Exception as e:
+                    errors.append(e)
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+
+    try:
+        for piece in pieces:
+            if errors:
+                break
+            queue.put(piece)
+    finally:
+        queue.put(None)
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def convert_file(source, dest, kwargs, user_settings, indent, executor=None):
+    """
+    Convert one file on disk. Runs in a worker, so everything passed must be picklable.
+    If executor is given, large files are converted in parallel chunks (see DataConverter.chunkable).
+
+    Returns:
+        int: the size of source, in bytes.
+    """
+    converter = DataConverter()
+    converter.executor = executor
+    selection = open_source(source)
+
+    try:
+        converter.settings = converter.build_settings(
+            kwargs, user_settings, detect_newline(source_sample(selection)), indent
         )
-        return ("[{n}{i}{{" + output + "}}{n}];").format(
-            n=self.settings["newline"], i=self.settings["indent"]
+        converter.converter = converter.get_converter(kwargs["format"])
+        if converter.settings["schema_cache"]:
+            converter.schemas = SchemaCache(converter.settings["schema_cache"])
+            converter.source_path = os.path.abspath(source)
+
+        write_pieces(
+            dest,
+            converter.convert_pieces(selection),
+            kwargs["format"] in DataConverter.binary_formats,
+            converter.settings["threaded_compression"],
         )
 
-    def _sql(self, data, create):
-        """General SQL converter, used by MySQL, PostgreSQL, SQLite."""
-        # Uses {i} and {n} as shorthand for self.settings['indent'] and self.settings['newline'].
-        self.set_syntax("SQL")
-        fmt = (
-            create + "{n}" + "INSERT INTO {table}{n}{i}({names}){n}VALUES{n}"
-            "{i}("
-            + "),{n}{i}(".join(
-                self.type_loop(row, field_format="{value}", null="NULL") for row in data
+    finally:
+        if isinstance(selection, (MappedCSV, CompressedCSV)):
+            selection.close()
+
+    return os.path.getsize(source)
+
+
+def convert_files(
+    sources,
+    kwargs,
+    user_settings,
+    indent,
+    output_dir=None,
+    force=False,
+    workers=None,
+    executor=ProcessPoolExecutor,
+    progress=None,
+    record=None,
+):
+    """
+    Convert many files in a pool of workers.
+
+    Args:
+        sources (list): paths of the files to convert.
+        kwargs (dict): command arguments, including "format".
+        user_settings (dict): DataConverter settings.
+        indent (str): indentation for the output.
+        output_dir (str): folder for the output. By default, output is written next to each source.
+        force (bool): convert files even if the output is up to date.
+        workers (int): size of the pool. Defaults to the number of CPUs.
+        executor (type): concurrent.futures executor class.
+        progress (function): called with a status message after each file.
+        record (str): path of the OutputRecord. Defaults to outputs.json in DataConverter's cache folder.
+
+    Returns:
+        dict with counts of converted, skipped and failed files, bytes read and elapsed seconds.
+    """
+    stats = {"converted": 0, "skipped": 0, "failed": 0, "bytes": 0, "seconds": 0.0}
+    start = time.time()
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    outputs = [
+        (
+            source,
+            output_path(
+                source,
+                kwargs["format"],
+                output_dir,
+                kwargs.get("output_delimiter"),
+                user_settings.get("formats"),
+                kwargs.get("compress", user_settings.get("compress")),
+            ),
+        )
+        for source in sources
+    ]
+
+    # Don't convert the output of earlier runs (e.g. data.dsv.csv, from data.csv).
+    produced = {os.path.abspath(dest) for _, dest in outputs}
+
+    record = OutputRecord(record or os.path.join(cache_folder(), "outputs.json"))
+
+    jobs, dests = [], {}
+    for source, dest in outputs:
+        if os.path.abspath(source) in produced:
+            print(
+                "DataConverter: not converting {}, the output of another file".format(
+                    source
+                )
+            )
+            stats["skipped"] += 1
+            continue
+
+        if dest in dests:
+            # e.g. data.csv and data.csv.gz
+            print(
+                "DataConverter: not converting {} to {}, the output of {}".format(
+                    source, dest, dests[dest]
+                )
             )
-            + ");"
+            stats["skipped"] += 1
+        elif not force and record.up_to_date(source, dest):
+            stats["skipped"] += 1
+        else:
+            try:
+                # The source as it was before converting, so a change meanwhile isn't missed.
+                jobs.append((source, dest, os.stat(source)))
+            except OSError as e:
+                print("DataConverter: error converting", source, e)
+                stats["failed"] += 1
+
+        dests.setdefault(dest, source)
+
+    # A single file is converted in parallel chunks instead, when its format allows.
+    chunk_executor = None
+    if len(jobs) == 1 and executor is ProcessPoolExecutor:
+        executor, chunk_executor = ThreadPoolExecutor, ProcessPoolExecutor
+
+    with executor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                convert_file,
+                source,
+                dest,
+                kwargs,
+                user_settings,
+                indent,
+                chunk_executor,
+            ): (source, dest, stat)
+            for source, dest, stat in jobs
+        }
+        for future, (source, dest, stat) in futures.items():
+            try:
+                stats["bytes"] += future.result()
+                stats["converted"] += 1
+                record.add(source, dest, stat)
+            except Exception as e:
+                print("DataConverter: error converting", source, e)
+                stats["failed"] += 1
+
+            if progress:
+                done = stats["converted"] + stats["failed"]
+                progress(
+                    "DataConverter: converted {} of {} files".format(done, len(jobs))
+                )
+
+    if record.changed:
+        try:
+            record.save()
+        except OSError as e:
+            print("DataConverter: error saving", record.path, e)
+
+    stats["seconds"] = time.time() - start
+    megabytes = stats["bytes"] / 1048576.0
+    print(
+        "DataConverter: converted {converted} files, skipped {skipped}, "
+        "{failed} failed. ".format(**stats)
+        + "{:.1f} MB in {:.2f}s ({:.1f} MB/s)".format(
+            megabytes, stats["seconds"], megabytes / max(stats["seconds"], 1e-6)
         )
-        return fmt.format(
-            create=create,
-            table=self.settings["default_variable"],
-            names=", ".join(self.headers),
-            i=self.settings["indent"],
-            n=self.settings["newline"],
+    )
+    return stats
+
+
+# Sublime Text's names for the encodings detect_encoding finds.
+VIEW_ENCODINGS = {
+    "UTF-8": "utf-8",
+    "UTF-8 with BOM": "utf-8",
+    "Western (Windows 1252)": "cp1252",
+    "Western (ISO 8859-1)": "latin-1",
+}
+
+
+class DataConverterCommand(DataConverter, TextCommand):
+    # Characters to add to a new view at a time. Each append is a separate edit.
+    append_size = 1 << 20
+
+    # Recent conversions and parsed rows, shared by all views.
+    cache = ResultCache()
+
+    def run(self, edit, **kwargs):
+        if "format" not in kwargs:
+            print("DataConverter: no format given")
+            return
+
+        try:
+            self.settings = self.get_settings(kwargs)
+
+        except TypeError as e:
+            print("DataConverter: TypeError fetching settings", e)
+            return
+
+        # Results are cached by format and settings, before converting changes them.
+        settings_key = repr((kwargs["format"], sorted(self.settings.items())))
+        self.cache.resize(int(self.settings["result_cache"] * 1048576))
+
+        try:
+            # The format key in .sublime-commands must match the name of the function we want to call,
+            # or a format in the "formats" setting.
+            self.converter = self.get_converter(kwargs["format"])
+
+        except AttributeError:
+            print("DataConverter: unknown format", kwargs["format"])
+            return
+
+        self.schemas = None
+        if self.settings["schema_cache"]:
+            self.schemas = SchemaCache(self.settings["schema_cache"])
+
+        # If nothing is selected, select all.
+        deselect_flag = False
+        if self.view.sel()[0].empty():
+            self.view.sel().add(sublime.Region(0, self.view.size()))
+            deselect_flag = True
+
+        # Binary formats can't go in a view.
+        if kwargs["format"] in self.binary_formats:
+            self.settings["output"] = "file"
+
+        self.preflight(kwargs["format"])
+
+        if self.settings["output"] in ("new_view", "file"):
+            self.send_output(kwargs["format"])
+            if deselect_flag:
+                self.deselect()
+            return
+
+        for sel in self.view.sel():
+            selection = self.source(sel)
+            self.source_path = self.source_file(sel)
+            try:
+                converted = self.convert_cached(selection, settings_key)
+            finally:
+                if isinstance(selection, MappedCSV):
+                    selection.close()
+
+            self.view.replace(edit, sel, converted)
+            deselect_flag = False
+
+        if self.syntax is not None:
+            self.apply_syntax(self.view, self.syntax)
+
+        if deselect_flag or self.settings.get("deselect_after"):
+            self.deselect()
+
+    def convert_cached(self, selection, settings_key):
+        """
+        Convert the selection, or if the same text (or unchanged file) was converted
+        with the same settings recently, reuse the result. See ResultCache.
+        """
+        self.content_key = None
+        if not self.settings["result_cache"]:
+            return self.convert(selection)
+
+        self.content_key = source_key(selection)
+        key = ("result", self.content_key, self.source_path, settings_key)
+        cached = self.cache.get(key)
+        if cached is not None:
+            converted, self.syntax = cached
+            return converted
+
+        converted = self.convert(selection)
+        self.cache.put(key, (converted, self.syntax), sys.getsizeof(converted))
+        return converted
+
+    def get_settings(self, kwargs):
+        """Get settings from kwargs, user settings and the view."""
+        return self.build_settings(
+            kwargs,
+            sublime.load_settings("DataConverter.sublime-settings"),
+            LINEENDINGS.get(self.view.line_endings(), os.linesep),
+            view_indent(self.view.settings()),
         )
 
-    def sqlite(self, data):
-        """SQLite converter"""
-        fields = ",{n}{i}".join(
-            h + " " + _sqlite_type(t)
-            for h, t in zip(self.headers, self.settings["types"])
+    def preflight(self, fmt):
+        """
+        Estimate the cost of converting the selections, and show it in the status bar.
+        When output is "auto", choose where the output goes from the estimate.
+        """
+        size = sum(sel.size() for sel in self.view.sel())
+
+        # Sample whole lines from the start and the middle of the first selection.
+        region = self.view.sel()[0]
+        start, middle = region.begin(), region.begin() + region.size() // 2
+        sample = self.view.substr(
+            sublime.Region(start, min(start + 2048, region.end()))
         )
-        create = (
-            "CREATE TABLE IF NOT EXISTS {table} ({n}"
-            "{i}id INTEGER PRIMARY KEY ON CONFLICT FAIL AUTOINCREMENT,{n}"
-            "{i}" + fields + "{n});"
+
+        if len(sample) < region.size():
+            sample = sample[: sample.rfind("\n") + 1] or sample
+            text = self.view.substr(
+                sublime.Region(middle, min(middle + 2048, region.end()))
+            )
+            sample += text[text.find("\n") + 1 : text.rfind("\n") + 1]
+
+        cost = estimate(fmt, size, sample)
+
+        if self.settings["output"] == "auto":
+            self.settings["output"] = choose_output(
+                cost, self.settings["output_thresholds"]
+            )
+
+        sublime.status_message(
+            "DataConverter: about {:,} rows, {:.1f} MB of {} in {:.1f}s, {}".format(
+                cost.rows,
+                cost.output / 1e6,
+                fmt,
+                cost.seconds,
+                {
+                    "new_view": "sending to a new view",
+                    "file": "writing to a file",
+                }.get(self.settings["output"], "replacing the selection"),
+            )
         )
+        return cost
 
-        return self._sql(data, create)
+    def send_output(self, fmt):
+        """
+        Convert the selections to a new view or a file, without replacing them.
+        The conversion runs off the UI thread, and the output is written in pieces as it's made.
+        """
+        sources = [(self.source(sel), self.source_file(sel)) for sel in self.view.sel()]
+
+        # A separate converter, so running the command again doesn't disturb this one.
+        converter = DataConverter()
+        converter.settings = self.settings
+        converter.converter = converter.get_converter(fmt)
+        converter.schemas = self.schemas
+
+        path = self.output_file(fmt) if self.settings["output"] == "file" else None
+        if path is None and fmt in self.binary_formats:
+            for selection, _ in sources:
+                if isinstance(selection, MappedCSV):
+                    selection.close()
+            sublime.status_message(
+                "DataConverter: {} can only be written to a file. Save this file, or set output_file.".format(
+                    fmt
+                )
+            )
+            return
 
-    def wiki(self, data):
-        """Wiki table converter"""
-        n = self.settings["newline"]
-        linebreak = "{0}|-{0}|".format(n)
-        header = '{| class="wikitable"' + n + "!" + ("!!").join(self.headers)
+        if path:
+            sublime.set_timeout_async(
+                lambda: self.write_file(path, converter, sources), 0
+            )
+            return
 
-        return (
-            header
-            + linebreak
-            + linebreak.join(self.type_loop(row, "{value}", "||") for row in data)
-            + n
-            + "|}"
+        view = self.view.window().new_file()
+        view.set_scratch(True)
+        view.set_name(
+            "{} ({})".format(
+                os.path.basename(self.view.file_name() or "") or "untitled", fmt
+            )
         )
+        sublime.set_timeout_async(lambda: self.write_view(view, converter, sources), 0)
 
-    def xml(self, data):
-        """XML Nodes converter"""
-        self.set_syntax("XML")
-        elem = "{{i}}{{i}}<{1}>{0}</{1}>"
-        rows = "{n}".join(
-            "{i}<row>{n}"
-            + "{n}".join(
-                elem.format(_escape(value or ""), head)
-                for head, value in zip(self.headers, row)
-            )
-            + "{n}{i}</row>"
-            for row in data
+    def output_file(self, fmt):
+        """
+        Path to write to when output is "file". A relative output_file is relative to the view's file.
+        Without output_file, writes next to the view's file (see output_path).
+        """
+        path = self.settings.get("output_file")
+        source = self.view.file_name()
+
+        if path:
+            path = os.path.expanduser(path)
+            if source and not os.path.isabs(path):
+                path = os.path.join(os.path.dirname(source), path)
+            if os.path.isabs(path):
+                return path
+
+        elif source:
+            return output_path(
+                source,
+                fmt,
+                None,
+                self.settings["output_delimiter"],
+                self.settings["formats"],
+                self.settings["compress"],
+            )
+
+        print("DataConverter: no path to write to, sending output to a new view")
+        return None
+
+    def pieces(self, converter, sources):
+        """Converted pieces of each source, with a newline between sources."""
+        for i, (selection, path) in enumerate(sources):
+            if i:
+                yield converter.settings["newline"]
+
+            converter.source_path = path
+            try:
+                yield from converter.convert_pieces(selection)
+            finally:
+                if isinstance(selection, MappedCSV):
+                    selection.close()
+
+    def write_file(self, path, converter, sources):
+        """Write the output to path as it's made."""
+        binary = converter.converter.__name__ in self.binary_formats
+        if binary and len(sources) > 1:
+            # Binary files can't be joined, so only the first selection is converted.
+            for selection, _ in sources[1:]:
+                if isinstance(selection, MappedCSV):
+                    selection.close()
+            sources = sources[:1]
+
+        write_pieces(
+            path,
+            self.pieces(converter, sources),
+            binary,
+            converter.settings["threaded_compression"],
         )
-        output = (
-            '<?xml version="1.0" encoding="UTF-8"?>{n}<rows>{n}' + rows + "{n}</rows>"
+        sublime.status_message("DataConverter: wrote " + path)
+
+    def write_view(self, view, converter, sources):
+        """
+        Append the output to view in blocks of append_size characters, setting the syntax
+        once it's known. Large pieces are split, so no edit is bigger than a block.
+        """
+        block, size, syntax = [], 0, None
+
+        for piece in self.pieces(converter, sources):
+            block.append(piece)
+            size += len(piece)
+
+            if syntax is None and converter.syntax is not None:
+                syntax = converter.syntax
+                self.apply_syntax(view, syntax)
+
+            if size >= self.append_size:
+                text = "".join(block)
+                end = size - size % self.append_size
+                for start in range(0, end, self.append_size):
+                    self.append(view, text[start : start + self.append_size])
+                block, size = [text[end:]], size - end
+
+        self.append(view, "".join(block))
+        sublime.status_message(
+            "DataConverter: converted {} characters".format(view.size())
         )
-        return output.format(i=self.settings["indent"], n=self.settings["newline"])
 
-    def xml_properties(self, data):
-        """XML properties converter"""
-        self.set_syntax("XML")
-        rows = "{n}".join(
-            "{i}<row "
-            + " ".join(
-                '{0}="{1}"'.format(head, value or "")
-                for head, value in zip(self.headers, row)
+    def append(self, view, text):
+        """Add text to the end of view, even if it's read-only."""
+        if text:
+            view.run_command(
+                "append", {"characters": text, "force": True, "scroll_to_end": False}
             )
-            + "></row>"
-            for row in data
+
+    def source(self, region):
+        """
+        The text to convert. When the region is an entire unmodified file,
+        read it from disk with mmap instead of copying the view's contents,
+        as long as the file's encoding is the one the view was opened with.
+        """
+        path = self.view.file_name()
+        if (
+            path
+            and region.size() == self.view.size()
+            and not self.view.is_dirty()
+            and os.path.isfile(path)
+        ):
+            try:
+                selection = MappedCSV(path)
+            except (OSError, ValueError):
+                pass
+            else:
+                if selection.encoding == VIEW_ENCODINGS.get(self.view.encoding()):
+                    return selection
+                selection.close()
+
+        return self.view.substr(region)
+
+    def source_file(self, region):
+        """
+        The view's file, if the region is all of it and it's unmodified.
+        Used for looking it up in the schema cache.
+        """
+        if region.size() == self.view.size() and not self.view.is_dirty():
+            return self.view.file_name()
+        return None
+
+    def deselect(self):
+        """Remove selection and place pointer at top of document (adapted from https://gist.github.com/1608283)."""
+        top = self.view.sel()[0].a
+        self.view.sel().clear()
+        self.view.sel().add(sublime.Region(top, top))
+
+    def apply_syntax(self, view, syntax):
+        """Set the view's syntax to one noted by a converter, a (path, file_name) pair."""
+        path, file_name = syntax
+
+        new_syntax = sublime_format_path(
+            "/".join(("Packages", path, file_name + ".sublime-syntax"))
         )
-        output = (
-            '<?xml version="1.0" encoding="UTF-8"?>{n}<rows>{n}' + rows + "{n}</rows>"
+        current_syntax = view.settings().get("syntax")
+
+        if new_syntax != current_syntax:
+            try:
+                sublime.load_resource(new_syntax)
+                view.assign_syntax(new_syntax)
+            except OSError as err:
+                print("DataConverter: Unable to set syntax ({}).".format(err))
+                new_syntax = new_syntax.replace(".sublime-syntax", ".tmLanguage")
+                try:
+                    sublime.load_resource(new_syntax)
+                    view.assign_syntax(new_syntax)
+                except OSError as err:
+                    print("DataConverter: Unable to set syntax ({}).".format(err))
+                    print("view.syntax().path: {}".format(view.syntax().path))
+
+
+class DataConverterFilesCommand(WindowCommand):
+    """Convert files on disk without opening them."""
+
+    def run(
+        self,
+        format,
+        paths=None,
+        pattern="*.csv",
+        output_dir=None,
+        force=False,
+        **kwargs
+    ):
+        kwargs["format"] = format
+        formats = sublime.load_settings("DataConverter.sublime-settings").get("formats")
+
+        if format not in EXTENSIONS and format not in (formats or {}):
+            print("DataConverter: unknown format", format)
+            return
+
+        if paths:
+            self.start(paths, pattern, output_dir, force, kwargs)
+            return
+
+        folders = self.window.folders()
+        self.window.show_input_panel(
+            "Convert files (file, folder or glob):",
+            folders[0] if folders else "",
+            lambda path: self.start([path], pattern, output_dir, force, kwargs),
+            None,
+            None,
         )
-        return output.format(i=self.settings["indent"], n=self.settings["newline"])
 
-    def xml_illustrator(self, data):
-        """Convert to Illustrator XML format"""
-        self.set_syntax("XML")
+    def start(self, paths, pattern, output_dir, force, kwargs):
+        sources = find_files(paths, pattern)
+        if not sources:
+            sublime.status_message("DataConverter: no files found")
+            return
 
-        output = (
-            '<?xml version="1.0" encoding="utf-8"?>{n}'
-            '<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 20001102//EN"    '
-            '"http://www.w3.org/TR/2000/CR-SVG-20001102/DTD/svg-20001102.dtd" [{n}'
-            '{i}<!ENTITY ns_graphs "http://ns.adobe.com/Graphs/1.0/">{n}'
-            '{i}<!ENTITY ns_vars "http://ns.adobe.com/Variables/1.0/">{n}'
-            '{i}<!ENTITY ns_imrep "http://ns.adobe.com/ImageReplacement/1.0/">{n}'
-            '{i}<!ENTITY ns_custom "http://ns.adobe.com/GenericCustomNamespace/1.0/">{n}'
-            '{i}<!ENTITY ns_flows "http://ns.adobe.com/Flows/1.0/">{n}'
-            '{i}<!ENTITY ns_extend "http://ns.adobe.com/Extensibility/1.0/">{n}'
-            "]>{n}"
-            "<svg>{n}"
-            '<variableSets  xmlns="&ns_vars;">{n}'
-            '{i}<variableSet  varSetName="binding1" locked="none">{n}'
-            "{i}{i}<variables>{n}"
+        user_settings = sublime.load_settings("DataConverter.sublime-settings")
+        view = self.window.active_view()
+        indent = view_indent(
+            view.settings()
+            if view
+            else sublime.load_settings("Preferences.sublime-settings")
         )
 
-        for header in self.headers:
-            output += (
-                ("{i}" * 3)
-                + '<variable varName="'
-                + header
-                + '" trait="textcontent" category="&ns_flows;"></variable>'
-                + "{n}"
+        def work():
+            # Sublime Text's plugin host can't start Python worker processes,
+            # so files are converted in a thread pool here. The command line uses processes.
+            stats = convert_files(
+                sources,
+                kwargs,
+                user_settings,
+                indent,
+                output_dir=output_dir,
+                force=force,
+                workers=user_settings.get("workers"),
+                executor=ThreadPoolExecutor,
+                progress=sublime.status_message,
+            )
+            sublime.status_message(
+                "DataConverter: converted {converted}, skipped {skipped}, failed {failed} "
+                "({bytes} bytes in {seconds:.2f}s)".format(**stats)
             )
 
-        output += (
-            "{i}{i}</variables>{n}"
-            "{i}{i}"
-            "<v:sampleDataSets  "
-            'xmlns:v="http://ns.adobe.com/Variables/1.0/" '
-            'xmlns="http://ns.adobe.com/GenericCustomNamespace/1.0/">{n}'
-        )
+        sublime.set_timeout_async(work, 0)
 
-        field = (
-            ("{{i}}" * 4)
-            + "<{field}>{{n}}"
-            + ("{{i}}" * 5)
-            + "<p>{value}</p>{{n}}"
-            + ("{{i}}" * 4)
-            + "</{field}>"
+
+class DataConverterSchemaCommand(TextCommand):
+    """
+    Manage the schema cache: "edit" opens it, "pin" keeps the current file's entries
+    even when its columns change, "unpin" undoes that, and "forget" removes them.
+    """
+
+    def run(self, edit, action="edit"):
+        user_settings = sublime.load_settings("DataConverter.sublime-settings")
+        cache = SchemaCache(
+            schema_cache_path(user_settings.get("schema_cache"))
+            or schema_cache_path(True)
         )
 
-        for row in data:
-            output += (
-                ("{i}" * 3)
-                + '<v:sampleDataSet dataSetName="'
-                + row[0]
-                + '">{n}'
-                + "{n}".join(
-                    field.format(field=f, value=_escape(v))
-                    for f, v in zip(self.headers, row)
+        if action == "edit":
+            if not os.path.exists(cache.path):
+                cache.save()
+            self.view.window().open_file(cache.path)
+            return
+
+        path = self.view.file_name()
+        if path is None:
+            sublime.status_message("DataConverter: only saved files have schemas")
+
+        elif action == "forget":
+            cache.forget(path)
+            sublime.status_message("DataConverter: forgot the schema of " + path)
+
+        elif action in ("pin", "unpin"):
+            if cache.pin(path, action == "pin"):
+                sublime.status_message(
+                    "DataConverter: {}ned the schema of {}".format(action, path)
                 )
-                + "{n}"
-                + ("{i}" * 3)
-                + "</v:sampleDataSet>{n}"
-            )
+            else:
+                sublime.status_message("DataConverter: no schema cached for " + path)
 
-        output += (
-            "{i}{i}</v:sampleDataSets>{n}"
-            "{i}</variableSet>{n}"
-            "</variableSets>{n}"
-            "</svg>{n}"
-        )
+        else:
+            print("DataConverter: unknown schema action", action)
 
-        return output.format(i=self.settings["indent"], n=self.settings["newline"])
 
-    def text_table(self, data):
-        """text table converter"""
-        self.set_syntax("Text", "Plain Text")
+class DataConverterCacheCommand(WindowCommand):
+    """Show what's in the cache of recent conversions ("stats"), or empty it ("clear")."""
 
-        def decorate(lengths):
-            return "+" + "+".join("-" * (v + 2) for v in lengths) + "+"
+    def run(self, action="stats"):
+        cache = DataConverterCommand.cache
 
-        return self._spaced_text(
-            data, "|", decorate, top=True, between=True, bottom=True
-        )
+        if action == "stats":
+            message = "DataConverter cache: " + cache.stats()
 
-    def yaml(self, data):
-        """YAML Converter"""
-        self.set_syntax("YAML")
-        linebreak = "{n}-{n}{i}"
-        rows = (self.type_loop(r, "{field}: {value}", "{n}{i}") for r in data)
-        return ("---" + linebreak + linebreak.join(rows) + "{n}").format(
-            n=self.settings["newline"], i=self.settings["indent"]
-        )
+        elif action == "clear":
+            cache.clear()
+            message = "DataConverter: cleared the cache"
+
+        else:
+            print("DataConverter: unknown cache action", action)
+            return
+
+        print(message)
+        sublime.status_message(message)
+
+
+def main(argv=None):
+    """Convert files from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="DataConverter", description="Convert delimited files to other formats."
+    )
+    parser.add_argument(
+        "format",
+        help="output format: {}, or one defined in --formats".format(
+            ", ".join(sorted(EXTENSIONS))
+        ),
+    )
+    parser.add_argument("paths", nargs="+", help="files, folders or glob patterns")
+    parser.add_argument(
+        "-o", "--output-dir", help="write output here (default: next to each file)"
+    )
+    parser.add_argument(
+        "--pattern",
+        default="*.csv",
+        help="files to convert in folders, compressed or not (default: *.csv)",
+    )
+    parser.add_argument(
+        "--headers", default="sniff", choices=("sniff", "true", "never")
+    )
+    parser.add_argument(
+        "--dialect", help="a csv module dialect, e.g. excel or excel-tab"
+    )
+    parser.add_argument("--output-delimiter", help="delimiter for the dsv format")
+    parser.add_argument("--default-variable", default="DataConverter")
+    parser.add_argument(
+        "--rows", help="convert only rows FIRST:LAST, counted from 0 after the header"
+    )
+    parser.add_argument(
+        "--indent", type=int, default=4, help="spaces to indent, 0 for tabs"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="worker processes, for files or chunks of one large file (default: CPU count)",
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="convert up-to-date files"
+    )
+    parser.add_argument(
+        "--formats",
+        metavar="FILE",
+        help='JSON file of formats defined with templates, like the "formats" setting',
+    )
+    parser.add_argument(
+        "--schema-cache",
+        metavar="FILE",
+        help="remember the dialect, headers and types of each file in FILE",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=[ext[1:] for ext in COMPRESSION],
+        help="compress the output (compressed input is detected)",
+    )
+    parser.add_argument(
+        "--compress-threads",
+        action="store_true",
+        help="compress in a separate thread, while converting",
+    )
+    args = parser.parse_args(argv)
+
+    formats = {}
+    if args.formats:
+        with io.open(args.formats, encoding="utf-8") as f:
+            formats = json.load(f)
+
+    if args.format not in EXTENSIONS and args.format not in formats:
+        parser.error("unknown format " + repr(args.format))
+
+    user_settings = {
+        "headers": True if args.headers == "true" else args.headers,
+        "default_variable": args.default_variable,
+        "workers": args.workers,
+        "schema_cache": args.schema_cache,
+        "formats": formats,
+        "compress": args.compress,
+        "threaded_compression": args.compress_threads,
+    }
+    if args.dialect:
+        user_settings["use_dialect"] = args.dialect
+
+    kwargs = {"format": args.format, "output_delimiter": args.output_delimiter}
+    if args.rows:
+        first, _, last = args.rows.partition(":")
+        kwargs["rows"] = [int(first or 0), int(last) if last else None]
+
+    if args.format == "dsv" and not args.output_delimiter:
+        kwargs["output_delimiter"] = ","
+
+    stats = convert_files(
+        find_files(args.paths, args.pattern),
+        kwargs,
+        user_settings,
+        " " * args.indent if args.indent else "\t",
+        output_dir=args.output_dir,
+        force=args.force,
+        workers=args.workers,
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
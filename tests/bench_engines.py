@@ -0,0 +1,40 @@
+"""
+Time every way of converting in every format, as the tests run them (see engines in
+tests/test_formats.py: pieces of 7 rows, chunks in 2 workers), on generated hard CSV.
+Each is shown with its speed relative to converting the text in one go (str): 2.00x is
+twice as fast. Run from the repository:
+
+    python tests/bench_engines.py [rows] [format ...]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from test_formats import FORMATS, adversarial_csv, engines, write_input
+
+
+def main(rows=20000, *formats):
+    folder = tempfile.mkdtemp()
+    try:
+        path = write_input(folder, "input.csv", adversarial_csv(rows))
+        print("{} rows, {:.1f} MB".format(rows, os.path.getsize(path) / 1048576.0))
+
+        for fmt in formats or FORMATS:
+            base = None
+            for engine, run in engines(path, fmt):
+                seconds = min(timeit.repeat(run, number=1, repeat=3))
+                base = base or seconds
+                print(
+                    "{:16} {:12} {:.3f}s  {:.2f}x".format(
+                        fmt, engine, seconds, base / seconds
+                    )
+                )
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if sys.argv[1:] else 20000, *sys.argv[2:])
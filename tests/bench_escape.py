@@ -0,0 +1,69 @@
+"""
+Time the markup escapers against the other ways of escaping the same characters,
+on cells like those in tests/fixtures/adversarial.csv. Run from the repository:
+
+    python tests/bench_escape.py [cells]
+"""
+
+import csv
+import html
+import io
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import DataConverter  # noqa: E402
+from test_formats import adversarial_csv  # noqa: E402
+
+ATTRIBUTE = {
+    ord("&"): "&amp;",
+    ord("<"): "&lt;",
+    ord(">"): "&gt;",
+    ord('"'): "&quot;",
+    ord("'"): "&apos;",
+    ord("\t"): "&#9;",
+    ord("\n"): "&#10;",
+    ord("\r"): "&#13;",
+}
+attribute_pattern = re.compile("[&<>\"'\t\n\r]")
+
+
+def cells(count):
+    """count cells, mostly plain, with the adversarial values mixed in."""
+    rand = random.Random(0)
+    special = [
+        cell for row in csv.reader(io.StringIO(adversarial_csv(20))) for cell in row
+    ]
+    plain = ["Alice", "10", "Apple", "Sep. 12, 2016", "3.50", ""]
+    return [
+        rand.choice(special if rand.random() < 0.2 else plain) for _ in range(count)
+    ]
+
+
+def main(count=100000):
+    data = cells(count)
+    escapers = (
+        ("_escape (chained replace)", DataConverter._escape),
+        ("_escape_html (chained replace)", DataConverter._escape_html),
+        ("html.escape", html.escape),
+        ("_escape_attribute (chained replace)", DataConverter._escape_attribute),
+        ("attribute str.translate", lambda s: s.translate(ATTRIBUTE)),
+        (
+            "attribute re.sub",
+            lambda s: attribute_pattern.sub(lambda m: ATTRIBUTE[ord(m.group())], s),
+        ),
+    )
+
+    for name, escape in escapers:
+        seconds = min(
+            timeit.repeat(lambda: [escape(c) for c in data], number=1, repeat=5)
+        )
+        print("{:40} {:.3f}s".format(name, seconds))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""
+Time each JSON format with each installed json_backend on generated hard CSV (see
+tests/test_formats.py), and its speed relative to Python's json module: 2.00x is twice
+as fast. Run from the repository:
+
+    python tests/bench_json.py [rows]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import DataConverter  # noqa: E402
+from test_formats import adversarial_csv, convert  # noqa: E402
+
+FORMATS = sorted(fmt for fmt in DataConverter.EXTENSIONS if fmt.startswith("json"))
+
+
+def main(rows=20000):
+    text = adversarial_csv(rows)
+    backends = ["json", "auto"] + [
+        name for name in ("orjson", "ujson") if getattr(DataConverter, name) is not None
+    ]
+
+    for fmt in FORMATS:
+        base = None
+        for backend in backends:
+            seconds = min(
+                timeit.repeat(
+                    lambda: convert(fmt, text, backend=backend), number=1, repeat=3
+                )
+            )
+            base = base or seconds
+            print(
+                "{:14} {:8} {:.3f}s  {:.2f}x".format(
+                    fmt, backend, seconds, base / seconds
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
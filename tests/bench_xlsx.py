@@ -0,0 +1,97 @@
+"""
+Time converting a large CSV file to xlsx, with inline and with shared strings, against
+the CSV path (dsv), and show each one's peak memory and output size. Each conversion
+runs in its own process, so its peak memory is its own. Unix only. Run from the repository:
+
+    python tests/bench_xlsx.py [rows]
+"""
+
+import csv
+import io
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import DataConverter  # noqa: E402
+
+RUNS = (
+    ("dsv", {}),
+    ("xlsx", {}),
+    ("xlsx", {"xlsx_shared_strings": True}),
+)
+
+
+def write_csv(path, rows):
+    """A 5-column CSV: an id, a name, a city, an integer and a float."""
+    rand = random.Random(0)
+    cities = ("Paris", "New York", "Zürich", "Oslo", "東京")
+    with io.open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("id", "name", "city", "amount", "ratio"))
+        for i in range(rows):
+            writer.writerow(
+                (
+                    i,
+                    "name %d" % rand.randint(1, 9999),
+                    rand.choice(cities),
+                    rand.randint(0, 10**6),
+                    "%.3f" % rand.random(),
+                )
+            )
+
+
+def run(source, fmt, settings):
+    """Convert source in this process, and print seconds and peak RSS in MB."""
+    dest = DataConverter.output_path(source, fmt, output_delimiter=",")
+    user_settings = dict(settings, headers=True)
+    start = time.time()
+    DataConverter.convert_file(
+        source, dest, {"format": fmt, "output_delimiter": ","}, user_settings, "\t"
+    )
+    seconds = time.time() - start
+
+    # ru_maxrss is in kB on Linux, in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss /= 1048576.0 if sys.platform == "darwin" else 1024.0
+    print(seconds, rss, os.path.getsize(dest))
+
+
+def main(rows=1000000):
+    folder = tempfile.mkdtemp()
+    try:
+        source = os.path.join(folder, "data.csv")
+        write_csv(source, rows)
+        print("{} rows, {:.1f} MB".format(rows, os.path.getsize(source) / 1048576.0))
+
+        for fmt, settings in RUNS:
+            code = "import bench_xlsx; bench_xlsx.run({!r}, {!r}, {!r})".format(
+                source, fmt, settings
+            )
+            output = subprocess.check_output(
+                [sys.executable, "-c", code],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                stderr=subprocess.DEVNULL,
+            )
+            seconds, rss, size = output.split()[-3:]
+            print(
+                "{:28} {:7.2f}s  {:6.1f} MB peak RSS  {:6.1f} MB output".format(
+                    fmt + (" shared strings" if settings else ""),
+                    float(seconds),
+                    float(rss),
+                    int(size) / 1048576.0,
+                )
+            )
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
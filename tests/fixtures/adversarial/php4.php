@@ -0,0 +1,120 @@
+array(
+    array('id'=>0, 'name'=>'757.95', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>1, 'name'=>'40.48', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>2, 'name'=>'été', 'note {x}'=>crlf
+break, '東京'=><b>&amp;</b>, 'amount'=>ｗｉｄｅ, 'None'=>583.38),
+    array('id'=>3, 'name'=>'it\'s', 'note {x}'=>3.5, '東京'=>crlf
+break, 'amount'=>139.75),
+    array('id'=>4, 'name'=>'back\slash', 'note {x}'=>line
+break, '東京'=> padded , 'amount'=>982.79),
+    array('id'=>5, 'name'=>'crlf
+break', 'note {x}'=>-12, '東京'=>0, 'amount'=>898.84),
+    array('id'=>6, 'name'=>'<b>&amp;</b>', 'note {x}'=> padded , '東京'=>100.70, 'amount'=>null),
+    array('id'=>7, 'name'=>'316.20', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>8, 'name'=>' padded ', 'note {x}'=><b>&amp;</b>, '東京'=>{x}}, 'amount'=>865.31),
+    array('id'=>9, 'name'=>'', 'note {x}'=> padded , '東京'=>plain, 'amount'=>93.27),
+    array('id'=>10, 'name'=>'710.25', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>11, 'name'=>'back\slash', 'note {x}'=><b>&amp;</b>, '東京'=>東京都, 'amount'=>243.91),
+    array('id'=>12, 'name'=>'0', 'note {x}'=>a,b, '東京'=>917.02, 'amount'=>null),
+    array('id'=>13, 'name'=>'say "hi"', 'note {x}'=>3.5, '東京'=> padded , 'amount'=>447.97),
+    array('id'=>14, 'name'=>'東京都', 'note {x}'=>it's, '東京'=><b>&amp;</b>, 'amount'=>109.06),
+    array('id'=>15, 'name'=>'-12', 'note {x}'=> padded , '東京'=>東京都, 'amount'=>814.47),
+    array('id'=>16, 'name'=>'back\slash', 'note {x}'=> padded , '東京'=>tab	here, 'amount'=>287.66),
+    array('id'=>17, 'name'=>'back\slash', 'note {x}'=>été, '東京'=>東京都, 'amount'=>575.65),
+    array('id'=>18, 'name'=>'1e3', 'note {x}'=>a,b, '東京'=>1e3, 'amount'=>32.97),
+    array('id'=>19, 'name'=>'<b>&amp;</b>', 'note {x}'=>0, '東京'=>0, 'amount'=>678.72),
+    array('id'=>20, 'name'=>'3.5', 'note {x}'=>, '東京'=>0, 'amount'=>898.17),
+    array('id'=>21, 'name'=>'837.87', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>22, 'name'=>'it\'s', 'note {x}'=>say "hi", '東京'=>a,b, 'amount'=>895.04),
+    array('id'=>23, 'name'=>'579.70', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>24, 'name'=>'<b>&amp;</b>', 'note {x}'=>NULL, '東京'=>, 'amount'=>ｗｉｄｅ, 'None'=>82.37),
+    array('id'=>25, 'name'=>'<b>&amp;</b>', 'note {x}'=>tab	here, '東京'=>, 'amount'=>335.27),
+    array('id'=>26, 'name'=>'say "hi"', 'note {x}'=>plain, '東京'=>line
+break, 'amount'=>117.13),
+    array('id'=>27, 'name'=>'ｗｉｄｅ', 'note {x}'=>1e3, '東京'=>東京都, 'amount'=>426.13),
+    array('id'=>28, 'name'=>'-12', 'note {x}'=>3.5, '東京'=>say "hi", 'amount'=>45.23),
+    array('id'=>29, 'name'=>'plain', 'note {x}'=>-12, '東京'=>, 'amount'=>188.52),
+    array('id'=>30, 'name'=>'été', 'note {x}'=>0, '東京'=>ｗｉｄｅ, 'amount'=>833.84),
+    array('id'=>31, 'name'=>'', 'note {x}'=>back\slash, '東京'=>plain, 'amount'=>194.59),
+    array('id'=>32, 'name'=>'-12', 'note {x}'=><b>&amp;</b>, '東京'=>a,b, 'amount'=>727.16),
+    array('id'=>33, 'name'=>'NULL', 'note {x}'=>plain, '東京'=> padded , 'amount'=>425.62),
+    array('id'=>34, 'name'=>'line
+break', 'note {x}'=>0, '東京'=>say "hi", 'amount'=>71.97),
+    array('id'=>35, 'name'=>'ｗｉｄｅ', 'note {x}'=>{0}, '東京'=>1e3, 'amount'=>61.04),
+    array('id'=>36, 'name'=>'', 'note {x}'=>back\slash, '東京'=>-12, 'amount'=>été, 'None'=>199.36),
+    array('id'=>37, 'name'=>'<b>&amp;</b>', 'note {x}'=>tab	here, '東京'=>169.42, 'amount'=>null),
+    array('id'=>38, 'name'=>'', 'note {x}'=>NULL, '東京'=>1e3, 'amount'=>845.42),
+    array('id'=>39, 'name'=>'it\'s', 'note {x}'=>line
+break, '東京'=>117.21, 'amount'=>null),
+    array('id'=>40, 'name'=>'NULL', 'note {x}'=>1e3, '東京'=>plain, 'amount'=><b>&amp;</b>, 'None'=>681.28),
+    array('id'=>41, 'name'=>'', 'note {x}'=>ｗｉｄｅ, '東京'=>été, 'amount'=>837.66),
+    array('id'=>42, 'name'=>'3.5', 'note {x}'=> padded , '東京'=>plain, 'amount'=>457.95),
+    array('id'=>43, 'name'=>'東京都', 'note {x}'=>, '東京'=> padded , 'amount'=>280.88),
+    array('id'=>44, 'name'=>'<b>&amp;</b>', 'note {x}'=>ｗｉｄｅ, '東京'=>back\slash, 'amount'=>287.88),
+    array('id'=>45, 'name'=>'tab	here', 'note {x}'=>, '東京'=>853.77, 'amount'=>null),
+    array('id'=>46, 'name'=>'crlf
+break', 'note {x}'=>été, '東京'=>{0}, 'amount'=>828.90),
+    array('id'=>47, 'name'=>'plain', 'note {x}'=>back\slash, '東京'=>a,b, 'amount'=>698.58),
+    array('id'=>48, 'name'=>'say "hi"', 'note {x}'=>say "hi", '東京'=>, 'amount'=>448.14),
+    array('id'=>49, 'name'=>'31.55', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>50, 'name'=>'772.19', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>51, 'name'=>'1e3', 'note {x}'=>{x}}, '東京'=>0, 'amount'=>259.23),
+    array('id'=>52, 'name'=>'{x}}', 'note {x}'=>it's, '東京'=><b>&amp;</b>, 'amount'=>908.04),
+    array('id'=>53, 'name'=>'', 'note {x}'=><b>&amp;</b>, '東京'=>東京都, 'amount'=>312.06),
+    array('id'=>54, 'name'=>'', 'note {x}'=>{0}, '東京'=>a,b, 'amount'=> padded , 'None'=>999.42),
+    array('id'=>55, 'name'=>'3.5', 'note {x}'=>plain, '東京'=>été, 'amount'=>949.55),
+    array('id'=>56, 'name'=>'316.18', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>57, 'name'=>'plain', 'note {x}'=>plain, '東京'=>NULL, 'amount'=>528.35),
+    array('id'=>58, 'name'=>'a,b', 'note {x}'=>-12, '東京'=>back\slash, 'amount'=>649.27),
+    array('id'=>59, 'name'=>'line
+break', 'note {x}'=>1e3, '東京'=>-12, 'amount'=>475.61),
+    array('id'=>60, 'name'=>'627.64', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>61, 'name'=>'line
+break', 'note {x}'=>{x}}, '東京'=>-12, 'amount'=>861.36),
+    array('id'=>62, 'name'=>'', 'note {x}'=>it's, '東京'=>, 'amount'=>644.94),
+    array('id'=>63, 'name'=>'3.5', 'note {x}'=>line
+break, '東京'=>plain, 'amount'=>42.30),
+    array('id'=>64, 'name'=>'NULL', 'note {x}'=>line
+break, '東京'=> padded , 'amount'=>314.71),
+    array('id'=>65, 'name'=>'tab	here', 'note {x}'=>, '東京'=>846.36, 'amount'=>null),
+    array('id'=>66, 'name'=>'', 'note {x}'=>{x}}, '東京'=>, 'amount'=>{0}, 'None'=>372.45),
+    array('id'=>67, 'name'=>'a,b', 'note {x}'=>été, '東京'=>tab	here, 'amount'=>291.04),
+    array('id'=>68, 'name'=>'3.5', 'note {x}'=>line
+break, '東京'=>東京都, 'amount'=>337.51),
+    array('id'=>69, 'name'=>'0', 'note {x}'=>東京都, '東京'=>779.42, 'amount'=>null),
+    array('id'=>70, 'name'=>'', 'note {x}'=>line
+break, '東京'=>1e3, 'amount'=>149.42),
+    array('id'=>71, 'name'=>'ｗｉｄｅ', 'note {x}'=>été, '東京'=> padded , 'amount'=>129.64),
+    array('id'=>72, 'name'=>'<b>&amp;</b>', 'note {x}'=>say "hi", '東京'=>, 'amount'=>307.88),
+    array('id'=>73, 'name'=>'crlf
+break', 'note {x}'=>été, '東京'=>東京都, 'amount'=>299.23),
+    array('id'=>74, 'name'=>'-12', 'note {x}'=> padded , '東京'=><b>&amp;</b>, 'amount'=>474.00),
+    array('id'=>75, 'name'=>'-12', 'note {x}'=><b>&amp;</b>, '東京'=>116.01, 'amount'=>null),
+    array('id'=>76, 'name'=>'{0}', 'note {x}'=>, '東京'=>crlf
+break, 'amount'=>東京都, 'None'=>734.75),
+    array('id'=>77, 'name'=>'1e3', 'note {x}'=>, '東京'=>tab	here, 'amount'=>375.57),
+    array('id'=>78, 'name'=>'0', 'note {x}'=>0, '東京'=>a,b, 'amount'=>749.87),
+    array('id'=>79, 'name'=>'été', 'note {x}'=>plain, '東京'=>-12, 'amount'=>393.81),
+    array('id'=>80, 'name'=>'{x}}', 'note {x}'=><b>&amp;</b>, '東京'=>tab	here, 'amount'=>714.41),
+    array('id'=>81, 'name'=>'{0}', 'note {x}'=>0, '東京'=>ｗｉｄｅ, 'amount'=>220.14),
+    array('id'=>82, 'name'=>'tab	here', 'note {x}'=>1e3, '東京'=>{0}, 'amount'=>191.95),
+    array('id'=>83, 'name'=>'0', 'note {x}'=>plain, '東京'=>it's, 'amount'=>451.61),
+    array('id'=>84, 'name'=>'-12', 'note {x}'=><b>&amp;</b>, '東京'=>été, 'amount'=>256.48),
+    array('id'=>85, 'name'=>'a,b', 'note {x}'=>back\slash, '東京'=>3.5, 'amount'=>104.63),
+    array('id'=>86, 'name'=>'été', 'note {x}'=>ｗｉｄｅ, '東京'=> padded , 'amount'=>3.5, 'None'=>104.75),
+    array('id'=>87, 'name'=>'3.5', 'note {x}'=>tab	here, '東京'=>été, 'amount'=>, 'None'=>679.93),
+    array('id'=>88, 'name'=>'NULL', 'note {x}'=>東京都, '東京'=><b>&amp;</b>, 'amount'=><b>&amp;</b>, 'None'=>635.06),
+    array('id'=>89, 'name'=>' padded ', 'note {x}'=>back\slash, '東京'=>say "hi", 'amount'=>9.70),
+    array('id'=>90, 'name'=>'東京都', 'note {x}'=>, '東京'=>525.11, 'amount'=>null),
+    array('id'=>91, 'name'=>'back\slash', 'note {x}'=>3.5, '東京'=>été, 'amount'=>582.95),
+    array('id'=>92, 'name'=>'0', 'note {x}'=>0, '東京'=>it's, 'amount'=>, 'None'=>66.35),
+    array('id'=>93, 'name'=>'', 'note {x}'=>crlf
+break, '東京'=>plain, 'amount'=>758.90),
+    array('id'=>94, 'name'=>'東京都', 'note {x}'=>1e3, '東京'=>3.5, 'amount'=>, 'None'=>460.74),
+    array('id'=>95, 'name'=>'it\'s', 'note {x}'=>été, '東京'=>901.09, 'amount'=>null),
+    array('id'=>96, 'name'=>'tab	here', 'note {x}'=>0, '東京'=>NULL, 'amount'=>794.15),
+    array('id'=>97, 'name'=>'{0}', 'note {x}'=>a,b, '東京'=>crlf
+break, 'amount'=>535.42),
+    array('id'=>98, 'name'=>'825.70', 'note {x}'=>null, '東京'=>null, 'amount'=>null),
+    array('id'=>99, 'name'=>'été', 'note {x}'=>back\slash, '東京'=>tab	here, 'amount'=>say "hi", 'None'=>851.32)
+);
\ No newline at end of file
@@ -0,0 +1,417 @@
+[{'amount': None, 'id': 0, 'name': '757.95', 'note {x}': None, '東京': None},
+ {'amount': None, 'id': 1, 'name': '40.48', 'note {x}': None, '東京': None},
+ {None: '583.38',
+  'amount': 'ｗｉｄｅ',
+  'id': 2,
+  'name': 'été',
+  'note {x}': 'crlf\r\nbreak',
+  '東京': '<b>&amp;</b>'},
+ {'amount': '139.75',
+  'id': 3,
+  'name': "it's",
+  'note {x}': '3.5',
+  '東京': 'crlf\r\nbreak'},
+ {'amount': '982.79',
+  'id': 4,
+  'name': 'back\\slash',
+  'note {x}': 'line\nbreak',
+  '東京': ' padded '},
+ {'amount': '898.84',
+  'id': 5,
+  'name': 'crlf\r\nbreak',
+  'note {x}': '-12',
+  '東京': '0'},
+ {'amount': None,
+  'id': 6,
+  'name': '<b>&amp;</b>',
+  'note {x}': ' padded ',
+  '東京': '100.70'},
+ {'amount': None, 'id': 7, 'name': '316.20', 'note {x}': None, '東京': None},
+ {'amount': '865.31',
+  'id': 8,
+  'name': ' padded ',
+  'note {x}': '<b>&amp;</b>',
+  '東京': '{x}}'},
+ {'amount': '93.27',
+  'id': 9,
+  'name': '',
+  'note {x}': ' padded ',
+  '東京': 'plain'},
+ {'amount': None, 'id': 10, 'name': '710.25', 'note {x}': None, '東京': None},
+ {'amount': '243.91',
+  'id': 11,
+  'name': 'back\\slash',
+  'note {x}': '<b>&amp;</b>',
+  '東京': '東京都'},
+ {'amount': None, 'id': 12, 'name': '0', 'note {x}': 'a,b', '東京': '917.02'},
+ {'amount': '447.97',
+  'id': 13,
+  'name': 'say "hi"',
+  'note {x}': '3.5',
+  '東京': ' padded '},
+ {'amount': '109.06',
+  'id': 14,
+  'name': '東京都',
+  'note {x}': "it's",
+  '東京': '<b>&amp;</b>'},
+ {'amount': '814.47',
+  'id': 15,
+  'name': '-12',
+  'note {x}': ' padded ',
+  '東京': '東京都'},
+ {'amount': '287.66',
+  'id': 16,
+  'name': 'back\\slash',
+  'note {x}': ' padded ',
+  '東京': 'tab\there'},
+ {'amount': '575.65',
+  'id': 17,
+  'name': 'back\\slash',
+  'note {x}': 'été',
+  '東京': '東京都'},
+ {'amount': '32.97', 'id': 18, 'name': '1e3', 'note {x}': 'a,b', '東京': '1e3'},
+ {'amount': '678.72',
+  'id': 19,
+  'name': '<b>&amp;</b>',
+  'note {x}': '0',
+  '東京': '0'},
+ {'amount': '898.17', 'id': 20, 'name': '3.5', 'note {x}': '', '東京': '0'},
+ {'amount': None, 'id': 21, 'name': '837.87', 'note {x}': None, '東京': None},
+ {'amount': '895.04',
+  'id': 22,
+  'name': "it's",
+  'note {x}': 'say "hi"',
+  '東京': 'a,b'},
+ {'amount': None, 'id': 23, 'name': '579.70', 'note {x}': None, '東京': None},
+ {None: '82.37',
+  'amount': 'ｗｉｄｅ',
+  'id': 24,
+  'name': '<b>&amp;</b>',
+  'note {x}': 'NULL',
+  '東京': '\x7f'},
+ {'amount': '335.27',
+  'id': 25,
+  'name': '<b>&amp;</b>',
+  'note {x}': 'tab\there',
+  '東京': '\x7f'},
+ {'amount': '117.13',
+  'id': 26,
+  'name': 'say "hi"',
+  'note {x}': 'plain',
+  '東京': 'line\nbreak'},
+ {'amount': '426.13', 'id': 27, 'name': 'ｗｉｄｅ', 'note {x}': '1e3', '東京': '東京都'},
+ {'amount': '45.23',
+  'id': 28,
+  'name': '-12',
+  'note {x}': '3.5',
+  '東京': 'say "hi"'},
+ {'amount': '188.52',
+  'id': 29,
+  'name': 'plain',
+  'note {x}': '-12',
+  '東京': '\x7f'},
+ {'amount': '833.84', 'id': 30, 'name': 'été', 'note {x}': '0', '東京': 'ｗｉｄｅ'},
+ {'amount': '194.59',
+  'id': 31,
+  'name': '',
+  'note {x}': 'back\\slash',
+  '東京': 'plain'},
+ {'amount': '727.16',
+  'id': 32,
+  'name': '-12',
+  'note {x}': '<b>&amp;</b>',
+  '東京': 'a,b'},
+ {'amount': '425.62',
+  'id': 33,
+  'name': 'NULL',
+  'note {x}': 'plain',
+  '東京': ' padded '},
+ {'amount': '71.97',
+  'id': 34,
+  'name': 'line\nbreak',
+  'note {x}': '0',
+  '東京': 'say "hi"'},
+ {'amount': '61.04', 'id': 35, 'name': 'ｗｉｄｅ', 'note {x}': '{0}', '東京': '1e3'},
+ {None: '199.36',
+  'amount': 'été',
+  'id': 36,
+  'name': '',
+  'note {x}': 'back\\slash',
+  '東京': '-12'},
+ {'amount': None,
+  'id': 37,
+  'name': '<b>&amp;</b>',
+  'note {x}': 'tab\there',
+  '東京': '169.42'},
+ {'amount': '845.42', 'id': 38, 'name': '', 'note {x}': 'NULL', '東京': '1e3'},
+ {'amount': None,
+  'id': 39,
+  'name': "it's",
+  'note {x}': 'line\nbreak',
+  '東京': '117.21'},
+ {None: '681.28',
+  'amount': '<b>&amp;</b>',
+  'id': 40,
+  'name': 'NULL',
+  'note {x}': '1e3',
+  '東京': 'plain'},
+ {'amount': '837.66',
+  'id': 41,
+  'name': '\x7f',
+  'note {x}': 'ｗｉｄｅ',
+  '東京': 'été'},
+ {'amount': '457.95',
+  'id': 42,
+  'name': '3.5',
+  'note {x}': ' padded ',
+  '東京': 'plain'},
+ {'amount': '280.88',
+  'id': 43,
+  'name': '東京都',
+  'note {x}': '',
+  '東京': ' padded '},
+ {'amount': '287.88',
+  'id': 44,
+  'name': '<b>&amp;</b>',
+  'note {x}': 'ｗｉｄｅ',
+  '東京': 'back\\slash'},
+ {'amount': None,
+  'id': 45,
+  'name': 'tab\there',
+  'note {x}': '\x7f',
+  '東京': '853.77'},
+ {'amount': '828.90',
+  'id': 46,
+  'name': 'crlf\r\nbreak',
+  'note {x}': 'été',
+  '東京': '{0}'},
+ {'amount': '698.58',
+  'id': 47,
+  'name': 'plain',
+  'note {x}': 'back\\slash',
+  '東京': 'a,b'},
+ {'amount': '448.14',
+  'id': 48,
+  'name': 'say "hi"',
+  'note {x}': 'say "hi"',
+  '東京': '\x7f'},
+ {'amount': None, 'id': 49, 'name': '31.55', 'note {x}': None, '東京': None},
+ {'amount': None, 'id': 50, 'name': '772.19', 'note {x}': None, '東京': None},
+ {'amount': '259.23', 'id': 51, 'name': '1e3', 'note {x}': '{x}}', '東京': '0'},
+ {'amount': '908.04',
+  'id': 52,
+  'name': '{x}}',
+  'note {x}': "it's",
+  '東京': '<b>&amp;</b>'},
+ {'amount': '312.06',
+  'id': 53,
+  'name': '',
+  'note {x}': '<b>&amp;</b>',
+  '東京': '東京都'},
+ {None: '999.42',
+  'amount': ' padded ',
+  'id': 54,
+  'name': '',
+  'note {x}': '{0}',
+  '東京': 'a,b'},
+ {'amount': '949.55',
+  'id': 55,
+  'name': '3.5',
+  'note {x}': 'plain',
+  '東京': 'été'},
+ {'amount': None, 'id': 56, 'name': '316.18', 'note {x}': None, '東京': None},
+ {'amount': '528.35',
+  'id': 57,
+  'name': 'plain',
+  'note {x}': 'plain',
+  '東京': 'NULL'},
+ {'amount': '649.27',
+  'id': 58,
+  'name': 'a,b',
+  'note {x}': '-12',
+  '東京': 'back\\slash'},
+ {'amount': '475.61',
+  'id': 59,
+  'name': 'line\nbreak',
+  'note {x}': '1e3',
+  '東京': '-12'},
+ {'amount': None, 'id': 60, 'name': '627.64', 'note {x}': None, '東京': None},
+ {'amount': '861.36',
+  'id': 61,
+  'name': 'line\nbreak',
+  'note {x}': '{x}}',
+  '東京': '-12'},
+ {'amount': '644.94',
+  'id': 62,
+  'name': '\x7f',
+  'note {x}': "it's",
+  '東京': '\x7f'},
+ {'amount': '42.30',
+  'id': 63,
+  'name': '3.5',
+  'note {x}': 'line\nbreak',
+  '東京': 'plain'},
+ {'amount': '314.71',
+  'id': 64,
+  'name': 'NULL',
+  'note {x}': 'line\nbreak',
+  '東京': ' padded '},
+ {'amount': None,
+  'id': 65,
+  'name': 'tab\there',
+  'note {x}': '',
+  '東京': '846.36'},
+ {None: '372.45',
+  'amount': '{0}',
+  'id': 66,
+  'name': '\x7f',
+  'note {x}': '{x}}',
+  '東京': '\x7f'},
+ {'amount': '291.04',
+  'id': 67,
+  'name': 'a,b',
+  'note {x}': 'été',
+  '東京': 'tab\there'},
+ {'amount': '337.51',
+  'id': 68,
+  'name': '3.5',
+  'note {x}': 'line\nbreak',
+  '東京': '東京都'},
+ {'amount': None, 'id': 69, 'name': '0', 'note {x}': '東京都', '東京': '779.42'},
+ {'amount': '149.42',
+  'id': 70,
+  'name': '',
+  'note {x}': 'line\nbreak',
+  '東京': '1e3'},
+ {'amount': '129.64',
+  'id': 71,
+  'name': 'ｗｉｄｅ',
+  'note {x}': 'été',
+  '東京': ' padded '},
+ {'amount': '307.88',
+  'id': 72,
+  'name': '<b>&amp;</b>',
+  'note {x}': 'say "hi"',
+  '東京': ''},
+ {'amount': '299.23',
+  'id': 73,
+  'name': 'crlf\r\nbreak',
+  'note {x}': 'été',
+  '東京': '東京都'},
+ {'amount': '474.00',
+  'id': 74,
+  'name': '-12',
+  'note {x}': ' padded ',
+  '東京': '<b>&amp;</b>'},
+ {'amount': None,
+  'id': 75,
+  'name': '-12',
+  'note {x}': '<b>&amp;</b>',
+  '東京': '116.01'},
+ {None: '734.75',
+  'amount': '東京都',
+  'id': 76,
+  'name': '{0}',
+  'note {x}': '',
+  '東京': 'crlf\r\nbreak'},
+ {'amount': '375.57',
+  'id': 77,
+  'name': '1e3',
+  'note {x}': '\x7f',
+  '東京': 'tab\there'},
+ {'amount': '749.87', 'id': 78, 'name': '0', 'note {x}': '0', '東京': 'a,b'},
+ {'amount': '393.81',
+  'id': 79,
+  'name': 'été',
+  'note {x}': 'plain',
+  '東京': '-12'},
+ {'amount': '714.41',
+  'id': 80,
+  'name': '{x}}',
+  'note {x}': '<b>&amp;</b>',
+  '東京': 'tab\there'},
+ {'amount': '220.14', 'id': 81, 'name': '{0}', 'note {x}': '0', '東京': 'ｗｉｄｅ'},
+ {'amount': '191.95',
+  'id': 82,
+  'name': 'tab\there',
+  'note {x}': '1e3',
+  '東京': '{0}'},
+ {'amount': '451.61', 'id': 83, 'name': '0', 'note {x}': 'plain', '東京': "it's"},
+ {'amount': '256.48',
+  'id': 84,
+  'name': '-12',
+  'note {x}': '<b>&amp;</b>',
+  '東京': 'été'},
+ {'amount': '104.63',
+  'id': 85,
+  'name': 'a,b',
+  'note {x}': 'back\\slash',
+  '東京': '3.5'},
+ {None: '104.75',
+  'amount': '3.5',
+  'id': 86,
+  'name': 'été',
+  'note {x}': 'ｗｉｄｅ',
+  '東京': ' padded '},
+ {None: '679.93',
+  'amount': '\x7f',
+  'id': 87,
+  'name': '3.5',
+  'note {x}': 'tab\there',
+  '東京': 'été'},
+ {None: '635.06',
+  'amount': '<b>&amp;</b>',
+  'id': 88,
+  'name': 'NULL',
+  'note {x}': '東京都',
+  '東京': '<b>&amp;</b>'},
+ {'amount': '9.70',
+  'id': 89,
+  'name': ' padded ',
+  'note {x}': 'back\\slash',
+  '東京': 'say "hi"'},
+ {'amount': None, 'id': 90, 'name': '東京都', 'note {x}': '', '東京': '525.11'},
+ {'amount': '582.95',
+  'id': 91,
+  'name': 'back\\slash',
+  'note {x}': '3.5',
+  '東京': 'été'},
+ {None: '66.35',
+  'amount': '',
+  'id': 92,
+  'name': '0',
+  'note {x}': '0',
+  '東京': "it's"},
+ {'amount': '758.90',
+  'id': 93,
+  'name': '',
+  'note {x}': 'crlf\r\nbreak',
+  '東京': 'plain'},
+ {None: '460.74',
+  'amount': '\x7f',
+  'id': 94,
+  'name': '東京都',
+  'note {x}': '1e3',
+  '東京': '3.5'},
+ {'amount': None,
+  'id': 95,
+  'name': "it's",
+  'note {x}': 'été',
+  '東京': '901.09'},
+ {'amount': '794.15',
+  'id': 96,
+  'name': 'tab\there',
+  'note {x}': '0',
+  '東京': 'NULL'},
+ {'amount': '535.42',
+  'id': 97,
+  'name': '{0}',
+  'note {x}': 'a,b',
+  '東京': 'crlf\r\nbreak'},
+ {'amount': None, 'id': 98, 'name': '825.70', 'note {x}': None, '東京': None},
+ {None: '851.32',
+  'amount': 'say "hi"',
+  'id': 99,
+  'name': 'été',
+  'note {x}': 'back\\slash',
+  '東京': 'tab\there'}]
\ No newline at end of file
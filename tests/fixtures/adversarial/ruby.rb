@@ -0,0 +1,120 @@
+[
+    {'id'=>0, 'name'=>'757.95', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>1, 'name'=>'40.48', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>2, 'name'=>'été', 'note {x}'=>crlf
+break, '東京'=><b>&amp;</b>, 'amount'=>ｗｉｄｅ, 'None'=>583.38},
+    {'id'=>3, 'name'=>'it\'s', 'note {x}'=>3.5, '東京'=>crlf
+break, 'amount'=>139.75},
+    {'id'=>4, 'name'=>'back\slash', 'note {x}'=>line
+break, '東京'=> padded , 'amount'=>982.79},
+    {'id'=>5, 'name'=>'crlf
+break', 'note {x}'=>-12, '東京'=>0, 'amount'=>898.84},
+    {'id'=>6, 'name'=>'<b>&amp;</b>', 'note {x}'=> padded , '東京'=>100.70, 'amount'=>nil},
+    {'id'=>7, 'name'=>'316.20', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>8, 'name'=>' padded ', 'note {x}'=><b>&amp;</b>, '東京'=>{x}}, 'amount'=>865.31},
+    {'id'=>9, 'name'=>'', 'note {x}'=> padded , '東京'=>plain, 'amount'=>93.27},
+    {'id'=>10, 'name'=>'710.25', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>11, 'name'=>'back\slash', 'note {x}'=><b>&amp;</b>, '東京'=>東京都, 'amount'=>243.91},
+    {'id'=>12, 'name'=>'0', 'note {x}'=>a,b, '東京'=>917.02, 'amount'=>nil},
+    {'id'=>13, 'name'=>'say "hi"', 'note {x}'=>3.5, '東京'=> padded , 'amount'=>447.97},
+    {'id'=>14, 'name'=>'東京都', 'note {x}'=>it's, '東京'=><b>&amp;</b>, 'amount'=>109.06},
+    {'id'=>15, 'name'=>'-12', 'note {x}'=> padded , '東京'=>東京都, 'amount'=>814.47},
+    {'id'=>16, 'name'=>'back\slash', 'note {x}'=> padded , '東京'=>tab	here, 'amount'=>287.66},
+    {'id'=>17, 'name'=>'back\slash', 'note {x}'=>été, '東京'=>東京都, 'amount'=>575.65},
+    {'id'=>18, 'name'=>'1e3', 'note {x}'=>a,b, '東京'=>1e3, 'amount'=>32.97},
+    {'id'=>19, 'name'=>'<b>&amp;</b>', 'note {x}'=>0, '東京'=>0, 'amount'=>678.72},
+    {'id'=>20, 'name'=>'3.5', 'note {x}'=>, '東京'=>0, 'amount'=>898.17},
+    {'id'=>21, 'name'=>'837.87', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>22, 'name'=>'it\'s', 'note {x}'=>say "hi", '東京'=>a,b, 'amount'=>895.04},
+    {'id'=>23, 'name'=>'579.70', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>24, 'name'=>'<b>&amp;</b>', 'note {x}'=>NULL, '東京'=>, 'amount'=>ｗｉｄｅ, 'None'=>82.37},
+    {'id'=>25, 'name'=>'<b>&amp;</b>', 'note {x}'=>tab	here, '東京'=>, 'amount'=>335.27},
+    {'id'=>26, 'name'=>'say "hi"', 'note {x}'=>plain, '東京'=>line
+break, 'amount'=>117.13},
+    {'id'=>27, 'name'=>'ｗｉｄｅ', 'note {x}'=>1e3, '東京'=>東京都, 'amount'=>426.13},
+    {'id'=>28, 'name'=>'-12', 'note {x}'=>3.5, '東京'=>say "hi", 'amount'=>45.23},
+    {'id'=>29, 'name'=>'plain', 'note {x}'=>-12, '東京'=>, 'amount'=>188.52},
+    {'id'=>30, 'name'=>'été', 'note {x}'=>0, '東京'=>ｗｉｄｅ, 'amount'=>833.84},
+    {'id'=>31, 'name'=>'', 'note {x}'=>back\slash, '東京'=>plain, 'amount'=>194.59},
+    {'id'=>32, 'name'=>'-12', 'note {x}'=><b>&amp;</b>, '東京'=>a,b, 'amount'=>727.16},
+    {'id'=>33, 'name'=>'NULL', 'note {x}'=>plain, '東京'=> padded , 'amount'=>425.62},
+    {'id'=>34, 'name'=>'line
+break', 'note {x}'=>0, '東京'=>say "hi", 'amount'=>71.97},
+    {'id'=>35, 'name'=>'ｗｉｄｅ', 'note {x}'=>{0}, '東京'=>1e3, 'amount'=>61.04},
+    {'id'=>36, 'name'=>'', 'note {x}'=>back\slash, '東京'=>-12, 'amount'=>été, 'None'=>199.36},
+    {'id'=>37, 'name'=>'<b>&amp;</b>', 'note {x}'=>tab	here, '東京'=>169.42, 'amount'=>nil},
+    {'id'=>38, 'name'=>'', 'note {x}'=>NULL, '東京'=>1e3, 'amount'=>845.42},
+    {'id'=>39, 'name'=>'it\'s', 'note {x}'=>line
+break, '東京'=>117.21, 'amount'=>nil},
+    {'id'=>40, 'name'=>'NULL', 'note {x}'=>1e3, '東京'=>plain, 'amount'=><b>&amp;</b>, 'None'=>681.28},
+    {'id'=>41, 'name'=>'', 'note {x}'=>ｗｉｄｅ, '東京'=>été, 'amount'=>837.66},
+    {'id'=>42, 'name'=>'3.5', 'note {x}'=> padded , '東京'=>plain, 'amount'=>457.95},
+    {'id'=>43, 'name'=>'東京都', 'note {x}'=>, '東京'=> padded , 'amount'=>280.88},
+    {'id'=>44, 'name'=>'<b>&amp;</b>', 'note {x}'=>ｗｉｄｅ, '東京'=>back\slash, 'amount'=>287.88},
+    {'id'=>45, 'name'=>'tab	here', 'note {x}'=>, '東京'=>853.77, 'amount'=>nil},
+    {'id'=>46, 'name'=>'crlf
+break', 'note {x}'=>été, '東京'=>{0}, 'amount'=>828.90},
+    {'id'=>47, 'name'=>'plain', 'note {x}'=>back\slash, '東京'=>a,b, 'amount'=>698.58},
+    {'id'=>48, 'name'=>'say "hi"', 'note {x}'=>say "hi", '東京'=>, 'amount'=>448.14},
+    {'id'=>49, 'name'=>'31.55', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>50, 'name'=>'772.19', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>51, 'name'=>'1e3', 'note {x}'=>{x}}, '東京'=>0, 'amount'=>259.23},
+    {'id'=>52, 'name'=>'{x}}', 'note {x}'=>it's, '東京'=><b>&amp;</b>, 'amount'=>908.04},
+    {'id'=>53, 'name'=>'', 'note {x}'=><b>&amp;</b>, '東京'=>東京都, 'amount'=>312.06},
+    {'id'=>54, 'name'=>'', 'note {x}'=>{0}, '東京'=>a,b, 'amount'=> padded , 'None'=>999.42},
+    {'id'=>55, 'name'=>'3.5', 'note {x}'=>plain, '東京'=>été, 'amount'=>949.55},
+    {'id'=>56, 'name'=>'316.18', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>57, 'name'=>'plain', 'note {x}'=>plain, '東京'=>NULL, 'amount'=>528.35},
+    {'id'=>58, 'name'=>'a,b', 'note {x}'=>-12, '東京'=>back\slash, 'amount'=>649.27},
+    {'id'=>59, 'name'=>'line
+break', 'note {x}'=>1e3, '東京'=>-12, 'amount'=>475.61},
+    {'id'=>60, 'name'=>'627.64', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>61, 'name'=>'line
+break', 'note {x}'=>{x}}, '東京'=>-12, 'amount'=>861.36},
+    {'id'=>62, 'name'=>'', 'note {x}'=>it's, '東京'=>, 'amount'=>644.94},
+    {'id'=>63, 'name'=>'3.5', 'note {x}'=>line
+break, '東京'=>plain, 'amount'=>42.30},
+    {'id'=>64, 'name'=>'NULL', 'note {x}'=>line
+break, '東京'=> padded , 'amount'=>314.71},
+    {'id'=>65, 'name'=>'tab	here', 'note {x}'=>, '東京'=>846.36, 'amount'=>nil},
+    {'id'=>66, 'name'=>'', 'note {x}'=>{x}}, '東京'=>, 'amount'=>{0}, 'None'=>372.45},
+    {'id'=>67, 'name'=>'a,b', 'note {x}'=>été, '東京'=>tab	here, 'amount'=>291.04},
+    {'id'=>68, 'name'=>'3.5', 'note {x}'=>line
+break, '東京'=>東京都, 'amount'=>337.51},
+    {'id'=>69, 'name'=>'0', 'note {x}'=>東京都, '東京'=>779.42, 'amount'=>nil},
+    {'id'=>70, 'name'=>'', 'note {x}'=>line
+break, '東京'=>1e3, 'amount'=>149.42},
+    {'id'=>71, 'name'=>'ｗｉｄｅ', 'note {x}'=>été, '東京'=> padded , 'amount'=>129.64},
+    {'id'=>72, 'name'=>'<b>&amp;</b>', 'note {x}'=>say "hi", '東京'=>, 'amount'=>307.88},
+    {'id'=>73, 'name'=>'crlf
+break', 'note {x}'=>été, '東京'=>東京都, 'amount'=>299.23},
+    {'id'=>74, 'name'=>'-12', 'note {x}'=> padded , '東京'=><b>&amp;</b>, 'amount'=>474.00},
+    {'id'=>75, 'name'=>'-12', 'note {x}'=><b>&amp;</b>, '東京'=>116.01, 'amount'=>nil},
+    {'id'=>76, 'name'=>'{0}', 'note {x}'=>, '東京'=>crlf
+break, 'amount'=>東京都, 'None'=>734.75},
+    {'id'=>77, 'name'=>'1e3', 'note {x}'=>, '東京'=>tab	here, 'amount'=>375.57},
+    {'id'=>78, 'name'=>'0', 'note {x}'=>0, '東京'=>a,b, 'amount'=>749.87},
+    {'id'=>79, 'name'=>'été', 'note {x}'=>plain, '東京'=>-12, 'amount'=>393.81},
+    {'id'=>80, 'name'=>'{x}}', 'note {x}'=><b>&amp;</b>, '東京'=>tab	here, 'amount'=>714.41},
+    {'id'=>81, 'name'=>'{0}', 'note {x}'=>0, '東京'=>ｗｉｄｅ, 'amount'=>220.14},
+    {'id'=>82, 'name'=>'tab	here', 'note {x}'=>1e3, '東京'=>{0}, 'amount'=>191.95},
+    {'id'=>83, 'name'=>'0', 'note {x}'=>plain, '東京'=>it's, 'amount'=>451.61},
+    {'id'=>84, 'name'=>'-12', 'note {x}'=><b>&amp;</b>, '東京'=>été, 'amount'=>256.48},
+    {'id'=>85, 'name'=>'a,b', 'note {x}'=>back\slash, '東京'=>3.5, 'amount'=>104.63},
+    {'id'=>86, 'name'=>'été', 'note {x}'=>ｗｉｄｅ, '東京'=> padded , 'amount'=>3.5, 'None'=>104.75},
+    {'id'=>87, 'name'=>'3.5', 'note {x}'=>tab	here, '東京'=>été, 'amount'=>, 'None'=>679.93},
+    {'id'=>88, 'name'=>'NULL', 'note {x}'=>東京都, '東京'=><b>&amp;</b>, 'amount'=><b>&amp;</b>, 'None'=>635.06},
+    {'id'=>89, 'name'=>' padded ', 'note {x}'=>back\slash, '東京'=>say "hi", 'amount'=>9.70},
+    {'id'=>90, 'name'=>'東京都', 'note {x}'=>, '東京'=>525.11, 'amount'=>nil},
+    {'id'=>91, 'name'=>'back\slash', 'note {x}'=>3.5, '東京'=>été, 'amount'=>582.95},
+    {'id'=>92, 'name'=>'0', 'note {x}'=>0, '東京'=>it's, 'amount'=>, 'None'=>66.35},
+    {'id'=>93, 'name'=>'', 'note {x}'=>crlf
+break, '東京'=>plain, 'amount'=>758.90},
+    {'id'=>94, 'name'=>'東京都', 'note {x}'=>1e3, '東京'=>3.5, 'amount'=>, 'None'=>460.74},
+    {'id'=>95, 'name'=>'it\'s', 'note {x}'=>été, '東京'=>901.09, 'amount'=>nil},
+    {'id'=>96, 'name'=>'tab	here', 'note {x}'=>0, '東京'=>NULL, 'amount'=>794.15},
+    {'id'=>97, 'name'=>'{0}', 'note {x}'=>a,b, '東京'=>crlf
+break, 'amount'=>535.42},
+    {'id'=>98, 'name'=>'825.70', 'note {x}'=>nil, '東京'=>nil, 'amount'=>nil},
+    {'id'=>99, 'name'=>'été', 'note {x}'=>back\slash, '東京'=>tab	here, 'amount'=>say "hi", 'None'=>851.32}
+];
\ No newline at end of file
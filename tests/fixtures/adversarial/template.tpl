@@ -0,0 +1,119 @@
+# id (int), name (str), note {x} (str), 東京 (str), amount (str)
+    [0, "757.95", null, null, null]
+    [1, "40.48", null, null, null]
+    [2, "été", "crlf
+break", "<b>&amp;</b>", "ｗｉｄｅ"]
+    [3, "it's", "3.5", "crlf
+break", "139.75"]
+    [4, "back\\slash", "line
+break", " padded ", "982.79"]
+    [5, "crlf
+break", "-12", "0", "898.84"]
+    [6, "<b>&amp;</b>", " padded ", "100.70", null]
+    [7, "316.20", null, null, null]
+    [8, " padded ", "<b>&amp;</b>", "{x}}", "865.31"]
+    [9, "", " padded ", "plain", "93.27"]
+    [10, "710.25", null, null, null]
+    [11, "back\\slash", "<b>&amp;</b>", "東京都", "243.91"]
+    [12, "0", "a,b", "917.02", null]
+    [13, "say \"hi\"", "3.5", " padded ", "447.97"]
+    [14, "東京都", "it's", "<b>&amp;</b>", "109.06"]
+    [15, "-12", " padded ", "東京都", "814.47"]
+    [16, "back\\slash", " padded ", "tab	here", "287.66"]
+    [17, "back\\slash", "été", "東京都", "575.65"]
+    [18, "1e3", "a,b", "1e3", "32.97"]
+    [19, "<b>&amp;</b>", "0", "0", "678.72"]
+    [20, "3.5", "", "0", "898.17"]
+    [21, "837.87", null, null, null]
+    [22, "it's", "say \"hi\"", "a,b", "895.04"]
+    [23, "579.70", null, null, null]
+    [24, "<b>&amp;</b>", "NULL", "", "ｗｉｄｅ"]
+    [25, "<b>&amp;</b>", "tab	here", "", "335.27"]
+    [26, "say \"hi\"", "plain", "line
+break", "117.13"]
+    [27, "ｗｉｄｅ", "1e3", "東京都", "426.13"]
+    [28, "-12", "3.5", "say \"hi\"", "45.23"]
+    [29, "plain", "-12", "", "188.52"]
+    [30, "été", "0", "ｗｉｄｅ", "833.84"]
+    [31, "", "back\\slash", "plain", "194.59"]
+    [32, "-12", "<b>&amp;</b>", "a,b", "727.16"]
+    [33, "NULL", "plain", " padded ", "425.62"]
+    [34, "line
+break", "0", "say \"hi\"", "71.97"]
+    [35, "ｗｉｄｅ", "{0}", "1e3", "61.04"]
+    [36, "", "back\\slash", "-12", "été"]
+    [37, "<b>&amp;</b>", "tab	here", "169.42", null]
+    [38, "", "NULL", "1e3", "845.42"]
+    [39, "it's", "line
+break", "117.21", null]
+    [40, "NULL", "1e3", "plain", "<b>&amp;</b>"]
+    [41, "", "ｗｉｄｅ", "été", "837.66"]
+    [42, "3.5", " padded ", "plain", "457.95"]
+    [43, "東京都", "", " padded ", "280.88"]
+    [44, "<b>&amp;</b>", "ｗｉｄｅ", "back\\slash", "287.88"]
+    [45, "tab	here", "", "853.77", null]
+    [46, "crlf
+break", "été", "{0}", "828.90"]
+    [47, "plain", "back\\slash", "a,b", "698.58"]
+    [48, "say \"hi\"", "say \"hi\"", "", "448.14"]
+    [49, "31.55", null, null, null]
+    [50, "772.19", null, null, null]
+    [51, "1e3", "{x}}", "0", "259.23"]
+    [52, "{x}}", "it's", "<b>&amp;</b>", "908.04"]
+    [53, "", "<b>&amp;</b>", "東京都", "312.06"]
+    [54, "", "{0}", "a,b", " padded "]
+    [55, "3.5", "plain", "été", "949.55"]
+    [56, "316.18", null, null, null]
+    [57, "plain", "plain", "NULL", "528.35"]
+    [58, "a,b", "-12", "back\\slash", "649.27"]
+    [59, "line
+break", "1e3", "-12", "475.61"]
+    [60, "627.64", null, null, null]
+    [61, "line
+break", "{x}}", "-12", "861.36"]
+    [62, "", "it's", "", "644.94"]
+    [63, "3.5", "line
+break", "plain", "42.30"]
+    [64, "NULL", "line
+break", " padded ", "314.71"]
+    [65, "tab	here", "", "846.36", null]
+    [66, "", "{x}}", "", "{0}"]
+    [67, "a,b", "été", "tab	here", "291.04"]
+    [68, "3.5", "line
+break", "東京都", "337.51"]
+    [69, "0", "東京都", "779.42", null]
+    [70, "", "line
+break", "1e3", "149.42"]
+    [71, "ｗｉｄｅ", "été", " padded ", "129.64"]
+    [72, "<b>&amp;</b>", "say \"hi\"", "", "307.88"]
+    [73, "crlf
+break", "été", "東京都", "299.23"]
+    [74, "-12", " padded ", "<b>&amp;</b>", "474.00"]
+    [75, "-12", "<b>&amp;</b>", "116.01", null]
+    [76, "{0}", "", "crlf
+break", "東京都"]
+    [77, "1e3", "", "tab	here", "375.57"]
+    [78, "0", "0", "a,b", "749.87"]
+    [79, "été", "plain", "-12", "393.81"]
+    [80, "{x}}", "<b>&amp;</b>", "tab	here", "714.41"]
+    [81, "{0}", "0", "ｗｉｄｅ", "220.14"]
+    [82, "tab	here", "1e3", "{0}", "191.95"]
+    [83, "0", "plain", "it's", "451.61"]
+    [84, "-12", "<b>&amp;</b>", "été", "256.48"]
+    [85, "a,b", "back\\slash", "3.5", "104.63"]
+    [86, "été", "ｗｉｄｅ", " padded ", "3.5"]
+    [87, "3.5", "tab	here", "été", ""]
+    [88, "NULL", "東京都", "<b>&amp;</b>", "<b>&amp;</b>"]
+    [89, " padded ", "back\\slash", "say \"hi\"", "9.70"]
+    [90, "東京都", "", "525.11", null]
+    [91, "back\\slash", "3.5", "été", "582.95"]
+    [92, "0", "0", "it's", ""]
+    [93, "", "crlf
+break", "plain", "758.90"]
+    [94, "東京都", "1e3", "3.5", ""]
+    [95, "it's", "été", "901.09", null]
+    [96, "tab	here", "0", "NULL", "794.15"]
+    [97, "{0}", "a,b", "crlf
+break", "535.42"]
+    [98, "825.70", null, null, null]
+    [99, "été", "back\\slash", "tab	here", "say \"hi\""]
\ No newline at end of file
@@ -0,0 +1,9 @@
+[
+    {'val1'=>'name', 'val2'=>'value', 'val3'=>'fruit', 'val4'=>'date', 'val5'=>'note'},
+    {'val1'=>'Alice', 'val2'=>'10', 'val3'=>'Apple', 'val4'=>'Sep. 12, 2016', 'val5'=>'<b>ripe</b> & sweet'},
+    {'val1'=>'Bob', 'val2'=>'11', 'val3'=>'Blue "berry"', 'val4'=>'Sep. 13, 2016', 'val5'=>''},
+    {'val1'=>'Chris', 'val2'=>'12.5', 'val3'=>'Orange', 'val4'=>'Sep. 14, 2016', 'val5'=>'two
+lines'},
+    {'val1'=>'Dana', 'val2'=>'-3', 'val3'=>'Pêche', 'val4'=>'', 'val5'=>'it\'s $5 #1 @home 100%'},
+    {'val1'=>'Eve', 'val2'=>'', 'val3'=>'Kiwi', 'val4'=>'Sep. 16, 2016', 'val5'=>'tab	here'}
+];
\ No newline at end of file
@@ -0,0 +1,18 @@
+CREATE TABLE IF NOT EXISTS DataConverter (
+    id serial,
+    val1 text,
+    val2 text,
+    val3 text,
+    val4 text,
+    val5 text
+);
+INSERT INTO DataConverter
+    (val1, val2, val3, val4, val5)
+VALUES
+    ('name', 'value', 'fruit', 'date', 'note'),
+    ('Alice', '10', 'Apple', 'Sep. 12, 2016', '<b>ripe</b> & sweet'),
+    ('Bob', '11', 'Blue "berry"', 'Sep. 13, 2016', ''),
+    ('Chris', '12.5', 'Orange', 'Sep. 14, 2016', 'two
+lines'),
+    ('Dana', '-3', 'Pêche', '', 'it\'s $5 #1 @home 100%'),
+    ('Eve', '', 'Kiwi', 'Sep. 16, 2016', 'tab	here');
\ No newline at end of file
@@ -0,0 +1,9 @@
+[
+    ['id'=>1, 'name'=>'Smith; John', 'city'=>'Zürich', 'amount'=>'12.50'],
+    ['id'=>2, 'name'=>'say "hi"', 'city'=>'Paris', 'amount'=>'3'],
+    ['id'=>3, 'name'=>'', 'city'=>'two
+lines', 'amount'=>'-4'],
+    ['id'=>4, 'name'=>'Ann', 'city'=>'Köln', 'amount'=>''],
+    ['id'=>5, 'name'=>'O\'Neil', 'city'=>'São Paulo', 'amount'=>'1000'],
+    ['id'=>6, 'name'=>'{x}', 'city'=>'<b>', 'amount'=>'7.25']
+];
\ No newline at end of file
@@ -0,0 +1,6 @@
+[{'amount': '12.50', 'city': 'Zürich', 'id': 1, 'name': 'Smith; John'},
+ {'amount': '3', 'city': 'Paris', 'id': 2, 'name': 'say "hi"'},
+ {'amount': '-4', 'city': 'two\r\nlines', 'id': 3, 'name': ''},
+ {'amount': '', 'city': 'Köln', 'id': 4, 'name': 'Ann'},
+ {'amount': '1000', 'city': 'São Paulo', 'id': 5, 'name': "O'Neil"},
+ {'amount': '7.25', 'city': '<b>', 'id': 6, 'name': '{x}'}]
\ No newline at end of file
@@ -0,0 +1,7 @@
+# headers = ['id', 'name', 'city', 'amount']
+[[1, 'Smith; John', 'Zürich', '12.50'],
+ [2, 'say "hi"', 'Paris', '3'],
+ [3, '', 'two\r\nlines', '-4'],
+ [4, 'Ann', 'Köln', ''],
+ [5, "O'Neil", 'São Paulo', '1000'],
+ [6, '{x}', '<b>', '7.25']]
\ No newline at end of file
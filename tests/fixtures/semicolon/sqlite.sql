@@ -0,0 +1,17 @@
+CREATE TABLE IF NOT EXISTS DataConverter (
+    id INTEGER PRIMARY KEY ON CONFLICT FAIL AUTOINCREMENT,
+    id INTEGER,
+    name TEXT,
+    city TEXT,
+    amount TEXT
+);
+INSERT INTO DataConverter
+    (id, name, city, amount)
+VALUES
+    (1, 'Smith; John', 'Zürich', '12.50'),
+    (2, 'say "hi"', 'Paris', '3'),
+    (3, '', 'two
+lines', '-4'),
+    (4, 'Ann', 'Köln', ''),
+    (5, 'O\'Neil', 'São Paulo', '1000'),
+    (6, '{x}', '<b>', '7.25');
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+A stand-in for Sublime Text's sublime module, with the parts DataConverter uses.
+Tests set settings and read messages; async callbacks run right away.
+"""
+
+import tempfile
+
+# DataConverter.sublime-settings, as load_settings returns it. Tests replace it.
+settings = {}
+
+# Everything shown in the status bar.
+messages = []
+
+_cache = tempfile.mkdtemp(prefix="DataConverter-cache-")
+
+
+class Region(object):
+    def __init__(self, a, b=None):
+        self.a = a
+        self.b = a if b is None else b
+
+    def __repr__(self):
+        return "Region({}, {})".format(self.a, self.b)
+
+    def empty(self):
+        return self.a == self.b
+
+    def size(self):
+        return abs(self.b - self.a)
+
+    def begin(self):
+        return min(self.a, self.b)
+
+    def end(self):
+        return max(self.a, self.b)
+
+
+class Settings(dict):
+    pass
+
+
+def load_settings(name):
+    return Settings(settings)
+
+
+def set_timeout_async(callback, delay=0):
+    callback()
+
+
+def status_message(message):
+    messages.append(message)
+
+
+def load_resource(name):
+    return ""
+
+
+def cache_path():
+    return _cache
+
+
+def platform():
+    return "linux"
@@ -0,0 +1,69 @@
+"""
+Braces in cells and header names (e.g. {0}, {x}} and n{0}) in the formats that
+used to build their output with str.format, and so raised KeyError, IndexError or
+ValueError on them. Output for data without braces is compared with
+tests/fixtures/plain, the output of these formats before they stopped using str.format
+(except for the tabs and line breaks in xml_properties attributes, escaped since).
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_formats import convert, read, reference_path  # noqa: E402
+
+FORMATS = (
+    "html",
+    "xml",
+    "xml_properties",
+    "xml_illustrator",
+    "yaml",
+    "perl",
+    "ruby",
+    "mysql",
+    "postgres",
+    "sqlite",
+)
+
+# Braces in header names and cells, including the {i} and {n} the templates used.
+BRACES = "id,{0},{x}},n{0},{i}\n1,{0},{x}},{{,{n}\n2,},{,{name},{}\n"
+VALUES = ("{0}", "{x}}", "n{0}", "{i}", "{{", "{n}", "{name}", "{}")
+
+# Stand-ins for braces, which no format escapes or quotes.
+MASK = {ord("{"): "⦃", ord("}"): "⦄"}
+UNMASK = {ord("⦃"): "{", ord("⦄"): "}"}
+
+
+class BraceTest(unittest.TestCase):
+    def test_braces(self):
+        for fmt in FORMATS:
+            with self.subTest(format=fmt):
+                output = convert(fmt, BRACES).decode("utf-8")
+                for value in VALUES:
+                    self.assertIn(value, output)
+
+                self.assertEqual(
+                    convert(fmt, BRACES, pieces=True).decode("utf-8"), output
+                )
+
+    def test_same_as_other_characters(self):
+        # Braces come out like characters that mean nothing to the format.
+        for fmt in FORMATS:
+            with self.subTest(format=fmt):
+                masked = convert(fmt, BRACES.translate(MASK)).decode("utf-8")
+                self.assertEqual(
+                    convert(fmt, BRACES).decode("utf-8"), masked.translate(UNMASK)
+                )
+
+    def test_no_braces(self):
+        text = read("plain.csv")
+        for fmt in FORMATS:
+            with self.subTest(format=fmt):
+                with open(reference_path("plain.csv", fmt), "rb") as f:
+                    self.assertEqual(convert(fmt, text), f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
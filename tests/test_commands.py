@@ -0,0 +1,297 @@
+"""
+DataConverterCommand, run in a stub of Sublime Text (tests/stubs) with fake views.
+Output is compared with converting the same text directly.
+"""
+
+import importlib.util
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STUBS = os.path.join(HERE, "stubs")
+
+# The plugin is loaded with the stubs under its own name, so other tests get
+# DataConverter as it is outside of Sublime Text.
+sys.path.insert(0, STUBS)
+try:
+    import sublime
+
+    spec = importlib.util.spec_from_file_location(
+        "DataConverterPlugin", os.path.join(os.path.dirname(HERE), "DataConverter.py")
+    )
+    plugin = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(plugin)
+finally:
+    sys.path.remove(STUBS)
+    sys.modules.pop("sublime", None)
+    sys.modules.pop("sublime_plugin", None)
+
+TEXT = 'name,value,fruit\nAlice,10,Apple\nBob,11,"Blue, berry"\nChris,12,Orange\n'
+
+
+class Selection(list):
+    def add(self, region):
+        self[:] = [r for r in self if not r.empty()]
+        self.append(region)
+
+    def clear(self):
+        del self[:]
+
+
+class Window(object):
+    def __init__(self):
+        self.views = []
+
+    def new_file(self):
+        view = View()
+        self.views.append(view)
+        return view
+
+
+class View(object):
+    def __init__(self, text="", file_name=None, encoding="UTF-8", dirty=False):
+        self.text = text
+        self.path = file_name
+        self.view_encoding = encoding
+        self.dirty = dirty
+        self.selection = Selection([sublime.Region(0)])
+        self.view_settings = sublime.Settings()
+        self.view_window = Window()
+        self.name = self.syntax = None
+        self.scratch = False
+        self.appends = []
+
+    def sel(self):
+        return self.selection
+
+    def size(self):
+        return len(self.text)
+
+    def substr(self, region):
+        return self.text[region.begin() : region.end()]
+
+    def file_name(self):
+        return self.path
+
+    def encoding(self):
+        return self.view_encoding
+
+    def is_dirty(self):
+        return self.dirty
+
+    def line_endings(self):
+        return "Unix"
+
+    def settings(self):
+        return self.view_settings
+
+    def window(self):
+        return self.view_window
+
+    def set_scratch(self, scratch):
+        self.scratch = scratch
+
+    def set_name(self, name):
+        self.name = name
+
+    def assign_syntax(self, syntax):
+        self.syntax = syntax
+
+    def run_command(self, command, args):
+        assert command == "append"
+        self.appends.append(args["characters"])
+        self.text += args["characters"]
+
+    def replace(self, edit, region, text):
+        # Like Sublime Text, selections after the region move, and the region covers the text.
+        begin, end = region.begin(), region.end()
+        shift = len(text) - (end - begin)
+        self.text = self.text[:begin] + text + self.text[end:]
+        for r in self.selection:
+            if r.begin() >= end and r is not region:
+                r.a, r.b = r.a + shift, r.b + shift
+        region.a, region.b = begin, begin + len(text)
+
+
+def converted(fmt, text=TEXT, **user_settings):
+    """text converted directly, with the stub's settings."""
+    converter = plugin.DataConverter()
+    converter.settings = converter.build_settings(
+        {"format": fmt}, dict(sublime.settings, **user_settings), "\n", "\t"
+    )
+    converter.converter = converter.get_converter(fmt)
+    return converter.convert(text)
+
+
+class CommandTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "data.csv")
+        with io.open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write(TEXT)
+
+        sublime.settings = {"json_backend": "json", "result_cache": 0}
+        del sublime.messages[:]
+        plugin.DataConverterCommand.cache.clear()
+
+        self.stdout = redirect_stdout(io.StringIO())
+        self.stdout.__enter__()
+
+    def tearDown(self):
+        self.stdout.__exit__(None, None, None)
+        shutil.rmtree(self.folder)
+
+    def run_command(self, view, **kwargs):
+        command = plugin.DataConverterCommand(view)
+        command.run(None, **kwargs)
+        return command
+
+    def test_replace(self):
+        view = View(TEXT)
+        self.run_command(view, format="json")
+        self.assertEqual(view.text, converted("json"))
+        self.assertTrue(view.syntax.endswith("JSON.sublime-syntax"))
+
+    def test_replace_selections(self):
+        view = View(TEXT + "\n" + TEXT)
+        view.sel().clear()
+        view.sel().add(sublime.Region(0, len(TEXT)))
+        view.sel().append(sublime.Region(len(TEXT) + 1, len(view.text)))
+        self.run_command(view, format="markdown")
+        self.assertEqual(
+            view.text, converted("markdown") + "\n" + converted("markdown")
+        )
+
+    def test_file(self):
+        # The whole unmodified file is read with mmap.
+        view = View(TEXT, self.path)
+        command = plugin.DataConverterCommand(view)
+        selection = command.source(sublime.Region(0, view.size()))
+        self.assertIsInstance(selection, plugin.MappedCSV)
+        selection.close()
+
+        self.run_command(view, format="yaml")
+        self.assertEqual(view.text, converted("yaml"))
+
+    def test_file_encoding(self):
+        # A view opened in another encoding than the file's is converted from its text.
+        with io.open(self.path, "w", encoding="cp1252", newline="") as f:
+            f.write("name,city\nAnn,Köln\n")
+        view = View("name,city\nAnn,K\ufffdln\n", self.path, "UTF-8")
+        command = plugin.DataConverterCommand(view)
+        self.assertIsInstance(command.source(sublime.Region(0, view.size())), str)
+
+        self.run_command(view, format="json")
+        self.assertEqual(view.text, converted("json", "name,city\nAnn,K\ufffdln\n"))
+
+    def test_dirty_file(self):
+        # Unsaved changes are converted, not the file on disk.
+        text = TEXT + "Dana,13,Pear\n"
+        view = View(text, self.path, dirty=True)
+        command = self.run_command(view, format="json")
+        self.assertEqual(view.text, converted("json", text))
+        self.assertIsNone(command.source_file(sublime.Region(0, view.size())))
+
+    def test_convert_cached(self):
+        sublime.settings["result_cache"] = 1
+        first = View(TEXT)
+        self.run_command(first, format="ruby")
+
+        # The same text in another view is converted once.
+        second = View(TEXT)
+        with mock.patch.object(
+            plugin.DataConverter, "convert", side_effect=AssertionError
+        ):
+            command = self.run_command(second, format="ruby")
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(command.syntax, ("Ruby", "Ruby"))
+
+        # Another format isn't a hit.
+        third = View(TEXT)
+        self.run_command(third, format="perl")
+        self.assertEqual(third.text, converted("perl"))
+
+    def test_new_view(self):
+        view = View(TEXT, self.path)
+        self.run_command(view, format="html", output="new_view")
+
+        self.assertEqual(view.text, TEXT)
+        output = view.window().views[0]
+        self.assertEqual(output.text, converted("html"))
+        self.assertEqual(output.name, "data.csv (html)")
+        self.assertTrue(output.scratch)
+
+    def test_append_size(self):
+        # Output is appended to a new view in blocks, and no block is bigger.
+        view = View(TEXT)
+        with mock.patch.object(plugin.DataConverterCommand, "append_size", 16):
+            self.run_command(view, format="html", output="new_view")
+
+        output = view.window().views[0]
+        self.assertEqual(output.text, converted("html"))
+        self.assertGreater(len(output.appends), 1)
+        self.assertLessEqual(max(len(text) for text in output.appends), 16)
+
+    def test_output_file(self):
+        view = View(TEXT, self.path)
+        self.run_command(view, format="sqlite", output="file")
+
+        with io.open(os.path.join(self.folder, "data.sql"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), converted("sqlite"))
+        self.assertEqual(view.text, TEXT)
+        self.assertIn(
+            "DataConverter: wrote " + os.path.join(self.folder, "data.sql"),
+            sublime.messages,
+        )
+
+    def test_binary_format(self):
+        # xlsx always goes to a file, next to the view's file.
+        view = View(TEXT, self.path)
+        self.run_command(view, format="xlsx")
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, "data.xlsx")))
+        self.assertEqual(view.text, TEXT)
+
+        # Without a file, there's nowhere to write it.
+        view = View(TEXT)
+        self.run_command(view, format="xlsx")
+        self.assertEqual(view.window().views, [])
+        self.assertIn("xlsx can only be written to a file", sublime.messages[-1])
+
+    def test_preflight(self):
+        view = View(TEXT)
+        view.sel().add(sublime.Region(0, view.size()))
+        command = plugin.DataConverterCommand(view)
+        command.settings = command.get_settings({"format": "json", "output": "auto"})
+
+        cost = command.preflight("json")
+        self.assertEqual(command.settings["output"], "replace")
+        self.assertEqual(cost.rows, 4)
+        self.assertTrue(sublime.messages[-1].endswith("replacing the selection"))
+
+        # Output estimated above the thresholds goes to a new view or a file.
+        for thresholds, output in (
+            ({"new_view": 0, "file": 100}, "new_view"),
+            ({"new_view": 0, "file": 0}, "file"),
+        ):
+            command.settings["output"] = "auto"
+            command.settings["output_thresholds"] = thresholds
+            command.preflight("json")
+            self.assertEqual(command.settings["output"], output)
+
+    def test_auto_output(self):
+        sublime.settings["output"] = "auto"
+        sublime.settings["output_thresholds"] = {"new_view": 0, "file": 100}
+        view = View(TEXT)
+        self.run_command(view, format="json")
+        self.assertEqual(view.text, TEXT)
+        self.assertEqual(view.window().views[0].text, converted("json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+"""
+convert_files: which files are converted or skipped, and what's left on disk when
+converting fails. Files are converted in threads, so conversion can be patched.
+Compressed output: naming, round trips with each codec, and failures while compressing.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import DataConverter  # noqa: E402
+
+TEXT = "name,value\nAlice,10\nBob,11\n"
+
+
+class ConvertFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.record = os.path.join(self.folder, "cache", "outputs.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def write(self, name, text=TEXT):
+        with io.open(self.path(name), "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return self.path(name)
+
+    def convert(self, sources, fmt="json", delimiter=None, **kwargs):
+        self.output = io.StringIO()
+        with redirect_stdout(self.output):
+            return DataConverter.convert_files(
+                sources,
+                {"format": fmt, "output_delimiter": delimiter},
+                {"json_backend": "json"},
+                "\t",
+                executor=ThreadPoolExecutor,
+                record=self.record,
+                **kwargs
+            )
+
+    def files(self):
+        return sorted(os.listdir(self.folder))
+
+    def test_output_of_another_source(self):
+        # data.dsv.csv is the output of data.csv in dsv, so converting both skips it.
+        source = self.write("data.csv")
+        self.convert([source], "dsv", ";")
+        self.assertIn("data.dsv.csv", self.files())
+
+        stats = self.convert(
+            [source, self.path("data.dsv.csv")], "dsv", ";", force=True
+        )
+        self.assertEqual((stats["converted"], stats["skipped"]), (1, 1))
+        self.assertIn("the output of another file", self.output.getvalue())
+        self.assertNotIn("data.dsv.dsv.csv", self.files())
+
+    def test_same_output(self):
+        # data.csv and data.csv.gz would both be written to data.json.
+        DataConverter.write_pieces(self.path("data.csv.gz"), [TEXT])
+        sources = [self.write("data.csv"), self.path("data.csv.gz")]
+
+        stats = self.convert(sources)
+        self.assertEqual((stats["converted"], stats["skipped"]), (1, 1))
+        self.assertIn(
+            "not converting {} to {}, the output of {}".format(
+                sources[1], self.path("data.json"), sources[0]
+            ),
+            self.output.getvalue(),
+        )
+
+    def test_up_to_date(self):
+        source = self.write("data.csv")
+        self.assertEqual(self.convert([source])["converted"], 1)
+        self.assertEqual(self.convert([source])["skipped"], 1)
+        self.assertEqual(self.convert([source], force=True)["converted"], 1)
+
+        # A changed source is converted again.
+        self.write("data.csv", TEXT + "Chris,12\n")
+        self.assertEqual(self.convert([source])["converted"], 1)
+
+        # So is an empty or missing output.
+        open(self.path("data.json"), "w").close()
+        self.assertEqual(self.convert([source])["converted"], 1)
+        os.remove(self.path("data.json"))
+        self.assertEqual(self.convert([source])["converted"], 1)
+
+    def test_older_source(self):
+        # A source replaced by a file with an older time (e.g. with cp -p) is converted.
+        source = self.write("data.csv")
+        self.convert([source])
+        stat = os.stat(source)
+
+        self.write("data.csv", TEXT + "Chris,12\n")
+        os.utime(source, (stat.st_atime - 60, stat.st_mtime - 60))
+        self.assertEqual(self.convert([source])["converted"], 1)
+        self.assertEqual(self.convert([source])["skipped"], 1)
+
+    def test_record_shared(self):
+        # Outputs recorded by another run are kept when saving.
+        first, second = self.write("a.csv"), self.write("b.csv")
+        self.convert([first])
+        self.convert([second])
+        stats = self.convert([first, second])
+        self.assertEqual(stats["skipped"], 2)
+
+    def test_failure(self):
+        def pieces(converter, selection, size=5000):
+            yield "[\n"
+            raise ValueError("bad data")
+
+        source = self.write("data.csv")
+        with mock.patch.object(DataConverter.DataConverter, "convert_pieces", pieces):
+            stats = self.convert([source])
+
+        self.assertEqual((stats["converted"], stats["failed"]), (0, 1))
+        self.assertIn("bad data", self.output.getvalue())
+        self.assertEqual(self.files(), ["data.csv"])
+
+        # A failure isn't recorded, so the file is converted next time.
+        self.assertEqual(self.convert([source])["converted"], 1)
+
+    def test_missing_source(self):
+        stats = self.convert([self.path("missing.csv")])
+        self.assertEqual((stats["converted"], stats["failed"]), (0, 1))
+
+
+class CompressionTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.extensions = [
+            ext
+            for ext, (module, _, _) in DataConverter.COMPRESSION.items()
+            if getattr(DataConverter, module) is not None
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def read(self, path):
+        ext = DataConverter.compression(path, read=True)
+        with DataConverter.open_compressed(path, "rb", ext) as f:
+            return f.read()
+
+    def test_output_path(self):
+        output_path = DataConverter.output_path
+        self.assertEqual(
+            output_path("/d/data.csv", "json", compress="gz"), "/d/data.json.gz"
+        )
+        self.assertEqual(
+            output_path("/d/data.csv", "json", compress=".xz"), "/d/data.json.xz"
+        )
+        self.assertEqual(
+            output_path("/d/data.csv.gz", "sqlite", "/out", compress="bz2"),
+            "/out/data.sql.bz2",
+        )
+        self.assertEqual(
+            output_path("/d/data.csv.gz", "dsv", output_delimiter=";"),
+            "/d/data.dsv.csv",
+        )
+        self.assertEqual(
+            output_path("/d/data.csv.gz", "dsv", output_delimiter=";", compress="gz"),
+            "/d/data.dsv.csv.gz",
+        )
+
+    def test_round_trip(self):
+        pieces = [("row %d,東京\n" % i) * 50 for i in range(200)]
+        for ext in self.extensions:
+            for threaded in (False, True):
+                with self.subTest(ext=ext, threaded=threaded):
+                    dest = self.path("data.txt" + ext)
+                    DataConverter.write_pieces(dest, iter(pieces), threaded=threaded)
+                    self.assertEqual(DataConverter.compression(dest, read=True), ext)
+                    self.assertEqual(self.read(dest), "".join(pieces).encode("utf-8"))
+                    self.assertFalse(os.path.exists(dest + ".part"))
+
+    def test_convert_files(self):
+        # Compressed input is found by its first bytes, and output compressed by extension.
+        source = self.path("data.csv")
+        with io.open(source, "w", encoding="utf-8", newline="") as f:
+            f.write(TEXT)
+        with redirect_stdout(io.StringIO()):
+            DataConverter.convert_file(
+                source, self.path("plain.json"), {"format": "json"}, {}, "\t"
+            )
+        with open(self.path("plain.json"), "rb") as f:
+            expected = f.read()
+
+        for ext in self.extensions:
+            for threaded in (False, True):
+                with self.subTest(ext=ext, threaded=threaded):
+                    compressed = self.path("input" + ext)
+                    DataConverter.write_pieces(compressed, [TEXT])
+                    hidden = self.path("input.dat")
+                    os.replace(compressed, hidden)
+
+                    with redirect_stdout(io.StringIO()):
+                        stats = DataConverter.convert_files(
+                            [hidden],
+                            {"format": "json", "compress": ext[1:]},
+                            {"threaded_compression": threaded},
+                            "\t",
+                            executor=ThreadPoolExecutor,
+                            force=True,
+                            record=self.path("outputs.json"),
+                        )
+                    self.assertEqual(stats["converted"], 1)
+                    self.assertEqual(self.read(self.path("input.json" + ext)), expected)
+
+    def test_failed_conversion(self):
+        # Converting fails partway: the error comes through, and nothing is left behind.
+        def pieces():
+            for i in range(100):
+                yield "row %d\n" % i * 1000
+            raise ValueError("bad data")
+
+        for threaded in (False, True):
+            with self.subTest(threaded=threaded):
+                dest = self.path("data.json.gz")
+                with self.assertRaisesRegex(ValueError, "bad data"):
+                    DataConverter.write_pieces(dest, pieces(), threaded=threaded)
+                self.assertEqual(os.listdir(self.folder), [])
+
+    def test_failed_writer(self):
+        # The writer thread fails: converting stops, and the writer's error is raised.
+        made = []
+
+        def pieces():
+            for i in range(1000):
+                made.append(i)
+                yield b"x" * 1000
+
+        class Full(object):
+            def write(self, data):
+                raise OSError("disk full")
+
+        with self.assertRaisesRegex(OSError, "disk full"):
+            DataConverter.write_threaded(Full(), pieces(), depth=4)
+        self.assertLess(len(made), 1000)
+
+        dest = self.path("data.json.gz")
+        with mock.patch.object(
+            DataConverter.gzip.GzipFile, "write", side_effect=OSError("disk full")
+        ):
+            with self.assertRaisesRegex(OSError, "disk full"):
+                DataConverter.write_pieces(dest, ["a"] * 100, threaded=True)
+        self.assertEqual(os.listdir(self.folder), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
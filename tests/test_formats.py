@@ -0,0 +1,299 @@
+"""
+Convert hard CSV to every format, and compare the output byte for byte with the
+reference output frozen in tests/fixtures. Every way of converting (streaming, other
+line ends, mmap, gzip, parallel chunks and the JSON backends) must give the reference,
+and the same output as converting the text in one go for more generated inputs.
+The inputs are converted with the default settings, so the dialect and headers are sniffed.
+
+After changing a format's output on purpose, regenerate the references and review the diff:
+
+    python tests/test_formats.py --freeze
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import DataConverter  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Inputs in FIXTURES, and their delimiters. adversarial.csv is made by adversarial_csv.
+INPUTS = {"adversarial.csv": ",", "semicolon.csv": ";"}
+
+# A format defined with templates, as in the "formats" setting.
+TEMPLATES = {
+    "template": {
+        "header": "# {fields}{newline}",
+        "header_cell": "{field} ({type})",
+        "row": "{indent}[{cells}]",
+        "extension": "tpl",
+    }
+}
+
+FORMATS = sorted(DataConverter.EXTENSIONS) + sorted(TEMPLATES)
+
+
+def adversarial_csv(rows=100, seed=0, newline="\n"):
+    """
+    CSV that's hard to convert: quoted delimiters, quotes and line breaks, wide and
+    combining characters, braces, markup, empty cells, and rows of the wrong length.
+    Rows end with newline, e.g. "\r\n".
+    """
+    rand = random.Random(seed)
+    values = (
+        "plain",
+        "",
+        "0",
+        "-12",
+        "3.5",
+        "1e3",
+        "a,b",
+        'say "hi"',
+        "line\nbreak",
+        "crlf\r\nbreak",
+        "東京都",
+        "ｗｉｄｅ",
+        "e\u0301te\u0301",
+        "{0}",
+        "{x}}",
+        "<b>&amp;</b>",
+        "it's",
+        " padded ",
+        "tab\there",
+        "back\\slash",
+        "\x7f",
+        "NULL",
+    )
+    headers = ["id", "name", "note {x}", "東京", "amount"]
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator=newline)
+    writer.writerow(headers)
+    for i in range(rows):
+        width = len(headers) + rand.choice((0, 0, 0, 0, 0, -1, -3, 1))
+        row = [str(i)] + [rand.choice(values) for _ in range(width - 2)]
+        writer.writerow(row + ["{:.2f}".format(rand.random() * 1000)])
+
+    return output.getvalue()
+
+
+def read(name):
+    with io.open(os.path.join(FIXTURES, name), encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def relined(text, delimiter):
+    """The same CSV with the other line ends: \\n if it has \\r\\n, otherwise \\r\\n."""
+    newline = "\n" if "\r\n" in text else "\r\n"
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=delimiter, lineterminator=newline)
+    writer.writerows(csv.reader(io.StringIO(text), delimiter=delimiter))
+    return output.getvalue()
+
+
+def reference_path(name, fmt):
+    """Path of the reference output of input name in fmt, e.g. fixtures/adversarial/json.json."""
+    extension = TEMPLATES[fmt]["extension"] if fmt in TEMPLATES else None
+    extension = extension or DataConverter.EXTENSIONS[fmt]
+    folder = os.path.splitext(name)[0]
+    return os.path.join(FIXTURES, folder, fmt + "." + extension)
+
+
+def convert(fmt, selection, executor=None, backend="json", pieces=False):
+    """Convert selection with the default settings. Returns bytes, encoded as UTF-8 if text."""
+    converter = DataConverter.DataConverter()
+    converter.executor = executor
+    converter.chunk_threshold = 0
+    user_settings = {"json_backend": backend, "workers": 2, "formats": TEMPLATES}
+    converter.settings = converter.build_settings(
+        {"format": fmt, "output_delimiter": "\t"}, user_settings, "\n", "    "
+    )
+    converter.converter = converter.get_converter(fmt)
+
+    with redirect_stdout(io.StringIO()):
+        if pieces:
+            output = list(converter.convert_pieces(selection, size=7))
+            output = output[0][:0].join(output) if output else ""
+        else:
+            output = converter.convert(selection)
+
+    return output if isinstance(output, bytes) else output.encode("utf-8")
+
+
+def write_input(folder, name, text):
+    """Write text to name in folder, with a gzipped copy. Returns the path."""
+    path = os.path.join(folder, name)
+    with io.open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    with open(path, "rb") as f, gzip.open(path + ".gz", "wb") as g:
+        shutil.copyfileobj(f, g)
+    return path
+
+
+def engines(path, fmt, delimiter=","):
+    """Each way of converting the input at path (see write_input), by name."""
+    with io.open(path, encoding="utf-8", newline="") as f:
+        text = f.read()
+
+    def mapped(**kwargs):
+        with DataConverter.MappedCSV(path) as selection:
+            return convert(fmt, selection, **kwargs)
+
+    def compressed():
+        with DataConverter.CompressedCSV(path + ".gz", ".gz") as selection:
+            return convert(fmt, selection)
+
+    yield "str", lambda: convert(fmt, text)
+    yield "pieces", lambda: convert(fmt, text, pieces=True)
+    yield "line ends", lambda: convert(fmt, relined(text, delimiter))
+    yield "mmap", mapped
+    yield "gzip", compressed
+
+    if fmt in DataConverter.DataConverter.chunked_formats or fmt in TEMPLATES:
+        yield "chunks", lambda: convert(fmt, text, ProcessPoolExecutor)
+        yield "mmap chunks", lambda: mapped(executor=ProcessPoolExecutor)
+
+    if fmt.startswith("json"):
+        for backend in ("orjson", "ujson"):
+            if getattr(DataConverter, backend) is not None:
+                yield backend, lambda b=backend: convert(fmt, text, backend=b)
+
+
+def members(output):
+    """
+    The files in zip output (xlsx), which are compared instead of the archive: its bytes
+    depend on the Python and zlib versions.
+    """
+    with zipfile.ZipFile(io.BytesIO(output)) as archive:
+        return [(info.filename, archive.read(info)) for info in archive.infolist()]
+
+
+class FormatTest(unittest.TestCase):
+    maxDiff = 2000
+
+    @classmethod
+    def setUpClass(cls):
+        # Inputs are copied, with gzipped copies for CompressedCSV.
+        cls.folder = tempfile.mkdtemp()
+        for name in INPUTS:
+            write_input(cls.folder, name, read(name))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.folder)
+
+    def check(self, name):
+        path = os.path.join(self.folder, name)
+        for fmt in FORMATS:
+            with open(reference_path(name, fmt), "rb") as f:
+                expected = f.read()
+            binary = fmt in DataConverter.DataConverter.binary_formats
+            if binary:
+                expected = members(expected)
+
+            for engine, run in engines(path, fmt, INPUTS[name]):
+                with self.subTest(format=fmt, engine=engine):
+                    output = run()
+                    self.assertEqual(members(output) if binary else output, expected)
+
+    def test_adversarial(self):
+        self.check("adversarial.csv")
+
+    def test_semicolon_crlf(self):
+        self.check("semicolon.csv")
+
+
+class DifferentialTest(unittest.TestCase):
+    """Every engine gives the str engine's output, for generated inputs without references."""
+
+    maxDiff = 2000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_engines(self):
+        for seed in (1, 2, 3):
+            for newline in ("\n", "\r\n"):
+                text = adversarial_csv(rows=60, seed=seed, newline=newline)
+                path = write_input(self.folder, "input.csv", text)
+
+                for fmt in FORMATS:
+                    binary = fmt in DataConverter.DataConverter.binary_formats
+                    outputs = engines(path, fmt)
+                    _, run = next(outputs)
+                    expected = members(run()) if binary else run()
+
+                    for engine, run in outputs:
+                        with self.subTest(
+                            seed=seed, newline=newline, format=fmt, engine=engine
+                        ):
+                            output = run()
+                            self.assertEqual(
+                                members(output) if binary else output, expected
+                            )
+
+
+class SniffTest(unittest.TestCase):
+    def test_crlf_one_column(self):
+        # Sniffed on the raw text, a CRLF file's delimiter was \r.
+        output = convert("json", "name\r\nrr\r\nbar\r\n")
+        self.assertEqual(json.loads(output), [{"name": "rr"}, {"name": "bar"}])
+
+    def test_crlf_headers(self):
+        output = convert("json", read("semicolon.csv"))
+        self.assertEqual(list(json.loads(output)[0]), ["id", "name", "city", "amount"])
+
+
+class MarkupTest(unittest.TestCase):
+    def test_xml_attributes(self):
+        # Parsed, attributes are the cells, including tabs and line breaks.
+        text = read("semicolon.csv")
+        rows = list(csv.reader(io.StringIO(text), delimiter=";"))
+        elements = ElementTree.fromstring(convert("xml_properties", text))
+        self.assertEqual(
+            [element.attrib for element in elements],
+            [dict(zip(rows[0], row)) for row in rows[1:]],
+        )
+
+
+def freeze():
+    """Write adversarial.csv, and the reference output of every input in every format."""
+    with io.open(
+        os.path.join(FIXTURES, "adversarial.csv"), "w", encoding="utf-8", newline=""
+    ) as f:
+        f.write(adversarial_csv())
+
+    for name in INPUTS:
+        text = read(name)
+        for fmt in FORMATS:
+            path = reference_path(name, fmt)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, "wb") as f:
+                f.write(convert(fmt, text))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--freeze"]:
+        freeze()
+    else:
+        unittest.main()
@@ -0,0 +1,131 @@
+"""
+The estimators behind the profile format and SQL column sizing: distinct counts
+(HyperLogLog), frequent values (TopValues) and the batched mean and variance of ColumnProfile.
+"""
+
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import unittest
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import DataConverter  # noqa: E402
+
+
+def batches(values, size):
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+class HyperLogLogTest(unittest.TestCase):
+    def count(self, values, size=4096):
+        sketch = DataConverter.HyperLogLog()
+        for batch in batches(values, size):
+            sketch.update(batch)
+        return sketch.count()
+
+    def test_exact(self):
+        # Up to 2048 distinct values are counted exactly.
+        values = ["value %d" % i for i in range(2048)]
+        self.assertEqual(self.count(values * 2, 1000), 2048)
+
+    def test_estimate(self):
+        # Known answers, within the standard error (1.6%) of the true counts.
+        for n, expected in ((5000, 4968), (50000, 50061)):
+            values = ["value %d" % i for i in range(n)]
+            self.assertEqual(self.count(values), expected)
+            self.assertLess(abs(expected - n) / n, 0.016)
+
+            # Order, batching and repeats don't matter.
+            self.assertEqual(self.count(values[::-1] + values[:100], 777), expected)
+
+    def test_other_process(self):
+        # hash() is salted differently in each process; the estimate isn't.
+        code = (
+            "import DataConverter\n"
+            "h = DataConverter.HyperLogLog()\n"
+            "h.update(['value %d' % i for i in range(5000)])\n"
+            "print(h.count())\n"
+        )
+        env = dict(os.environ, PYTHONHASHSEED="random")
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=ROOT, env=env
+        )
+        self.assertEqual(int(output), 4968)
+
+
+class TopValuesTest(unittest.TestCase):
+    def test_exact(self):
+        top = DataConverter.TopValues(k=3)
+        top.update(["a", "b", "a", "c"])
+        top.update(["a", "b"])
+        self.assertEqual(top.most_common(3), [("a", 3), ("b", 2), ("c", 1)])
+
+    def test_eviction(self):
+        # With more than k values, the (k+1)th largest count is subtracted from each.
+        top = DataConverter.TopValues(k=2)
+        top.update(["a", "a", "a", "b", "b", "c"])
+        self.assertEqual(top.most_common(3), [("a", 2), ("b", 1)])
+
+        # Ties at the cut are all evicted.
+        top.update(["d", "d", "e"])
+        self.assertEqual(top.most_common(3), [("a", 1), ("d", 1)])
+
+    def test_bounds(self):
+        # Counts are low by at most n / (k + 1), so frequent values are always kept.
+        rand = random.Random(0)
+        values = [str(min(int(rand.paretovariate(1)), 500)) for _ in range(20000)]
+        top = DataConverter.TopValues(k=16)
+        for batch in batches(values, 1000):
+            top.update(batch)
+
+        counts = dict(top.counts)
+        for value, n in Counter(values).items():
+            self.assertLessEqual(counts.get(value, 0), n)
+            self.assertGreaterEqual(counts.get(value, 0), n - len(values) / 17)
+
+
+class ColumnProfileTest(unittest.TestCase):
+    def profile(self, values, size):
+        profile = DataConverter.ColumnProfile()
+        for batch in batches(values, size):
+            profile.update(batch)
+        return profile
+
+    def test_merge(self):
+        # Batches' means and variances are combined as if computed in one pass.
+        values = [str(i) for i in range(1, 11)]
+        for size in (1, 3, 4, 10):
+            profile = self.profile(values, size)
+            self.assertAlmostEqual(profile.mean, 5.5)
+            self.assertAlmostEqual(profile.m2 / (profile.count - 1), 55 / 6.0)
+
+    def test_merge_precision(self):
+        # Large offsets don't cost precision, as they would with sums of squares.
+        rand = random.Random(1)
+        numbers = [1e9 + rand.random() for _ in range(10000)]
+        profile = self.profile(["%.6f" % x for x in numbers], 333)
+        numbers = [float("%.6f" % x) for x in numbers]
+
+        self.assertAlmostEqual(profile.mean, statistics.fmean(numbers), places=4)
+        self.assertTrue(
+            math.isclose(
+                profile.m2 / (profile.count - 1),
+                statistics.variance(numbers),
+                rel_tol=1e-6,
+            )
+        )
+
+    def test_nulls(self):
+        profile = self.profile(["1", "", None, "3", "x"], 2)
+        self.assertEqual((profile.count, profile.nulls), (3, 2))
+        self.assertIs(profile.type, str)
+
+
+if __name__ == "__main__":
+    unittest.main()
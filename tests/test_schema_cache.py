@@ -0,0 +1,192 @@
+"""
+The schema cache: what's reused when a file is converted again, pinning and trimming
+entries, and saving from several instances (as workers do) without losing entries.
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import DataConverter  # noqa: E402
+
+TEXT = "name,value,fruit\nAlice,10,Apple\nBob,11,Blueberry\nChris,12,Orange\n"
+
+
+class SchemaCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "cache", "schemas.json")
+        self.cache = DataConverter.SchemaCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def saved(self):
+        with io.open(self.path, encoding="utf-8") as f:
+            return json.load(f)["files"]
+
+    def test_put_get(self):
+        self.cache.put("/data.csv", "abc", {"has_header": True})
+        self.assertTrue(self.cache.get("/data.csv", "abc")["has_header"])
+        self.assertIsNone(self.cache.get("/data.csv", "def"))
+        self.assertIsNone(self.cache.get("/other.csv", "abc"))
+
+        # A new signature replaces the entry.
+        self.cache.put("/data.csv", "def", {"has_header": False})
+        self.assertEqual(list(self.saved()["/data.csv"]), ["def"])
+
+    def test_pin(self):
+        self.assertFalse(self.cache.pin("/data.csv"))
+
+        self.cache.put("/data.csv", "abc", {"has_header": True})
+        self.assertTrue(self.cache.pin("/data.csv"))
+
+        # A pinned entry isn't replaced, nor overwritten.
+        self.cache.put("/data.csv", "def", {"has_header": False})
+        self.cache.put("/data.csv", "abc", {"has_header": False})
+        self.assertEqual(sorted(self.saved()["/data.csv"]), ["abc", "def"])
+        self.assertTrue(self.cache.get("/data.csv", "abc")["has_header"])
+
+        # Unpinned, it's replaced.
+        self.cache.pin("/data.csv", False)
+        self.cache.put("/data.csv", "ghi", {"has_header": False})
+        self.assertEqual(list(self.saved()["/data.csv"]), ["ghi"])
+
+    def test_forget(self):
+        self.cache.put("/data.csv", "abc", {"has_header": True})
+        self.cache.pin("/data.csv")
+        self.cache.forget("/data.csv")
+        self.assertIsNone(self.cache.get("/data.csv", "abc"))
+        self.assertNotIn("/data.csv", self.saved())
+
+    def test_trim(self):
+        # Beyond max_entries, the least recently saved unpinned entries go.
+        self.cache.max_entries = 2
+        with mock.patch.object(DataConverter.time, "time", side_effect=range(1, 10)):
+            self.cache.put("/pinned.csv", "abc", {})
+            self.cache.pin("/pinned.csv")
+            for name in ("/a.csv", "/b.csv", "/c.csv"):
+                self.cache.put(name, "abc", {})
+
+        self.assertEqual(sorted(self.saved()), ["/b.csv", "/c.csv", "/pinned.csv"])
+
+    def test_save_merges(self):
+        # Another instance's entries, saved since this one was loaded, are kept.
+        other = DataConverter.SchemaCache(self.path)
+        self.cache.put("/a.csv", "abc", {})
+        other.put("/b.csv", "abc", {})
+        self.cache.forget("/c.csv")
+
+        self.assertEqual(sorted(self.saved()), ["/a.csv", "/b.csv"])
+        self.assertFalse(os.path.exists(self.path + ".lock"))
+
+    def test_stale_lock(self):
+        # A lock file left by a process that died is removed.
+        os.makedirs(os.path.dirname(self.path))
+        open(self.path + ".lock", "w").close()
+        os.utime(self.path + ".lock", (0, 0))
+        self.cache.put("/a.csv", "abc", {})
+        self.assertEqual(list(self.saved()), ["/a.csv"])
+
+    def test_lock_timeout(self):
+        lock = DataConverter.FileLock(os.path.join(self.folder, "lock"), timeout=0)
+        with lock:
+            with self.assertRaises(OSError):
+                with DataConverter.FileLock(lock.path, timeout=0):
+                    pass
+        self.assertFalse(os.path.exists(lock.path))
+
+
+class ConvertTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.folder, "data.csv")
+        self.cache = os.path.join(self.folder, "schemas.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def convert(self, text=TEXT, **settings):
+        """Write text to the source, convert it to Ruby (a typed format) with the cache, and return the output."""
+        with io.open(self.source, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+
+        dest = os.path.join(self.folder, "data.rb")
+        user_settings = dict({"schema_cache": self.cache}, **settings)
+        with redirect_stdout(io.StringIO()):
+            DataConverter.convert_file(
+                self.source, dest, {"format": "ruby"}, user_settings, "\t"
+            )
+        with io.open(dest, encoding="utf-8") as f:
+            return f.read()
+
+    def entry(self):
+        cache = DataConverter.SchemaCache(self.cache)
+        (entry,) = cache.files[os.path.abspath(self.source)].values()
+        return entry
+
+    def test_hit(self):
+        # Converted again, the file isn't sniffed or scanned for types.
+        output = self.convert()
+        self.assertEqual(self.entry()["types"], ["str", "int", "str"])
+
+        with mock.patch.object(
+            DataConverter, "sniff", side_effect=AssertionError
+        ), mock.patch.object(
+            DataConverter.DataConverter, "get_types", side_effect=AssertionError
+        ):
+            self.assertEqual(self.convert(), output)
+
+    def test_changed_columns(self):
+        self.convert()
+        self.convert("id;name\n1;Ann\n")
+        self.assertEqual(self.entry()["types"], ["int", "str"])
+        self.assertEqual(self.entry()["dialect"]["delimiter"], ";")
+
+    def test_stale_has_header(self):
+        # Cached without headers, the file is scanned again when told it has them.
+        text = "1,2\n3,4\n5,6\n"
+        self.convert(text)
+        self.assertFalse(self.entry()["has_header"])
+
+        get_types = DataConverter.DataConverter.get_types
+        with mock.patch.object(
+            DataConverter.DataConverter,
+            "get_types",
+            autospec=True,
+            side_effect=get_types,
+        ) as scan:
+            self.convert(text, headers=True)
+        scan.assert_called_once()
+        self.assertTrue(self.entry()["has_header"])
+
+    def test_relative_path(self):
+        # --schema-cache is relative to the current folder.
+        cwd = os.getcwd()
+        os.chdir(self.folder)
+        try:
+            with mock.patch.dict(os.environ, {"HOME": self.folder}), redirect_stdout(
+                io.StringIO()
+            ):
+                self.convert()
+                status = DataConverter.main(
+                    ["ruby", "data.csv", "--schema-cache", "relative.json", "-j", "1"]
+                )
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(status, 0)
+        self.cache = os.path.join(self.folder, "relative.json")
+        self.assertEqual(self.entry()["types"], ["str", "int", "str"])
+
+
+if __name__ == "__main__":
+    unittest.main()